@@ -1,3 +1,12 @@
+import os
+import random
+import sys
+
+# procesar_dispositivos vive en practicas/ejecucion.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "practicas"))
+from ejecucion import ErrorDispositivo, procesar_dispositivos
+
+
 # Clase para dispositivo genérico
 class DispositivoIoT:
     def __init__(self, nombre, ubicacion):
@@ -24,7 +33,6 @@ class SensorTemperatura(DispositivoIoT):
         self.rango_medicion = rango_medicion
 
     def leer_dato(self):
-        import random
         temperatura = random.uniform(*self.rango_medicion)
         print(f"📡 {self.nombre} en {self.ubicacion}: {temperatura:.2f} °C")
         return temperatura
@@ -36,7 +44,6 @@ class SensorMovimiento(DispositivoIoT):
         super().__init__(nombre, ubicacion)
 
     def leer_dato(self):
-        import random
         movimiento = random.choice([True, False])
         estado = "Movimiento detectado 🚨" if movimiento else "Sin movimiento"
         print(f"📡 {self.nombre} en {self.ubicacion}: {estado}")
@@ -70,15 +77,19 @@ def monitorear_ciclos(dispositivo, ciclos):
 # ================================================================
 # ✅ Función que recibe otra función como parámetro (lo que te asignaron a ti)
 # ================================================================
-def aplicar_funcion(dispositivos, funcion):
+def aplicar_funcion(dispositivos, funcion, executor="serial", tamano_bloque=None):
     """
     Recibe una lista de dispositivos y una función,
     aplica esa función a cada dispositivo y devuelve los resultados.
+
+    executor: "serial", "thread" (hilos) o "process" (procesos, para funciones
+    que usan mucha CPU; la función debe ser serializable, no una lambda).
+    Los resultados mantienen el orden de entrada y un fallo se devuelve como
+    ErrorDispositivo en su posición. Es procesar_dispositivos de
+    practicas/ejecucion.py, que también devuelve el estado que los
+    dispositivos cambiaron en otro proceso.
     """
-    resultados = []
-    for d in dispositivos:
-        resultados.append(funcion(d))
-    return resultados
+    return procesar_dispositivos(dispositivos, funcion, executor, tamano_bloque)
 
 if __name__ == "__main__":
     # Crear dispositivos
@@ -0,0 +1,231 @@
+'''
+Analítica incremental del parqueo: series de ocupación por minuto y por hora,
+histograma de estadías e ingresos por hora.
+
+Todo se actualiza al registrar cada entrada o salida (O(1) por auto), así que
+los tableros consultan estadísticas del día sin volver a recorrer el historial
+de eventos. La serie por minuto guarda solo una ventana de los últimos
+MINUTOS_RETENIDOS minutos; la historia larga queda en la serie por hora.
+'''
+
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+# Límites (en minutos) de las clases del histograma de estadías; la última es abierta
+LIMITES_ESTADIA = (15, 30, 60, 120, 180, 240, 360, 480, 720, 1440)
+# Minutos que conserva la serie por minuto (un día)
+MINUTOS_RETENIDOS = 24 * 60
+# A partir de este tamaño de lote el histograma se actualiza con NumPy
+_LOTE_VECTORIZADO = 256
+
+
+class SerieOcupacion:
+    """
+    Ocupación agregada en intervalos de `ancho` segundos. Solo se guardan los
+    intervalos en los que hubo eventos: número de intervalo, área (ocupación
+    integrada en el tiempo), mínimo, máximo, ocupación al cierre y las
+    entradas/salidas/ingresos registrados. Un intervalo sin eventos tiene la
+    ocupación constante del último cierre y se reconstruye al consultarlo,
+    así que un salto largo en el tiempo cuesta O(1).
+
+    Con max_intervalos la serie es una ventana: solo se consultan los
+    últimos max_intervalos intervalos (contando el actual) y los anteriores
+    se descartan por tandas, así que la memoria queda acotada.
+    """
+
+    def __init__(self, ancho, max_intervalos=None):
+        if max_intervalos is not None and max_intervalos < 1:
+            raise ValueError("max_intervalos debe ser mayor a 0")
+        self.ancho = ancho
+        self.max_intervalos = max_intervalos
+        self.numeros = array("q")  # número de intervalo (marca // ancho), creciente
+        self.area = array("d")
+        self.minimo = array("l")
+        self.maximo = array("l")
+        self.final = array("l")
+        self.entradas = array("l")
+        self.salidas = array("l")
+        self.ingresos = array("d")
+        self._marca = None  # hasta dónde está integrada la serie
+        self._ocupacion = 0
+
+    def __len__(self):
+        return len(self.numeros)
+
+    def _columnas(self):
+        return (self.numeros, self.area, self.minimo, self.maximo, self.final,
+                self.entradas, self.salidas, self.ingresos)
+
+    def _primero_visible(self):
+        """Primer intervalo de la ventana (el primero con eventos si no hay ventana)"""
+        if self.max_intervalos is None:
+            return self.numeros[0]
+        return max(self.numeros[0], self.numeros[-1] - self.max_intervalos + 1)
+
+    def recortar(self):
+        """Descarta los intervalos guardados que quedaron fuera de la ventana"""
+        if self.max_intervalos is None or not self.numeros:
+            return
+        # Se conserva el último anterior a la ventana: su ocupación al cierre
+        # es la de los primeros intervalos de la ventana si no tuvieron eventos
+        descartar = bisect_right(self.numeros, self._primero_visible()) - 1
+        if descartar > 0:
+            for columna in self._columnas():
+                del columna[:descartar]
+
+    def _avanzar(self, marca):
+        """Integra la ocupación actual hasta `marca` y deja abierto su intervalo"""
+        ancho = self.ancho
+        ocupacion = self._ocupacion
+        if self._marca is not None and marca < self._marca:
+            marca = self._marca
+        numero = int(marca // ancho)
+        if self.numeros and self.numeros[-1] == numero:
+            self.area[-1] += ocupacion * (marca - self._marca)
+        else:
+            if self.numeros:
+                # Cierra el último intervalo con eventos; los intermedios quedan implícitos
+                self.area[-1] += ocupacion * ((self.numeros[-1] + 1) * ancho - self._marca)
+            self.numeros.append(numero)
+            self.area.append(ocupacion * (marca - numero * ancho))
+            self.minimo.append(ocupacion)
+            self.maximo.append(ocupacion)
+            self.final.append(ocupacion)
+            self.entradas.append(0)
+            self.salidas.append(0)
+            self.ingresos.append(0.0)
+            if (self.max_intervalos is not None
+                    and numero - self.numeros[0] >= 2 * self.max_intervalos):
+                # Por tandas: cada recorte descarta del orden de max_intervalos filas
+                self.recortar()
+        self._marca = marca
+
+    def cambiar(self, marca, ocupacion, entradas=0, salidas=0, ingresos=0.0):
+        self._avanzar(marca)
+        self._ocupacion = ocupacion
+        if ocupacion < self.minimo[-1]:
+            self.minimo[-1] = ocupacion
+        elif ocupacion > self.maximo[-1]:
+            self.maximo[-1] = ocupacion
+        self.final[-1] = ocupacion
+        self.entradas[-1] += entradas
+        self.salidas[-1] += salidas
+        self.ingresos[-1] += ingresos
+
+    def intervalos(self, desde=None, hasta=None):
+        """
+        Filas (inicio_epoch, promedio, minimo, maximo, entradas, salidas,
+        ingresos) de cada intervalo entre desde y hasta (por defecto, desde el
+        primer evento, o el comienzo de la ventana, hasta el intervalo
+        actual), incluidos los que no tuvieron eventos.
+        """
+        numeros = self.numeros
+        if not numeros:
+            return []
+        ancho = self.ancho
+        primero = self._primero_visible()
+        inicio = primero if desde is None else max(primero, int(desde // ancho))
+        fin = numeros[-1] + 1 if hasta is None else min(numeros[-1] + 1, int(-(-hasta // ancho)))
+
+        filas = []
+        i = bisect_right(numeros, inicio) - 1  # último intervalo con eventos <= inicio
+        for numero in range(inicio, fin):
+            if i + 1 < len(numeros) and numeros[i + 1] == numero:
+                i += 1
+            if numeros[i] == numero:
+                # El intervalo actual sigue abierto: se promedia lo transcurrido
+                duracion = min(ancho, self._marca - numero * ancho) if i == len(numeros) - 1 else ancho
+                promedio = self.area[i] / duracion if duracion > 0 else float(self.final[i])
+                filas.append((numero * ancho, promedio, self.minimo[i], self.maximo[i],
+                              self.entradas[i], self.salidas[i], self.ingresos[i]))
+            else:
+                ocupacion = self.final[i]
+                filas.append((numero * ancho, float(ocupacion), ocupacion, ocupacion, 0, 0, 0.0))
+        return filas
+
+
+class AnaliticaParqueo:
+    """Estadísticas que SistemaParqueo mantiene al registrar entradas y salidas"""
+
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.por_minuto = SerieOcupacion(60, MINUTOS_RETENIDOS)
+        self.por_hora = SerieOcupacion(3600)
+        self.histograma = array("l", [0]) * (len(LIMITES_ESTADIA) + 1)
+        self._entrada_en_espacio = array("d", [0.0]) * capacidad
+        self._suma_estadias = 0.0
+        self._estadias = 0
+
+    def registrar_entradas(self, espacios, marca, ocupacion):
+        entrada_en_espacio = self._entrada_en_espacio
+        for espacio in espacios:
+            entrada_en_espacio[espacio] = marca
+        self.por_minuto.cambiar(marca, ocupacion, entradas=len(espacios))
+        self.por_hora.cambiar(marca, ocupacion, entradas=len(espacios))
+
+    def registrar_salidas(self, espacios, marca, tarifas, ocupacion):
+        entrada_en_espacio = self._entrada_en_espacio
+        histograma = self.histograma
+        if len(espacios) >= _LOTE_VECTORIZADO:
+            entradas = np.frombuffer(entrada_en_espacio, dtype=np.float64)[np.array(espacios)]
+            estadias = marca - entradas
+            self._suma_estadias += float(estadias.sum())
+            # searchsorted(side="right") es el mismo bisect_right, de una vez
+            clases = np.searchsorted(LIMITES_ESTADIA, estadias / 60, side="right")
+            conteos = np.bincount(clases, minlength=len(histograma)).tolist()
+            for clase, conteo in enumerate(conteos):
+                histograma[clase] += conteo
+        else:
+            for espacio in espacios:
+                estadia = marca - entrada_en_espacio[espacio]
+                self._suma_estadias += estadia
+                histograma[bisect_right(LIMITES_ESTADIA, estadia / 60)] += 1
+        self._estadias += len(espacios)
+        ingresos = sum(tarifas)
+        self.por_minuto.cambiar(marca, ocupacion, salidas=len(espacios), ingresos=ingresos)
+        self.por_hora.cambiar(marca, ocupacion, salidas=len(espacios), ingresos=ingresos)
+
+    # ---------- Consultas ----------
+    def ocupacion_por_minuto(self, desde=None, hasta=None):
+        return self.por_minuto.intervalos(desde, hasta)
+
+    def ocupacion_por_hora(self, desde=None, hasta=None):
+        return self.por_hora.intervalos(desde, hasta)
+
+    def ingresos_por_hora(self, desde=None, hasta=None):
+        """Lista de (inicio_epoch, ingresos) por hora"""
+        return [(fila[0], fila[6]) for fila in self.por_hora.intervalos(desde, hasta)]
+
+    def histograma_estadias(self):
+        """Lista de (etiqueta, cantidad) con las clases de LIMITES_ESTADIA"""
+        etiquetas = []
+        anterior = 0
+        for limite in LIMITES_ESTADIA:
+            etiquetas.append(f"{anterior}-{limite} min")
+            anterior = limite
+        etiquetas.append(f">= {anterior} min")
+        return list(zip(etiquetas, self.histograma))
+
+    def estadia_promedio(self):
+        """Estadía promedio en segundos de los autos que ya salieron"""
+        return self._suma_estadias / self._estadias if self._estadias else 0.0
+
+    def resumen(self, desde=None, hasta=None):
+        """
+        Estadísticas de un período (por ejemplo un día) a partir de la serie
+        por hora: O(horas del período), sin leer eventos.
+        """
+        filas = self.por_hora.intervalos(desde, hasta)
+        if not filas:
+            return {"horas": 0, "ocupacion_promedio": 0.0, "ocupacion_maxima": 0,
+                    "entradas": 0, "salidas": 0, "ingresos": 0.0}
+        return {
+            "horas": len(filas),
+            "ocupacion_promedio": sum(fila[1] for fila in filas) / len(filas) / self.capacidad * 100,
+            "ocupacion_maxima": max(fila[3] for fila in filas),
+            "entradas": sum(fila[4] for fila in filas),
+            "salidas": sum(fila[5] for fila in filas),
+            "ingresos": round(sum(fila[6] for fila in filas), 2),
+        }
@@ -0,0 +1,321 @@
+'''
+Persistencia del parqueo: diario de escritura anticipada (WAL) + instantáneas.
+
+- Cada entrada o salida agrega un registro binario de tamaño fijo
+  (tipo, código de placa, espacio, marca, tarifa) a un búfer en memoria. El
+  búfer se entrega por grupos (cada N registros o cada cierto tiempo) a un
+  hilo escritor, que escribe y hace un solo fsync por todos los grupos que
+  encuentre en la cola: entradas y salidas nunca esperan al disco.
+- Las placas LLL-NNN van en el registro con su código (placas.py). Las de
+  formato libre se guardan una sola vez en placas.txt (una por línea) y su
+  código en el diario es CODIGOS_FORMATO + número de línea.
+- instantanea() guarda solo el estado de ocupación del parqueo
+  (SistemaParqueo.estado_ocupacion: espacios, pila de libres, tabla de
+  placas y analítica) junto con la cantidad de registros del diario que
+  refleja. Se serializa en el momento (una copia) y el hilo escritor la
+  graba. Al recuperar, el historial de eventos se carga en bloque desde el
+  diario con NumPy y solo se reaplica la cola posterior a la instantánea.
+
+Si el proceso se corta, se pierden como mucho los registros que aún no
+llegaron a disco; sincronizar() espera a que lo registrado hasta el momento
+quede escrito.
+'''
+
+import os
+import pickle
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+from parcial_1 import SistemaParqueo
+from placas import CODIGOS_FORMATO, LOTE_VECTORIZADO
+
+# tipo (0 = ENTRADA, 1 = SALIDA), código de placa, espacio, marca (epoch), tarifa
+REGISTRO = struct.Struct("<BIIdd")
+# El mismo registro como dtype de NumPy (empaquetado, sin relleno)
+REGISTRO_DTYPE = np.dtype([("tipo", "u1"), ("codigo", "<u4"), ("espacio", "<u4"),
+                           ("marca", "<f8"), ("tarifa", "<f8")])
+_CODIGO = {"ENTRADA": 0, "SALIDA": 1}
+
+ARCHIVO_DIARIO = "diario.bin"
+ARCHIVO_PLACAS = "placas.txt"
+ARCHIVO_INSTANTANEA = "instantanea.pkl"
+# Grupos que pueden esperar en la cola del escritor antes de frenar a quien registra
+GRUPOS_EN_COLA = 64
+
+
+class DiarioParqueo:
+    """Escritor del diario con búfer, sincronización por grupos e hilo escritor"""
+
+    def __init__(self, directorio, registros_por_grupo=4096, intervalo_sincronizacion=0.5,
+                 instantanea_cada=100_000):
+        self.directorio = directorio
+        self.registros_por_grupo = registros_por_grupo
+        self.intervalo_sincronizacion = intervalo_sincronizacion
+        # Cada cuántos registros del diario se toma una instantánea automática
+        self.instantanea_cada = instantanea_cada
+        self.sistema = None  # parqueo al que pertenece (lo asigna abrir_parqueo)
+        os.makedirs(directorio, exist_ok=True)
+
+        self._id_placa = {}  # placa de formato libre -> número de línea en placas.txt
+        ruta_placas = os.path.join(directorio, ARCHIVO_PLACAS)
+        if os.path.exists(ruta_placas):
+            with open(ruta_placas, encoding="utf-8") as archivo:
+                for linea in archivo:
+                    self._id_placa[linea.rstrip("\n")] = len(self._id_placa)
+        self._placas = open(ruta_placas, "a", encoding="utf-8")
+
+        ruta_diario = os.path.join(directorio, ARCHIVO_DIARIO)
+        self._diario = open(ruta_diario, "ab")
+        # Un registro a medio escribir (corte de energía) se descarta
+        tamano = self._diario.seek(0, os.SEEK_END)
+        if tamano % REGISTRO.size:
+            self._diario.truncate(tamano - tamano % REGISTRO.size)
+        # Registros ya en disco (lo actualiza el hilo escritor) y entregados al hilo
+        self.registros_escritos = tamano // REGISTRO.size
+        self.registros_enviados = self.registros_escritos
+        self._registros_instantanea = self.registros_escritos
+
+        self._bufer = bytearray()
+        self._placas_nuevas = []
+        self._pendientes = 0
+        self._ultimo_envio = time.monotonic()
+
+        self._error = None  # excepción del hilo escritor, se relanza al registrar
+        self._cola = queue.Queue(GRUPOS_EN_COLA)
+        self._escritor = threading.Thread(target=self._escribir, name="escritor-diario", daemon=True)
+        self._escritor.start()
+
+    def __len__(self):
+        """Registros del diario, incluidos los que aún no llegaron a disco"""
+        return self.registros_enviados + self._pendientes
+
+    def _codigo_diario(self, codigo):
+        """Código de placa del parqueo -> código en el diario (los LLL-NNN no cambian)"""
+        if codigo < CODIGOS_FORMATO:
+            return codigo
+        placa = self.sistema.tabla_placas.decodificar(codigo)
+        linea = self._id_placa.get(placa)
+        if linea is None:
+            linea = self._id_placa[placa] = len(self._id_placa)
+            self._placas_nuevas.append(placa)
+        return CODIGOS_FORMATO + linea
+
+    def registrar(self, tipo, codigos, espacios, marca, tarifas=None):
+        """Agrega un lote al búfer; lo entrega al escritor si se completó un grupo o pasó el intervalo"""
+        if self._error is not None:
+            raise self._error
+        tipo = _CODIGO[tipo]
+        cantidad = len(codigos)
+        # Solo hace falta convertir si el parqueo ya internó alguna placa de formato libre
+        libres = bool(self.sistema.tabla_placas)
+        if cantidad < LOTE_VECTORIZADO:
+            if libres:
+                convertir = self._codigo_diario
+                codigos = [convertir(codigo) for codigo in codigos]
+            empaquetar = REGISTRO.pack
+            bufer = self._bufer
+            if tarifas is None:
+                for codigo, espacio in zip(codigos, espacios):
+                    bufer += empaquetar(tipo, codigo, espacio, marca, 0.0)
+            else:
+                for codigo, espacio, tarifa in zip(codigos, espacios, tarifas):
+                    bufer += empaquetar(tipo, codigo, espacio, marca, tarifa)
+        else:
+            registros = np.empty(cantidad, dtype=REGISTRO_DTYPE)
+            registros["tipo"] = tipo
+            registros["codigo"] = codigos
+            if libres:
+                convertir = self._codigo_diario
+                columna = registros["codigo"]
+                for i in np.flatnonzero(columna >= CODIGOS_FORMATO).tolist():
+                    columna[i] = convertir(int(columna[i]))
+            registros["espacio"] = espacios
+            registros["marca"] = marca
+            registros["tarifa"] = 0.0 if tarifas is None else tarifas
+            self._bufer += registros.tobytes()
+        self._pendientes += cantidad
+
+        if (self._pendientes >= self.registros_por_grupo
+                or time.monotonic() - self._ultimo_envio >= self.intervalo_sincronizacion):
+            self._enviar_grupo()
+            if (self.instantanea_cada
+                    and self.registros_enviados - self._registros_instantanea >= self.instantanea_cada):
+                self.instantanea()
+
+    def _enviar_grupo(self):
+        """Entrega el búfer al hilo escritor (no espera a que llegue a disco)"""
+        if self._pendientes:
+            lineas = "".join(placa + "\n" for placa in self._placas_nuevas)
+            self._cola.put(("registros", lineas, bytes(self._bufer), self._pendientes))
+            self.registros_enviados += self._pendientes
+            self._bufer.clear()
+            self._placas_nuevas.clear()
+            self._pendientes = 0
+        self._ultimo_envio = time.monotonic()
+
+    def sincronizar(self):
+        """Entrega el búfer y espera a que todo lo registrado esté en disco"""
+        self._enviar_grupo()
+        self._cola.join()
+        if self._error is not None:
+            raise self._error
+
+    def instantanea(self, sistema=None):
+        """
+        Toma una instantánea del estado de ocupación y hasta qué registro del
+        diario refleja. Solo la serialización ocurre aquí; el hilo escritor la
+        graba cuando los registros que refleja ya están en disco.
+        """
+        sistema = sistema or self.sistema
+        self._enviar_grupo()
+        self._registros_instantanea = self.registros_enviados
+        datos = pickle.dumps((self.registros_enviados, sistema.estado_ocupacion()),
+                             protocol=pickle.HIGHEST_PROTOCOL)
+        self._cola.put(("instantanea", datos))
+
+    def _escribir(self):
+        """Hilo escritor: junta los grupos que haya en la cola y hace un solo fsync por archivo"""
+        while True:
+            tareas = [self._cola.get()]
+            while True:
+                try:
+                    tareas.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self._error is None:
+                    self._escribir_tareas(tareas)
+            except Exception as error:
+                self._error = error
+            finally:
+                for _ in tareas:
+                    self._cola.task_done()
+            if tareas[-1] is None:
+                return
+
+    def _escribir_tareas(self, tareas):
+        pendientes = []  # registros escritos pero sin fsync todavía
+        for tarea in tareas:
+            if tarea is None:
+                break
+            if tarea[0] == "registros":
+                _, lineas, datos, cantidad = tarea
+                if lineas:
+                    self._placas.write(lineas)
+                self._diario.write(datos)
+                pendientes.append(cantidad)
+            else:
+                # La instantánea solo se graba cuando lo que refleja ya está en disco
+                self._sincronizar_archivos(pendientes)
+                self._grabar_instantanea(tarea[1])
+        self._sincronizar_archivos(pendientes)
+
+    def _sincronizar_archivos(self, pendientes):
+        if not pendientes:
+            return
+        # Las placas nuevas primero: un registro nunca llega a disco sin su placa
+        self._placas.flush()
+        os.fsync(self._placas.fileno())
+        self._diario.flush()
+        os.fsync(self._diario.fileno())
+        self.registros_escritos += sum(pendientes)
+        pendientes.clear()
+
+    def _grabar_instantanea(self, datos):
+        ruta = os.path.join(self.directorio, ARCHIVO_INSTANTANEA)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(datos)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        # El reemplazo es atómico: nunca queda una instantánea a medias
+        os.replace(temporal, ruta)
+
+    def cerrar(self):
+        self._enviar_grupo()
+        self._cola.put(None)
+        self._escritor.join()
+        self._diario.close()
+        self._placas.close()
+        if self._error is not None:
+            raise self._error
+
+
+def _leer_diario(directorio):
+    """Registros del diario como array estructurado (REGISTRO_DTYPE), sin el último si quedó a medias"""
+    ruta = os.path.join(directorio, ARCHIVO_DIARIO)
+    cantidad = os.path.getsize(ruta) // REGISTRO.size
+    return np.fromfile(ruta, dtype=REGISTRO_DTYPE, count=cantidad)
+
+
+def _codigos_parqueo(sistema, directorio, codigos):
+    """Códigos del diario -> códigos de sistema.tabla_placas (solo cambian los de formato libre)"""
+    codigos = codigos.astype(np.int64)
+    libres = codigos >= CODIGOS_FORMATO
+    if libres.any():
+        with open(os.path.join(directorio, ARCHIVO_PLACAS), encoding="utf-8") as archivo:
+            placas = archivo.read().split("\n")
+        # Cada placa distinta se codifica una vez, en el orden en que aparece en el diario
+        lineas, primeras, inversos = np.unique(codigos[libres] - CODIGOS_FORMATO,
+                                               return_index=True, return_inverse=True)
+        codificar = sistema.tabla_placas.codificar
+        traducidos = np.empty(len(lineas), dtype=np.int64)
+        for i in np.argsort(primeras, kind="stable").tolist():
+            traducidos[i] = codificar(placas[lineas[i]])
+        codigos[libres] = traducidos[inversos.reshape(-1)]
+    return codigos
+
+
+def _reaplicar(sistema, registros, codigos):
+    """Aplica los registros (la cola del diario) como los lotes que los generaron"""
+    if not len(registros):
+        return 0
+    tipos = registros["tipo"]
+    marcas = registros["marca"]
+    # Los registros consecutivos con el mismo tipo y marca formaron un lote
+    cortes = np.flatnonzero((tipos[1:] != tipos[:-1]) | (marcas[1:] != marcas[:-1])) + 1
+    inicios = [0, *cortes.tolist()]
+    finales = [*cortes.tolist(), len(registros)]
+    codigos = codigos.tolist()
+    espacios = registros["espacio"].tolist()
+    tarifas = registros["tarifa"].tolist()
+    for inicio, fin in zip(inicios, finales):
+        marca = float(marcas[inicio])
+        if tipos[inicio] == _CODIGO["ENTRADA"]:
+            # Con el mismo estado de partida, la entrada vuelve a asignar los mismos espacios
+            sistema.entrada_codigos(codigos[inicio:fin], marca)
+        else:
+            sistema.salida_espacios(espacios[inicio:fin], marca, tarifas[inicio:fin])
+    return len(registros)
+
+
+def abrir_parqueo(directorio, capacidad_maxima=50, **opciones_diario):
+    """
+    Recupera el parqueo guardado en `directorio` (instantánea + cola del
+    diario) o crea uno nuevo, y lo deja registrando en el diario.
+    """
+    sistema = None
+    desde = 0
+    ruta_instantanea = os.path.join(directorio, ARCHIVO_INSTANTANEA)
+    if os.path.exists(ruta_instantanea):
+        with open(ruta_instantanea, "rb") as archivo:
+            desde, estado = pickle.load(archivo)
+        sistema = SistemaParqueo.desde_estado(estado)
+    if sistema is None:
+        sistema = SistemaParqueo(capacidad_maxima)
+    if os.path.exists(os.path.join(directorio, ARCHIVO_DIARIO)):
+        registros = _leer_diario(directorio)
+        codigos = _codigos_parqueo(sistema, directorio, registros["codigo"])
+        # El historial hasta la instantánea se carga en bloque; la ocupación ya la tiene el estado
+        desde = min(desde, len(registros))
+        sistema.historial_eventos.cargar_columnas(
+            registros["tipo"][:desde], codigos[:desde], registros["marca"][:desde], registros["tarifa"][:desde])
+        _reaplicar(sistema, registros[desde:], codigos[desde:])
+
+    sistema.diario = DiarioParqueo(directorio, **opciones_diario)
+    sistema.diario.sistema = sistema
+    return sistema
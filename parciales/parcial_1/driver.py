@@ -0,0 +1,243 @@
+'''
+Driver no interactivo del parqueo: lee comandos de un archivo (o de stdin) y
+los aplica a un SistemaParqueo sin imprimir nada por operación. Al final
+reporta el rendimiento y los percentiles de latencia por tipo de operación.
+
+Formatos (uno por línea):
+
+    CSV con encabezado:  operacion,placa,cantidad,marca,desde,hasta,tipo
+    JSON Lines:          {"operacion": "entrada", "placa": "ABC-123", "cantidad": 2}
+
+Operaciones:
+    entrada     placa (o "aleatorio"), cantidad
+    salida      placa (o "aleatorio"), cantidad
+    estado      estado del parqueo y ocupación
+    autos       placas estacionadas
+    historial   eventos de una placa
+    ultimos     últimos `cantidad` eventos
+    entre       eventos con desde <= hora < hasta (epoch), opcionalmente de un tipo
+
+`marca` (segundos epoch) es opcional: permite reproducir tráfico con sus horas
+originales. Las columnas vacías se ignoran. Una línea que no se puede
+interpretar (JSON inválido, valores de tipo incorrecto) cuenta como error de
+su comando (o de "comando_invalido") y la reproducción sigue.
+
+Uso:
+    python driver.py trafico.csv --capacidad 5000
+    cat trafico.jsonl | python driver.py - --formato jsonl --json reporte.json
+'''
+
+import argparse
+import csv
+import json
+import math
+import random
+import sys
+import time
+from array import array
+
+from parcial_1 import SistemaParqueo
+
+
+# Clave del reporte para las líneas que no son un comando
+COMANDO_INVALIDO = "comando_invalido"
+
+
+def leer_comandos(archivo, formato):
+    """
+    Genera un comando por línea sin interpretar: el texto de cada línea JSON
+    o el dict de cada fila CSV. decodificar_comando los convierte, dentro de
+    reproducir, para que una línea inválida no corte la lectura.
+    """
+    if formato == "jsonl":
+        for linea in archivo:
+            linea = linea.strip()
+            if linea:
+                yield linea
+    else:
+        yield from csv.DictReader(archivo)
+
+
+def decodificar_comando(crudo):
+    """Línea JSON o fila CSV -> dict del comando (de la fila CSV se omiten las columnas vacías)"""
+    if not isinstance(crudo, str):
+        return {clave: valor for clave, valor in crudo.items() if valor not in (None, "")}
+    comando = json.loads(crudo)
+    if not isinstance(comando, dict) or not isinstance(comando.get("operacion", ""), str):
+        raise ValueError("El comando debe ser un objeto JSON con una operación de texto")
+    return comando
+
+
+def _marca(comando):
+    marca = comando.get("marca")
+    return None if marca is None else float(marca)
+
+
+def _placa(comando, por_defecto=None):
+    placa = comando.get("placa", por_defecto)
+    if not isinstance(placa, str):
+        raise TypeError("La placa debe ser texto")
+    return placa
+
+
+def _entrada(sistema, comando):
+    placa = _placa(comando, "aleatorio")
+    cantidad = int(comando.get("cantidad", 1))
+    if placa == "aleatorio":
+        return sistema.entrada_codigos(sistema.generar_codigos_aleatorios(cantidad), _marca(comando))
+    return sistema.entrada_lote([placa] * cantidad, _marca(comando))
+
+
+def _salida(sistema, comando):
+    # Igual que entrada y salida_auto: la placa se pasa tal cual y el parqueo la
+    # normaliza (placas.normalizar_placa, al codificarla y al buscarla)
+    placa = _placa(comando, "aleatorio")
+    cantidad = int(comando.get("cantidad", 1))
+    if placa == "aleatorio":
+        return sistema.salida_aleatoria(cantidad, _marca(comando))
+    return sistema.salida_lote([placa] * cantidad, _marca(comando))
+
+
+def _estado(sistema, comando):
+    return sistema.obtener_estado_parqueo(), sistema.calcular_porcentaje_ocupacion()
+
+
+def _autos(sistema, comando):
+    return sistema.placas_autos
+
+
+def _historial(sistema, comando):
+    return sistema.historial_eventos.de_placa(_placa(comando))
+
+
+def _ultimos(sistema, comando):
+    return sistema.historial_eventos.ultimos(int(comando.get("cantidad", 10)))
+
+
+def _entre(sistema, comando):
+    return sistema.eventos_entre(float(comando["desde"]), float(comando["hasta"]),
+                                 comando.get("tipo"))
+
+
+OPERACIONES = {
+    "entrada": _entrada,
+    "salida": _salida,
+    "estado": _estado,
+    "autos": _autos,
+    "historial": _historial,
+    "ultimos": _ultimos,
+    "entre": _entre,
+}
+
+
+def percentil(ordenados, p):
+    """Percentil por rango más cercano de una secuencia ya ordenada"""
+    if not ordenados:
+        return 0
+    indice = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def reproducir(sistema, comandos):
+    """
+    Aplica los comandos y mide cada uno. Retorna el reporte: totales y, por
+    operación, cantidad, errores, operaciones/s y latencias (µs).
+    """
+    latencias = {}
+    errores = {}
+    reloj = time.perf_counter_ns
+    inicio = reloj()
+    for crudo in comandos:
+        try:
+            comando = decodificar_comando(crudo)
+        except ValueError:
+            errores[COMANDO_INVALIDO] = errores.get(COMANDO_INVALIDO, 0) + 1
+            continue
+        operacion = comando.get("operacion", "")
+        funcion = OPERACIONES.get(operacion)
+        if funcion is None:
+            errores[operacion] = errores.get(operacion, 0) + 1
+            continue
+        antes = reloj()
+        try:
+            funcion(sistema, comando)
+        except (ValueError, KeyError, TypeError):
+            # Un comando inválido (sin espacio, placa ausente, "cantidad": null...)
+            # no detiene la reproducción
+            errores[operacion] = errores.get(operacion, 0) + 1
+        medidas = latencias.get(operacion)
+        if medidas is None:
+            medidas = latencias[operacion] = array("q")
+        medidas.append(reloj() - antes)
+    duracion = (reloj() - inicio) / 1e9
+
+    total = sum(len(medidas) for medidas in latencias.values())
+    reporte = {
+        "comandos": total,
+        "duracion_s": duracion,
+        "comandos_por_segundo": total / duracion if duracion else None,
+        "operaciones": {},
+        "estado_final": {
+            "espacios_ocupados": sistema.espacios_ocupados,
+            "espacios_libres": sistema.espacios_libres,
+            "eventos": len(sistema.historial_eventos),
+        },
+    }
+    for operacion in sorted(set(latencias) | set(errores)):
+        ordenadas = sorted(latencias.get(operacion, ()))
+        ocupado = sum(ordenadas) / 1e9
+        reporte["operaciones"][operacion] = {
+            "cantidad": len(ordenadas),
+            "errores": errores.get(operacion, 0),
+            "por_segundo": len(ordenadas) / ocupado if ocupado else None,
+            "p50_us": percentil(ordenadas, 50) / 1e3,
+            "p90_us": percentil(ordenadas, 90) / 1e3,
+            "p99_us": percentil(ordenadas, 99) / 1e3,
+            "max_us": ordenadas[-1] / 1e3 if ordenadas else 0,
+        }
+    return reporte
+
+
+def imprimir_reporte(reporte):
+    print(f"{reporte['comandos']} comandos en {reporte['duracion_s']:.3f}s "
+          f"({reporte['comandos_por_segundo'] or 0:,.0f} comandos/s)")
+    print(f"{'operación':>10} | {'cantidad':>9} | {'errores':>7} | {'ops/s':>11} | "
+          f"{'p50 µs':>8} | {'p90 µs':>8} | {'p99 µs':>8} | {'max µs':>9}")
+    for operacion, datos in reporte["operaciones"].items():
+        print(f"{operacion:>10} | {datos['cantidad']:>9} | {datos['errores']:>7} | "
+              f"{datos['por_segundo'] or 0:>11,.0f} | {datos['p50_us']:>8.1f} | "
+              f"{datos['p90_us']:>8.1f} | {datos['p99_us']:>8.1f} | {datos['max_us']:>9.1f}")
+    final = reporte["estado_final"]
+    print(f"Estado final: {final['espacios_ocupados']} ocupados, "
+          f"{final['espacios_libres']} libres, {final['eventos']} eventos")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce comandos sobre SistemaParqueo")
+    parser.add_argument("archivo", help="archivo CSV/JSONL, o - para stdin")
+    parser.add_argument("--formato", choices=("csv", "jsonl"),
+                        help="por defecto se deduce de la extensión (csv si no se puede)")
+    parser.add_argument("--capacidad", type=int, default=50)
+    parser.add_argument("--semilla", type=int, help="semilla para placas y tarifas aleatorias")
+    parser.add_argument("--json", help="guarda el reporte en este archivo JSON")
+    args = parser.parse_args()
+
+    formato = args.formato or ("jsonl" if args.archivo.endswith((".jsonl", ".ndjson")) else "csv")
+    if args.semilla is not None:
+        random.seed(args.semilla)
+
+    sistema = SistemaParqueo(args.capacidad)
+    if args.archivo == "-":
+        reporte = reproducir(sistema, leer_comandos(sys.stdin, formato))
+    else:
+        with open(args.archivo, newline="", encoding="utf-8") as archivo:
+            reporte = reproducir(sistema, leer_comandos(archivo, formato))
+
+    imprimir_reporte(reporte)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+'''
+Registro de eventos del parqueo: un único almacén que solo crece al final.
+
+En lugar de una lista de tuplas (placa, tipo, "YYYY-mm-dd HH:MM:SS", tarifa)
+más una copia de cada tupla en un diccionario por placa, los eventos se
+guardan en columnas (array). La placa se guarda como su código entero
+(placas.TablaPlacas) y se decodifica al mostrarla. Cada evento guarda el
+índice del evento anterior de su misma placa, así que el historial de una
+placa se recorre en O(k) sin mantener una lista por placa. Esa cadena se
+arma de forma diferida (en bloque, con NumPy) la primera vez que se consulta
+por placa, así que agregar eventos solo extiende columnas. La hora se guarda
+como segundos desde epoch y se formatea al mostrarla.
+'''
+
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+
+from placas import TablaPlacas
+
+TIPOS_EVENTO = ("ENTRADA", "SALIDA")
+CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_EVENTO)}
+
+FORMATO_HORA = "%Y-%m-%d %H:%M:%S"
+# Por debajo de esta cantidad de eventos sin encadenar, la cadena se arma en Python
+_ENCADENAR_VECTORIZADO = 64
+_ultima_hora = [None, ""]  # (segundo, texto) del último formateo
+
+
+def formatear_hora(marca):
+    """Segundos desde epoch -> 'YYYY-mm-dd HH:MM:SS' (reutiliza el texto dentro del mismo segundo)"""
+    segundo = int(marca)
+    if _ultima_hora[0] != segundo:
+        _ultima_hora[0] = segundo
+        _ultima_hora[1] = time.strftime(FORMATO_HORA, time.localtime(segundo))
+    return _ultima_hora[1]
+
+
+def a_marca(momento):
+    """Acepta datetime o segundos desde epoch y retorna segundos desde epoch"""
+    if isinstance(momento, datetime):
+        return momento.timestamp()
+    return float(momento)
+
+
+class RegistroEventos:
+    """
+    Eventos en columnas paralelas: código de placa, código de tipo, marca
+    (epoch) y tarifa. Se indexa como la lista original: evento[i] o
+    evento[-k:] devuelven tuplas (placa, tipo, hora, tarifa).
+    tabla: TablaPlacas compartida con el parqueo (se crea una si no se indica).
+    """
+
+    def __init__(self, tabla=None):
+        self.tabla = TablaPlacas() if tabla is None else tabla
+        self._ultimo_de_placa = {}  # código -> índice de su último evento encadenado
+        self._encadenados = 0  # los eventos [0, _encadenados) ya tienen su anterior
+
+        self.codigos = array("l")
+        self.anteriores = array("l")  # evento anterior de la misma placa (-1 si no hay)
+        self.tipos = array("b")
+        self.marcas = array("d")
+        self.tarifas = array("d")
+
+    def __len__(self):
+        return len(self.marcas)
+
+    def __bool__(self):
+        return bool(self.marcas)
+
+    def __iter__(self):
+        for i in range(len(self.marcas)):
+            yield self._evento(i)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._evento(i) for i in range(*indice.indices(len(self.marcas)))]
+        if indice < 0:
+            indice += len(self.marcas)
+        if not 0 <= indice < len(self.marcas):
+            raise IndexError("índice de evento fuera de rango")
+        return self._evento(indice)
+
+    def _evento(self, i):
+        return (
+            self.tabla.decodificar(self.codigos[i]),
+            TIPOS_EVENTO[self.tipos[i]],
+            formatear_hora(self.marcas[i]),
+            self.tarifas[i],
+        )
+
+    def placa(self, codigo):
+        """Placa correspondiente a un código"""
+        return self.tabla.decodificar(codigo)
+
+    def agregar(self, placa, tipo, marca, tarifa=0.0):
+        """Agrega un evento al final y retorna su índice"""
+        return self.agregar_codigo(self.tabla.codificar(placa), tipo, marca, tarifa)
+
+    def agregar_codigo(self, codigo, tipo, marca, tarifa=0.0):
+        indice = len(self.marcas)
+        # La columna de marcas debe quedar ordenada para la búsqueda binaria:
+        # si el reloj del sistema retrocede, el evento conserva la última marca
+        if indice and marca < self.marcas[-1]:
+            marca = self.marcas[-1]
+        self.codigos.append(codigo)
+        self.anteriores.append(-1)  # se completa en _encadenar
+        self.tipos.append(CODIGO_TIPO[tipo])
+        self.marcas.append(marca)
+        self.tarifas.append(tarifa)
+        return indice
+
+    def agregar_lote(self, placas, tipo, marca, tarifas=None):
+        """Agrega un evento por placa, todos con la misma marca y tipo"""
+        self.agregar_codigos(self.tabla.codificar_lote(placas), tipo, marca, tarifas)
+
+    def agregar_codigos(self, codigos, tipo, marca, tarifas=None):
+        """Como agregar_lote, con las placas ya codificadas"""
+        cantidad = len(codigos)
+        if cantidad <= 1:
+            # Con un solo evento no compensa armar los arrays del lote
+            if cantidad:
+                self.agregar_codigo(codigos[0], tipo, marca, tarifas[0] if tarifas else 0.0)
+            return
+        inicio = len(self.marcas)
+        if inicio and marca < self.marcas[-1]:
+            marca = self.marcas[-1]
+
+        self.codigos.extend(codigos)
+        self.anteriores.extend(array("l", [-1]) * cantidad)  # se completa en _encadenar
+        self.tipos.extend(array("b", [CODIGO_TIPO[tipo]]) * cantidad)
+        self.marcas.extend(array("d", [marca]) * cantidad)
+        if tarifas is None:
+            self.tarifas.extend(array("d", [0.0]) * cantidad)
+        else:
+            self.tarifas.extend(tarifas)
+
+    def cargar_columnas(self, tipos, codigos, marcas, tarifas):
+        """
+        Agrega eventos en bloque desde arrays de NumPy (por ejemplo leídos del
+        diario de persistencia), sin recorrerlos en Python.
+        """
+        if not len(marcas):
+            return
+        marcas = np.maximum.accumulate(np.asarray(marcas, dtype=np.float64))
+        if self.marcas and marcas[0] < self.marcas[-1]:
+            marcas = np.maximum(marcas, self.marcas[-1])
+        self.codigos.frombytes(np.asarray(codigos, dtype=np.dtype(self.codigos.typecode)).tobytes())
+        self.anteriores.extend(array("l", [-1]) * len(marcas))
+        self.tipos.frombytes(np.asarray(tipos, dtype=np.int8).tobytes())
+        self.marcas.frombytes(marcas.tobytes())
+        self.tarifas.frombytes(np.asarray(tarifas, dtype=np.float64).tobytes())
+
+    def _encadenar(self):
+        """Completa el evento anterior de cada placa en los eventos agregados desde la última vez"""
+        inicio = self._encadenados
+        fin = len(self.marcas)
+        if inicio == fin:
+            return
+        ultimo = self._ultimo_de_placa
+        anteriores = self.anteriores
+        if fin - inicio < _ENCADENAR_VECTORIZADO:
+            codigos = self.codigos
+            for indice in range(inicio, fin):
+                codigo = codigos[indice]
+                anteriores[indice] = ultimo.get(codigo, -1)
+                ultimo[codigo] = indice
+        else:
+            # Orden por (código, índice): dentro de cada grupo, el anterior de
+            # un evento es el que lo precede; el primero del grupo enlaza con
+            # el último evento ya encadenado de esa placa. Ordenar una sola
+            # clave entera (código << 32 | posición) es más rápido que un
+            # argsort estable.
+            codigos = np.frombuffer(self.codigos, dtype=np.dtype(self.codigos.typecode))[inicio:fin]
+            claves = codigos.astype(np.int64) << 32
+            claves |= np.arange(fin - inicio, dtype=np.int64)
+            claves.sort()
+            ordenados = claves >> 32
+            indices = (claves & 0xFFFFFFFF) + inicio
+            del claves
+            cantidad = len(indices)
+            primeros = np.empty(cantidad, dtype=bool)
+            primeros[0] = True
+            np.not_equal(ordenados[1:], ordenados[:-1], out=primeros[1:])
+            previos = np.empty(cantidad, dtype=np.int64)
+            previos[0] = -1
+            previos[1:] = indices[:-1]
+            posiciones_primeros = np.flatnonzero(primeros)
+            codigos_grupo = ordenados[posiciones_primeros].tolist()
+            if ultimo:
+                previos[posiciones_primeros] = [ultimo.get(codigo, -1) for codigo in codigos_grupo]
+            else:
+                previos[posiciones_primeros] = -1
+            vista = np.frombuffer(anteriores, dtype=np.dtype(anteriores.typecode))
+            vista[indices] = previos
+            del vista, codigos  # liberan los buffers de los array
+            ultimos = np.append(posiciones_primeros[1:] - 1, cantidad - 1)
+            ultimo.update(zip(codigos_grupo, indices[ultimos].tolist()))
+        self._encadenados = fin
+
+    # ---------- Consultas ----------
+    def ultimos(self, cantidad):
+        """Últimos `cantidad` eventos en O(cantidad)"""
+        if cantidad <= 0:
+            return []
+        return self[-cantidad:]
+
+    def de_placa(self, placa):
+        """Eventos de una placa en O(k), sin recorrer el resto"""
+        self._encadenar()
+        indices = []
+        indice = self._ultimo_de_placa.get(self.tabla.buscar(placa), -1)
+        anteriores = self.anteriores
+        while indice >= 0:
+            indices.append(indice)
+            indice = anteriores[indice]
+        return [self._evento(i) for i in reversed(indices)]
+
+    def rango(self, desde, hasta):
+        """Índices [inicio, fin) de los eventos con desde <= marca < hasta (búsqueda binaria)"""
+        return (bisect_left(self.marcas, a_marca(desde)),
+                bisect_left(self.marcas, a_marca(hasta)))
+
+    def entre(self, desde, hasta, tipo=None):
+        """Eventos con desde <= hora < hasta (datetime o epoch), opcionalmente de un tipo"""
+        inicio, fin = self.rango(desde, hasta)
+        if tipo is None:
+            return self[inicio:fin]
+        codigo = CODIGO_TIPO[tipo]
+        tipos = self.tipos
+        return [self._evento(i) for i in range(inicio, fin) if tipos[i] == codigo]
+
+    def contar_entre(self, desde, hasta):
+        inicio, fin = self.rango(desde, hasta)
+        return fin - inicio
+
+    def por_placa(self):
+        """Vista de solo lectura placa -> lista de eventos (compatible con historial_autos)"""
+        return _HistorialPorPlaca(self)
+
+
+class _HistorialPorPlaca(Mapping):
+
+    def __init__(self, registro):
+        self._registro = registro
+
+    def __getitem__(self, placa):
+        if placa not in self:
+            raise KeyError(placa)
+        return self._registro.de_placa(placa)
+
+    def _ultimos(self):
+        self._registro._encadenar()
+        return self._registro._ultimo_de_placa
+
+    def __contains__(self, placa):
+        return self._registro.tabla.buscar(placa) in self._ultimos()
+
+    def __iter__(self):
+        decodificar = self._registro.tabla.decodificar
+        return (decodificar(codigo) for codigo in self._ultimos())
+
+    def __len__(self):
+        return len(self._ultimos())
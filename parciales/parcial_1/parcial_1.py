@@ -4,22 +4,302 @@ de los estacinamientos en un centro comercial. El equipo debe simular en python
 Se debe generar datos simulados y procesarlos con python.
 '''
 
+import math
+import os
 import random
 import datetime
 import time
+from array import array
+from collections import Counter
+from itertools import repeat
+
+import numpy as np
+
+from analitica import AnaliticaParqueo
+from eventos import RegistroEventos
+from placas import LOTE_VECTORIZADO, TablaPlacas, generar_codigos, normalizar_placa
+from simulacion import SimulacionParqueo
+
+# dtype de NumPy equivalente al typecode "l" de los array de espacios
+_ENTERO = np.dtype("l")
+
+
+def _vista(arreglo, dtype=_ENTERO):
+    """Vista NumPy (sin copia) de un array/bytearray; hay que soltarla antes de redimensionarlo"""
+    return np.frombuffer(arreglo, dtype=dtype)
+
+
+class ResultadoLote:
+    """
+    Resultado de entrada_lote / salida_lote (en lugar de imprimir). Guarda los
+    códigos de las placas; los strings se arman solo si se consulta `placas`.
+    """
+
+    __slots__ = ("tipo", "codigos", "espacios", "marca", "tarifas", "_tabla", "_placas")
+
+    def __init__(self, tipo, codigos, espacios, marca, tarifas=None, tabla=None, placas=None):
+        self.tipo = tipo
+        self.codigos = codigos
+        self.espacios = espacios
+        self.marca = marca  # segundos desde epoch, común a todo el lote
+        self.tarifas = tarifas
+        self._tabla = tabla
+        self._placas = placas
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @property
+    def placas(self):
+        if self._placas is None:
+            self._placas = self._tabla.decodificar_lote(self.codigos)
+        return self._placas
+
+    @property
+    def total_tarifas(self):
+        return sum(self.tarifas) if self.tarifas else 0.0
+
+    def __repr__(self):
+        return f"ResultadoLote({self.tipo}, {len(self.codigos)} auto(s), total ${self.total_tarifas:.2f})"
+
 
 class SistemaParqueo:
-    def __init__(self):
+    # Tope admitido para CAPACIDAD_MAXIMA: todas las operaciones son O(1) por auto
+    CAPACIDAD_LIMITE = 100_000
+
+    def __init__(self, capacidad_maxima=50):
+        capacidad_maxima = int(capacidad_maxima)
+        if not 0 < capacidad_maxima <= self.CAPACIDAD_LIMITE:
+            raise ValueError(f"La capacidad debe estar entre 1 y {self.CAPACIDAD_LIMITE}")
+
         # Constantes
-        self.CAPACIDAD_MAXIMA = 50
+        self.CAPACIDAD_MAXIMA = capacidad_maxima
         self.TARIFA_POR_HORA = 5.00  # $5 por hora
         
         # Variables
         self.espacios_ocupados = 0
         self.espacios_libres = self.CAPACIDAD_MAXIMA
-        self.placas_autos = []  # Lista de placas actualmente estacionadas
-        self.historial_eventos = []  # Lista de tuplas con eventos
-        self.historial_autos = {}  # Diccionario con historial por placa
+        # Placa <-> código entero: todas las estructuras internas guardan códigos
+        self.tabla_placas = TablaPlacas()
+        # Eventos en columnas; historial_autos es una vista por placa del mismo registro
+        self.historial_eventos = RegistroEventos(self.tabla_placas)
+        self.historial_autos = self.historial_eventos.por_placa()
+        # Series de ocupación, histograma de estadías e ingresos por hora
+        self.analitica = AnaliticaParqueo(capacidad_maxima)
+        # Diario de persistencia (diario_parqueo.abrir_parqueo); None = solo en memoria
+        self.diario = None
+
+        # Espacios como arreglos paralelos (uno por espacio) en lugar de una lista
+        # de placas: código de la placa estacionada (-1 = libre)
+        self._placa_en_espacio = array("l", [-1]) * capacidad_maxima
+        self._mapa_ocupados = bytearray(capacidad_maxima)  # 1 = espacio ocupado
+        # Pila de espacios libres: el próximo espacio a asignar sale en O(1)
+        self._pila_libres = list(range(capacidad_maxima - 1, -1, -1))
+        # Código de placa -> espacio que ocupa (multiconjunto: se admiten placas repetidas).
+        # El caso normal es un auto por placa y se guarda el entero; solo las
+        # placas repetidas pasan a un set de espacios
+        self._espacios_por_placa = {}
+        # Espacios ocupados en un arreglo denso + posición de cada espacio en él:
+        # se borra intercambiando con el último y se muestrea al azar en O(k)
+        self._ocupados = array("l")
+        self._posicion = array("l", [-1]) * capacidad_maxima
+
+    def __getstate__(self):
+        # El diario (archivos abiertos) no viaja en instantáneas ni entre procesos
+        estado = self.__dict__.copy()
+        estado["diario"] = None
+        return estado
+
+    def estado_ocupacion(self):
+        """
+        Copia del estado de ocupación (espacios, pila de libres, tabla de
+        placas y analítica) sin el historial de eventos, para las instantáneas
+        del diario: su tamaño depende de la capacidad, no de cuántos eventos
+        hubo (la serie por minuto se recorta a su ventana; la por hora suma
+        una fila por hora con eventos).
+        """
+        self.analitica.por_minuto.recortar()
+        return {
+            "capacidad": self.CAPACIDAD_MAXIMA,
+            "tarifa": self.TARIFA_POR_HORA,
+            "placa_en_espacio": self._placa_en_espacio.tobytes(),
+            "ocupados": self._ocupados.tobytes(),
+            "pila_libres": array("l", self._pila_libres).tobytes(),
+            "tabla_placas": self.tabla_placas,
+            "analitica": self.analitica,
+        }
+
+    @classmethod
+    def desde_estado(cls, estado):
+        """Parqueo con la ocupación de estado_ocupacion() y el historial vacío"""
+        sistema = cls(estado["capacidad"])
+        sistema.TARIFA_POR_HORA = estado["tarifa"]
+        sistema.tabla_placas = estado["tabla_placas"]
+        sistema.historial_eventos = RegistroEventos(sistema.tabla_placas)
+        sistema.historial_autos = sistema.historial_eventos.por_placa()
+        sistema.analitica = estado["analitica"]
+
+        sistema._placa_en_espacio = array("l")
+        sistema._placa_en_espacio.frombytes(estado["placa_en_espacio"])
+        sistema._ocupados = array("l")
+        sistema._ocupados.frombytes(estado["ocupados"])
+        pila = array("l")
+        pila.frombytes(estado["pila_libres"])
+        sistema._pila_libres = pila.tolist()
+
+        # Lo derivado (mapa, posiciones y espacios por placa) se reconstruye
+        placa_en_espacio = sistema._placa_en_espacio
+        mapa_ocupados = sistema._mapa_ocupados
+        posicion = sistema._posicion
+        espacios_por_placa = sistema._espacios_por_placa
+        for i, espacio in enumerate(sistema._ocupados):
+            mapa_ocupados[espacio] = 1
+            posicion[espacio] = i
+            codigo = placa_en_espacio[espacio]
+            grupo = espacios_por_placa.get(codigo)
+            if grupo is None:
+                espacios_por_placa[codigo] = espacio
+            elif type(grupo) is int:
+                espacios_por_placa[codigo] = {grupo, espacio}
+            else:
+                grupo.add(espacio)
+        sistema.espacios_ocupados = len(sistema._ocupados)
+        sistema.espacios_libres = sistema.CAPACIDAD_MAXIMA - sistema.espacios_ocupados
+        return sistema
+
+    @property
+    def placas_autos(self):
+        """Placas actualmente estacionadas (permite duplicados)"""
+        placa_en_espacio = self._placa_en_espacio
+        return self.tabla_placas.decodificar_lote([placa_en_espacio[espacio] for espacio in self._ocupados])
+
+    def esta_estacionado(self, placa):
+        """Indica si hay al menos un auto con esa placa en el parqueo (O(1))"""
+        return self.tabla_placas.buscar(placa) in self._espacios_por_placa
+
+    def contar_placa(self, placa):
+        """Cantidad de autos estacionados con esa placa (O(1))"""
+        return self._contar_codigo(self.tabla_placas.buscar(placa))
+
+    def _contar_codigo(self, codigo):
+        espacios = self._espacios_por_placa.get(codigo)
+        if espacios is None:
+            return 0
+        return 1 if type(espacios) is int else len(espacios)
+
+    def espacio_libre(self, espacio):
+        """Indica si el espacio (0..CAPACIDAD_MAXIMA-1) está libre"""
+        return not self._mapa_ocupados[espacio]
+
+    def _retirar(self, codigo, espacio=None):
+        """Libera un espacio de la placa (uno cualquiera si no se indica)"""
+        espacios = self._espacios_por_placa[codigo]
+        if type(espacios) is int:
+            espacio = espacios
+            del self._espacios_por_placa[codigo]
+        else:
+            if espacio is None:
+                espacio = espacios.pop()
+            else:
+                espacios.remove(espacio)
+            if len(espacios) == 1:
+                self._espacios_por_placa[codigo] = espacios.pop()
+        self._placa_en_espacio[espacio] = -1
+        self._mapa_ocupados[espacio] = 0
+        self._pila_libres.append(espacio)
+
+        # Borrado por intercambio: el último ocupado pasa al hueco
+        posicion = self._posicion[espacio]
+        ultimo = self._ocupados.pop()
+        if ultimo != espacio:
+            self._ocupados[posicion] = ultimo
+            self._posicion[ultimo] = posicion
+        self._posicion[espacio] = -1
+        return espacio
+
+    def _quitar_codigos(self, codigos, espacios=None):
+        """
+        Parte de _retirar que toca _espacios_por_placa, para un lote: quita el
+        espacio de cada placa (uno cualquiera si `espacios` es None) y retorna
+        la lista de espacios. Los pop del diccionario se hacen con map (en C);
+        solo las placas con varios autos (guardadas como set) se corrigen una
+        por una.
+        """
+        espacios_por_placa = self._espacios_por_placa
+        # Una placa que se repite en el lote da su grupo en el primer pop y None en los siguientes
+        grupos = list(map(espacios_por_placa.pop, codigos, repeat(None)))
+        repetidas = {}
+        if set(map(type, grupos)) != {int}:
+            repetidas = {codigo: grupo for codigo, grupo in zip(codigos, grupos) if type(grupo) is set}
+        if espacios is None:
+            espacios = grupos
+        if repetidas:
+            posiciones = [i for i, codigo in enumerate(codigos) if codigo in repetidas]
+            if espacios is grupos:
+                for i in posiciones:
+                    espacios[i] = repetidas[codigos[i]].pop()
+            else:
+                for i in posiciones:
+                    repetidas[codigos[i]].remove(espacios[i])
+            # Las placas que conservan autos vuelven al diccionario (un int si queda uno)
+            for codigo, grupo in repetidas.items():
+                if len(grupo) == 1:
+                    espacios_por_placa[codigo] = grupo.pop()
+                elif grupo:
+                    espacios_por_placa[codigo] = grupo
+        return espacios
+
+    def _liberar_espacios(self, espacios):
+        """
+        Parte de _retirar que toca los arreglos, para un lote, con NumPy: los
+        huecos que dejan los espacios liberados en _ocupados se llenan con los
+        que siguen ocupados entre los últimos len(espacios) (el mismo borrado
+        por intercambio, de una vez).
+        """
+        cantidad = len(espacios)
+        corte = len(self._ocupados) - cantidad
+        liberados = np.array(espacios, dtype=_ENTERO)
+        _vista(self._placa_en_espacio)[liberados] = -1
+        mapa_ocupados = _vista(self._mapa_ocupados, np.uint8)
+        mapa_ocupados[liberados] = 0
+
+        ocupados = _vista(self._ocupados)
+        posicion = _vista(self._posicion)
+        huecos = posicion[liberados]
+        huecos = np.sort(huecos[huecos < corte])
+        cola = ocupados[corte:]
+        quedan = cola[mapa_ocupados[cola] == 1]
+        ocupados[huecos] = quedan
+        posicion[quedan] = huecos
+        posicion[liberados] = -1
+        del ocupados, posicion, mapa_ocupados, cola  # sueltan los buffers antes de recortar
+        del self._ocupados[corte:]
+        self._pila_libres.extend(espacios)
+
+    def _muestrear_espacios(self, cantidad):
+        """
+        Elige `cantidad` espacios ocupados distintos al azar en O(cantidad):
+        Fisher-Yates parcial sobre el final del arreglo denso (lo reordena,
+        pero las posiciones se mantienen al día).
+        """
+        ocupados = self._ocupados
+        posicion = self._posicion
+        n = len(ocupados)
+        for i in range(n - 1, n - 1 - cantidad, -1):
+            j = random.randint(0, i)
+            if j != i:
+                a, b = ocupados[i], ocupados[j]
+                ocupados[i], ocupados[j] = b, a
+                posicion[b], posicion[a] = i, j
+        return ocupados[n - cantidad:].tolist()
+
+    def _elegir_espacios(self, cantidad):
+        """Como _muestrear_espacios, pero en los lotes grandes elige con NumPy sin reordenar"""
+        if cantidad < LOTE_VECTORIZADO:
+            return self._muestrear_espacios(cantidad)
+        generador = np.random.default_rng(random.getrandbits(64))
+        posiciones = generador.choice(len(self._ocupados), cantidad, replace=False)
+        return _vista(self._ocupados)[posiciones].tolist()
         
     def calcular_porcentaje_ocupacion(self):
         """Calcula el porcentaje de ocupación"""
@@ -40,6 +320,161 @@ class SistemaParqueo:
         """Obtiene la hora actual formateada"""
         return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    def entrada_lote(self, placas, marca=None):
+        """
+        Registra la entrada de un lote de autos sin imprimir nada: valida la
+        capacidad una sola vez, usa una sola marca de tiempo (segundos epoch)
+        para todo el lote y agrega los eventos en bloque. Retorna un
+        ResultadoLote; si no hay espacio lanza ValueError y no registra nada.
+        """
+        placas = list(map(normalizar_placa, placas))
+        return self.entrada_codigos(self.tabla_placas.codificar_lote(placas), marca, placas)
+
+    def entrada_codigos(self, codigos, marca=None, placas=None):
+        """
+        Como entrada_lote, con las placas ya codificadas (tabla_placas o
+        placas.generar_codigos): no arma ni guarda ningún string.
+        """
+        cantidad = len(codigos)
+        if self.espacios_libres < cantidad:
+            raise ValueError(f"No hay suficientes espacios. Solo quedan {self.espacios_libres} espacios libres")
+        if marca is None:
+            marca = time.time()
+
+        # Los espacios salen del tope de la pila de libres en un solo corte
+        pila = self._pila_libres
+        corte = len(pila) - cantidad
+        espacios = pila[corte:]
+        espacios.reverse()  # mismo orden que sucesivos pop()
+        del pila[corte:]
+
+        espacios_por_placa = self._espacios_por_placa
+        if cantidad >= LOTE_VECTORIZADO:
+            asignados = np.array(espacios, dtype=_ENTERO)
+            _vista(self._placa_en_espacio)[asignados] = codigos
+            _vista(self._mapa_ocupados, np.uint8)[asignados] = 1
+            inicio = len(self._ocupados)
+            _vista(self._posicion)[asignados] = np.arange(inicio, inicio + cantidad)
+            # Caso normal: placas nuevas y distintas entre sí, un solo update en C
+            if len(set(codigos)) == cantidad and espacios_por_placa.keys().isdisjoint(codigos):
+                espacios_por_placa.update(zip(codigos, espacios))
+                nuevos = ()
+            else:
+                nuevos = zip(codigos, espacios)
+        else:
+            placa_en_espacio = self._placa_en_espacio
+            mapa_ocupados = self._mapa_ocupados
+            posicion = self._posicion
+            for i, (codigo, espacio) in enumerate(zip(codigos, espacios), len(self._ocupados)):
+                placa_en_espacio[espacio] = codigo
+                mapa_ocupados[espacio] = 1
+                posicion[espacio] = i
+            nuevos = zip(codigos, espacios)
+        for codigo, espacio in nuevos:
+            grupo = espacios_por_placa.get(codigo)
+            if grupo is None:
+                espacios_por_placa[codigo] = espacio
+            elif type(grupo) is int:
+                espacios_por_placa[codigo] = {grupo, espacio}
+            else:
+                grupo.add(espacio)
+        self._ocupados.extend(espacios)
+
+        self.historial_eventos.agregar_codigos(codigos, "ENTRADA", marca)
+        self.espacios_ocupados += cantidad
+        self.espacios_libres -= cantidad
+        self.analitica.registrar_entradas(espacios, marca, self.espacios_ocupados)
+        if self.diario is not None:
+            self.diario.registrar("ENTRADA", codigos, espacios, marca)
+        return ResultadoLote("ENTRADA", codigos, espacios, marca, tabla=self.tabla_placas, placas=placas)
+
+    def salida_lote(self, placas, marca=None, tarifas=None):
+        """
+        Registra la salida de un lote de autos (una placa por auto; puede
+        repetirse) sin imprimir nada. Valida todo el lote antes de modificar
+        el estado. Si no se indican tarifas se simulan como en salida_auto.
+        """
+        placas = list(map(normalizar_placa, placas))
+        codigos = self.tabla_placas.buscar_lote(placas)
+        # Autos pedidos por código: "abc-001" y "ABC-001" son la misma placa
+        pedidas = Counter(codigos)
+        espacios_por_placa = self._espacios_por_placa
+        if len(pedidas) < len(codigos) or None in map(espacios_por_placa.get, codigos):
+            # Hay placas repetidas o ausentes: se revisa cuántos autos tiene cada una
+            for codigo, cantidad in pedidas.items():
+                conteo_placa = self._contar_codigo(codigo)
+                if conteo_placa < cantidad:
+                    placa = placas[codigos.index(codigo)]
+                    if not conteo_placa:
+                        raise ValueError(f"La placa {placa} no se encuentra en el parqueo")
+                    raise ValueError(f"Solo hay {conteo_placa} auto(s) con placa {placa}")
+        return self._salida(codigos, None, marca, tarifas, placas)
+
+    def salida_aleatoria(self, cantidad, marca=None, tarifas=None):
+        """Saca `cantidad` autos elegidos al azar, sin imprimir nada"""
+        if self.espacios_ocupados < cantidad:
+            raise ValueError(f"No hay suficientes autos. Solo hay {self.espacios_ocupados} autos estacionados")
+        espacios = self._elegir_espacios(cantidad)
+        if cantidad >= LOTE_VECTORIZADO:
+            codigos = _vista(self._placa_en_espacio)[np.array(espacios, dtype=_ENTERO)].tolist()
+        else:
+            placa_en_espacio = self._placa_en_espacio
+            codigos = [placa_en_espacio[espacio] for espacio in espacios]
+        return self._salida(codigos, espacios, marca, tarifas)
+
+    def salida_espacios(self, espacios, marca=None, tarifas=None):
+        """Como salida_lote, pero indicando los espacios que se liberan"""
+        espacios = list(espacios)
+        mapa_ocupados = self._mapa_ocupados
+        for espacio in espacios:
+            if not mapa_ocupados[espacio]:
+                raise ValueError(f"El espacio {espacio} no está ocupado")
+        if len(set(espacios)) != len(espacios):
+            raise ValueError("Hay espacios repetidos en el lote")
+        placa_en_espacio = self._placa_en_espacio
+        codigos = [placa_en_espacio[espacio] for espacio in espacios]
+        return self._salida(codigos, espacios, marca, tarifas)
+
+    def calcular_tarifa(self, estadia_segundos):
+        """Tarifa por estadía: TARIFA_POR_HORA por cada hora o fracción"""
+        horas = max(1, math.ceil(estadia_segundos / 3600))
+        return round(horas * self.TARIFA_POR_HORA, 2)
+
+    def _salida(self, codigos, espacios, marca, tarifas, placas=None, quitados=False):
+        """
+        Libera los espacios (o uno cualquiera de cada placa) y registra las
+        salidas. quitados=True: los códigos ya se sacaron de _espacios_por_placa.
+        """
+        if marca is None:
+            marca = time.time()
+        cantidad = len(codigos)
+        if cantidad >= LOTE_VECTORIZADO:
+            if not quitados:
+                espacios = self._quitar_codigos(codigos, espacios)
+            self._liberar_espacios(espacios)
+        elif espacios is None:
+            espacios = [self._retirar(codigo) for codigo in codigos]
+        else:
+            retirar = self._retirar
+            for codigo, espacio in zip(codigos, espacios):
+                retirar(codigo, espacio)
+        if tarifas is None:
+            # Tarifa aleatoria entre $5 y $50 (simulada)
+            if cantidad >= LOTE_VECTORIZADO:
+                generador = np.random.default_rng(random.getrandbits(64))
+                tarifas = generador.uniform(5.0, 50.0, cantidad).round(2).tolist()
+            else:
+                uniforme = random.uniform
+                tarifas = [round(uniforme(5.0, 50.0), 2) for _ in codigos]
+
+        self.historial_eventos.agregar_codigos(codigos, "SALIDA", marca, tarifas)
+        self.espacios_ocupados -= len(codigos)
+        self.espacios_libres += len(codigos)
+        self.analitica.registrar_salidas(espacios, marca, tarifas, self.espacios_ocupados)
+        if self.diario is not None:
+            self.diario.registrar("SALIDA", codigos, espacios, marca, tarifas)
+        return ResultadoLote("SALIDA", codigos, espacios, marca, tarifas, self.tabla_placas, placas)
+
     def entrada_auto(self, placa, cantidad=1):
         """Maneja la entrada de autos al parqueo"""
         try:
@@ -50,28 +485,10 @@ class SistemaParqueo:
             if self.espacios_libres < cantidad:
                 raise ValueError(f"No hay suficientes espacios. Solo quedan {self.espacios_libres} espacios libres")
             
-            for _ in range(cantidad):
-                if placa == "aleatorio":
-                    placa_auto = self.generar_placa_aleatoria()
-                else:
-                    placa_auto = placa.upper()
-                
-                hora_entrada = self.obtener_hora_actual()
-                evento = (placa_auto, "ENTRADA", hora_entrada, 0.00)
-                
-                # Registrar evento
-                self.historial_eventos.append(evento)
-                
-                # Agregar a lista actual
-                self.placas_autos.append(placa_auto)
-                
-                # Agregar al historial del auto
-                if placa_auto not in self.historial_autos:
-                    self.historial_autos[placa_auto] = []
-                self.historial_autos[placa_auto].append(evento)
-            
-            self.espacios_ocupados += cantidad
-            self.espacios_libres -= cantidad
+            if placa == "aleatorio":
+                self.entrada_codigos(self.generar_codigos_aleatorios(cantidad))
+            else:
+                self.entrada_lote([placa] * cantidad)
             
             print(f"✓ Entraron {cantidad} auto(s). Placa(s) registrada(s)")
             
@@ -85,54 +502,41 @@ class SistemaParqueo:
             if cantidad <= 0:
                 raise ValueError("La cantidad debe ser mayor a 0")
             
-            if placa not in self.placas_autos and placa != "aleatorio":
+            if placa != "aleatorio" and not self.esta_estacionado(placa):
                 raise ValueError(f"La placa {placa} no se encuentra en el parqueo")
             
-            autos_a_remover = []
-            
             if placa == "aleatorio":
                 # Sacar autos aleatorios
-                if len(self.placas_autos) < cantidad:
-                    raise ValueError(f"No hay suficientes autos. Solo hay {len(self.placas_autos)} autos estacionados")
-                
-                autos_a_remover = random.sample(self.placas_autos, cantidad)
+                self.salida_aleatoria(cantidad)
             else:
-                # Verificar si hay suficientes autos con esa placa
-                conteo_placa = self.placas_autos.count(placa)
-                if conteo_placa < cantidad:
-                    raise ValueError(f"Solo hay {conteo_placa} auto(s) con placa {placa}")
-                
-                autos_a_remover = [placa] * cantidad
-            
-            for placa_auto in autos_a_remover:
-                # Remover de la lista actual
-                self.placas_autos.remove(placa_auto)
-                
-                # Calcular tarifa (simulada)
-                tarifa = round(random.uniform(5.0, 50.0), 2)  # Tarifa aleatoria entre $5 y $50
-                
-                hora_salida = self.obtener_hora_actual()
-                evento = (placa_auto, "SALIDA", hora_salida, tarifa)
-                
-                # Registrar evento
-                self.historial_eventos.append(evento)
-                
-                # Agregar al historial del auto
-                self.historial_autos[placa_auto].append(evento)
-            
-            self.espacios_ocupados -= cantidad
-            self.espacios_libres += cantidad
+                self.salida_lote([placa] * cantidad)
             
             print(f"✓ Salieron {cantidad} auto(s). Tarifa(s) calculada(s)")
             
         except ValueError as e:
             print(f"❌ Error: {e}")
     
-    def generar_placa_aleatoria(self):
-        """Genera una placa de auto aleatoria"""
-        letras = ''.join(random.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))
-        numeros = ''.join(random.choices('0123456789', k=3))
+    def eventos_entre(self, desde, hasta, tipo=None):
+        """
+        Eventos con desde <= hora < hasta (datetime o segundos epoch), por
+        ejemplo las entradas entre las 14:00 y las 15:00. Búsqueda binaria
+        sobre la columna de horas, que está ordenada.
+        """
+        return self.historial_eventos.entre(desde, hasta, tipo)
+
+    def generar_placa_aleatoria(self, generador=random):
+        """Genera una placa de auto aleatoria (generador: módulo random o random.Random)"""
+        letras = ''.join(generador.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=3))
+        numeros = ''.join(generador.choices('0123456789', k=3))
         return f"{letras}-{numeros}"
+
+    def generar_codigos_aleatorios(self, cantidad, generador=random):
+        """
+        Códigos de `cantidad` placas aleatorias de una sola vez (NumPy), para
+        entrada_codigos. La semilla sale de `generador`, así que random.seed
+        también fija estas placas.
+        """
+        return generar_codigos(cantidad, generador.getrandbits(64)).tolist()
     
     def mostrar_estado_actual(self):
         """Muestra el estado actual del parqueo"""
@@ -148,8 +552,8 @@ class SistemaParqueo:
     
     def mostrar_autos_estacionados(self):
         """Muestra todos los autos actualmente estacionados"""
-        print(f"\nAutos estacionados ({len(self.placas_autos)}):")
-        if not self.placas_autos:
+        print(f"\nAutos estacionados ({self.espacios_ocupados}):")
+        if not self.espacios_ocupados:
             print("No hay autos estacionados")
         else:
             for i, placa in enumerate(sorted(self.placas_autos), 1):
@@ -157,10 +561,11 @@ class SistemaParqueo:
     
     def mostrar_historial_auto(self, placa):
         """Muestra el historial de eventos de un auto específico"""
-        placa = placa.upper()
-        if placa in self.historial_autos:
+        placa = normalizar_placa(placa)
+        eventos = self.historial_eventos.de_placa(placa)
+        if eventos:
             print(f"\nHistorial del auto {placa}:")
-            for evento in self.historial_autos[placa]:
+            for evento in eventos:
                 print(f"  {evento[1]} - {evento[2]} - ${evento[3]:.2f}")
         else:
             print(f"No se encontró historial para la placa {placa}")
@@ -168,7 +573,7 @@ class SistemaParqueo:
     def mostrar_ultimos_eventos(self, cantidad=10):
         """Muestra los últimos eventos del parqueo"""
         print(f"\nÚltimos {cantidad} eventos:")
-        eventos_recientes = self.historial_eventos[-cantidad:] if self.historial_eventos else []
+        eventos_recientes = self.historial_eventos.ultimos(cantidad)
         
         if not eventos_recientes:
             print("No hay eventos registrados")
@@ -176,8 +581,16 @@ class SistemaParqueo:
             for evento in eventos_recientes:
                 print(f"  {evento[0]} - {evento[1]} - {evento[2]} - ${evento[3]:.2f}")
 
+# Estado persistente del menú (diario + instantáneas), junto a este archivo
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos_parqueo")
+
+
 def main():
-    sistema = SistemaParqueo()
+    # diario_parqueo importa este módulo: se importa aquí para evitar el ciclo
+    from diario_parqueo import abrir_parqueo
+
+    # Recupera los autos y el historial de la ejecución anterior
+    sistema = abrir_parqueo(DIRECTORIO_DATOS)
     
     print("🚗 SISTEMA DE PARQUEO INTELIGENTE 🚗")
     print("Simulación de estacionamiento de centro comercial")
@@ -224,21 +637,23 @@ def main():
                 sistema.mostrar_ultimos_eventos(int(cantidad))
                 
             elif opcion == "7":
-                # Simulación automática
+                # Simulación automática con reloj simulado (sin esperas reales)
+                horas = input("Horas a simular (Enter para 8): ").strip() or "8"
+                tasa = input("Autos por hora (Enter para 20): ").strip() or "20"
                 print("\n🔧 Iniciando simulación automática...")
-                for _ in range(5):
-                    # Entradas aleatorias
-                    entradas = random.randint(1, 5)
-                    sistema.entrada_auto("aleatorio", entradas)
-                    time.sleep(1)
-                    
-                    # Salidas aleatorias
-                    if sistema.espacios_ocupados > 0:
-                        salidas = random.randint(1, min(3, sistema.espacios_ocupados))
-                        sistema.salida_auto("aleatorio", salidas)
-                        time.sleep(1)
+                # En un parqueo aparte, vacío y con la misma capacidad y tarifa: las horas
+                # simuladas no se mezclan con el historial guardado y los autos que
+                # siguen adentro al terminar no quedan estacionados en el parqueo real
+                simulado = SistemaParqueo(sistema.CAPACIDAD_MAXIMA)
+                simulado.TARIFA_POR_HORA = sistema.TARIFA_POR_HORA
+                simulacion = SimulacionParqueo(simulado, float(tasa))
+                resumen = simulacion.ejecutar(horas=float(horas))
+                print(f"✓ {resumen['horas_simuladas']:.1f} h simuladas: "
+                      f"{resumen['llegadas']} llegadas, {resumen['rechazados']} rechazadas, "
+                      f"{resumen['salidas']} salidas, ingresos ${resumen['ingresos']:.2f}, "
+                      f"ocupación promedio {resumen['ocupacion_promedio']:.1f}%")
                 
-                sistema.mostrar_estado_actual()
+                simulado.mostrar_estado_actual()
                 
             elif opcion == "8":
                 print("¡Gracias por usar el sistema de parqueo inteligente!")
@@ -253,5 +668,9 @@ def main():
         except Exception as e:
             print(f"❌ Error inesperado: {e}")
 
+    # Al salir queda una instantánea al día y el diario sincronizado
+    sistema.diario.instantanea()
+    sistema.diario.cerrar()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
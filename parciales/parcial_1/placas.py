@@ -0,0 +1,182 @@
+'''
+Codificación compacta de placas.
+
+Una placa con formato LLL-NNN (3 letras, guion, 3 dígitos) cabe en un entero:
+((l1 * 26 + l2) * 26 + l3) * 1000 + NNN, menor que 26³·10³ = 17 576 000 < 2³¹.
+Las placas con otro formato reciben códigos a partir de ese valor en orden de
+aparición (tabla de internado). Así las estructuras internas del parqueo
+guardan enteros en lugar de una copia del string por cada evento o espacio.
+
+Las placas se normalizan a mayúsculas (normalizar_placa) al codificarlas y
+al buscarlas: "abc-123" y "ABC-123" son la misma placa en todo el parqueo.
+'''
+
+import numpy as np
+
+LETRAS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CODIGOS_FORMATO = 26 ** 3 * 1000  # primer código de placas libres
+_VALOR_LETRA = {letra: i for i, letra in enumerate(LETRAS)}
+# A partir de este tamaño codificar_lote/decodificar_lote usan NumPy
+LOTE_VECTORIZADO = 256
+
+
+def normalizar_placa(placa):
+    """Forma con que se guardan las placas ("abc-123" -> "ABC-123", "mi placa" -> "MI PLACA")"""
+    return placa.upper()
+
+
+def codificar_formato(placa):
+    """Código de una placa LLL-NNN, o None si no tiene ese formato"""
+    if len(placa) != 7 or placa[3] != "-":
+        return None
+    numero = placa[4:]
+    if not numero.isdigit() or not numero.isascii():
+        return None
+    try:
+        letras = (_VALOR_LETRA[placa[0]] * 26 + _VALOR_LETRA[placa[1]]) * 26 + _VALOR_LETRA[placa[2]]
+    except KeyError:
+        return None
+    return letras * 1000 + int(numero)
+
+
+def decodificar_formato(codigo):
+    letras, numero = divmod(codigo, 1000)
+    resto, l3 = divmod(letras, 26)
+    l1, l2 = divmod(resto, 26)
+    return f"{LETRAS[l1]}{LETRAS[l2]}{LETRAS[l3]}-{numero:03d}"
+
+
+class TablaPlacas:
+    """
+    Placa <-> código entero. Las placas LLL-NNN se codifican aritméticamente
+    (no ocupan memoria en la tabla); las demás se internan una sola vez y
+    reciben el siguiente código libre.
+    """
+
+    def __init__(self):
+        self._codigo_libre = {}  # placa con formato libre -> código
+        self._libres = []  # código - CODIGOS_FORMATO -> placa con formato libre
+
+    def __len__(self):
+        """Cantidad de placas de formato libre internadas"""
+        return len(self._libres)
+
+    def codificar(self, placa):
+        """Código de una placa (si es de formato libre y nueva, la interna)"""
+        placa = normalizar_placa(placa)
+        codigo = codificar_formato(placa)
+        if codigo is None:
+            codigo = self._codigo_libre.get(placa)
+            if codigo is None:
+                codigo = self._codigo_libre[placa] = CODIGOS_FORMATO + len(self._libres)
+                self._libres.append(placa)
+        return codigo
+
+    def codificar_lote(self, placas):
+        """
+        Lista de códigos de una lista de placas. Los lotes grandes se
+        codifican con NumPy y solo las que no son LLL-NNN (formato libre o en
+        minúsculas) pasan por codificar.
+        """
+        if len(placas) < LOTE_VECTORIZADO:
+            codificar = self.codificar
+            return [codificar(placa) for placa in placas]
+        codigos, validas = codificar_vector(placas)
+        codigos = codigos.tolist()
+        if not validas.all():
+            codificar = self.codificar
+            for i in np.flatnonzero(~validas).tolist():
+                codigos[i] = codificar(placas[i])
+        return codigos
+
+    def buscar(self, placa):
+        """Código de una placa sin internarla (None si es de formato libre y nunca se vio)"""
+        placa = normalizar_placa(placa)
+        codigo = codificar_formato(placa)
+        if codigo is None:
+            codigo = self._codigo_libre.get(placa)
+        return codigo
+
+    def buscar_lote(self, placas):
+        """Como buscar, para una lista de placas (con NumPy en los lotes grandes)"""
+        if len(placas) < LOTE_VECTORIZADO:
+            buscar = self.buscar
+            return [buscar(placa) for placa in placas]
+        codigos, validas = codificar_vector(placas)
+        codigos = codigos.tolist()
+        if not validas.all():
+            buscar = self.buscar
+            for i in np.flatnonzero(~validas).tolist():
+                codigos[i] = buscar(placas[i])
+        return codigos
+
+    def decodificar(self, codigo):
+        if codigo >= CODIGOS_FORMATO:
+            return self._libres[codigo - CODIGOS_FORMATO]
+        return decodificar_formato(codigo)
+
+    def decodificar_lote(self, codigos):
+        if len(codigos) < LOTE_VECTORIZADO or not self._libres:
+            if len(codigos) >= LOTE_VECTORIZADO:
+                return texto_placas(codigos)
+            decodificar = self.decodificar
+            return [decodificar(codigo) for codigo in codigos]
+        codigos = np.asarray(codigos, dtype=np.int64)
+        libres = codigos >= CODIGOS_FORMATO
+        placas = texto_placas(np.where(libres, 0, codigos))
+        for i in np.flatnonzero(libres).tolist():
+            placas[i] = self._libres[codigos[i] - CODIGOS_FORMATO]
+        return placas
+
+
+def generar_codigos(cantidad, generador=None):
+    """
+    Códigos de `cantidad` placas LLL-NNN aleatorias en una sola operación
+    vectorizada (array int32 de NumPy). generador: np.random.Generator o semilla.
+    """
+    generador = np.random.default_rng(generador)
+    return generador.integers(0, CODIGOS_FORMATO, size=cantidad, dtype=np.int32)
+
+
+def generar_placas(cantidad, generador=None):
+    """`cantidad` placas LLL-NNN aleatorias como strings"""
+    return texto_placas(generar_codigos(cantidad, generador))
+
+
+def codificar_vector(placas):
+    """
+    Códigos de una lista de placas con NumPy: retorna (códigos int64, válidas),
+    donde válidas marca las que tienen formato LLL-NNN (el código de las demás
+    no tiene sentido).
+    """
+    # U8 para que una placa de 8 caracteres o más no se confunda con una de 7
+    puntos = np.array(placas, dtype="U8").view(np.uint32).reshape(len(placas), 8)
+    letras = puntos[:, :3].astype(np.int64) - ord("A")
+    digitos = puntos[:, 4:7].astype(np.int64) - ord("0")
+    validas = ((letras >= 0) & (letras < 26)).all(axis=1) \
+        & ((digitos >= 0) & (digitos < 10)).all(axis=1) \
+        & (puntos[:, 3] == ord("-")) & (puntos[:, 7] == 0)
+    codigos = ((letras[:, 0] * 26 + letras[:, 1]) * 26 + letras[:, 2]) * 1000 \
+        + digitos[:, 0] * 100 + digitos[:, 1] * 10 + digitos[:, 2]
+    return codigos, validas
+
+
+def texto_placas(codigos):
+    """
+    Placas LLL-NNN de una secuencia de códigos (todos < CODIGOS_FORMATO). Los
+    caracteres se arman en un bloque de bytes con NumPy y se cortan de a 7.
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    cantidad = len(codigos)
+    letras, numeros = np.divmod(codigos, 1000)
+    texto = np.empty((cantidad, 7), dtype=np.uint8)
+    abecedario = np.frombuffer(LETRAS.encode(), dtype=np.uint8)
+    texto[:, 0] = abecedario[letras // 676]
+    texto[:, 1] = abecedario[letras // 26 % 26]
+    texto[:, 2] = abecedario[letras % 26]
+    texto[:, 3] = ord("-")
+    texto[:, 4] = ord("0") + numeros // 100
+    texto[:, 5] = ord("0") + numeros // 10 % 10
+    texto[:, 6] = ord("0") + numeros % 10
+    bloque = texto.tobytes().decode("ascii")
+    return [bloque[i:i + 7] for i in range(0, 7 * cantidad, 7)]
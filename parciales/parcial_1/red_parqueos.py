@@ -0,0 +1,186 @@
+'''
+Red de parqueos: varios SistemaParqueo (uno por edificio/nivel) coordinados.
+
+- Las placas se reparten entre los parqueos con un hash estable de la placa;
+  si el parqueo que le toca está lleno se prueba el siguiente.
+- Los totales (espacios libres/ocupados) y "¿dónde está la placa X?" se
+  responden con agregados que se actualizan en cada entrada/salida de la red,
+  sin consultar cada parqueo. Por eso los parqueos deben operarse a través de
+  la red y no directamente.
+- simular() ejecuta simulaciones independientes de cada parqueo en un
+  ProcessPoolExecutor y eventos() combina sus historiales en un orden
+  determinista (hora, parqueo, orden dentro del parqueo).
+'''
+
+import heapq
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from eventos import TIPOS_EVENTO, formatear_hora
+from parcial_1 import SistemaParqueo
+from placas import normalizar_placa
+from simulacion import SimulacionParqueo
+
+
+def _simular_parqueo(nombre, capacidad, tasa_llegadas, horas, inicio, semilla):
+    """Trabajo de un proceso: simula un parqueo nuevo y lo devuelve completo"""
+    sistema = SistemaParqueo(capacidad)
+    # Semilla propia por parqueo: el resultado no depende del reparto entre procesos
+    simulacion = SimulacionParqueo(sistema, tasa_llegadas, inicio=inicio,
+                                   semilla=f"{semilla}-{nombre}")
+    return sistema, simulacion.ejecutar(horas=horas)
+
+
+class RedParqueos:
+
+    def __init__(self, capacidades):
+        """capacidades: dict nombre -> capacidad (el orden define el orden de la red)"""
+        if not capacidades:
+            raise ValueError("La red necesita al menos un parqueo")
+        self.nombres = list(capacidades)
+        self.parqueos = {nombre: SistemaParqueo(capacidad) for nombre, capacidad in capacidades.items()}
+        self._reconstruir_agregados()
+
+    def _reconstruir_agregados(self):
+        self.capacidad = sum(p.CAPACIDAD_MAXIMA for p in self.parqueos.values())
+        self.espacios_ocupados = sum(p.espacios_ocupados for p in self.parqueos.values())
+        self.espacios_libres = self.capacidad - self.espacios_ocupados
+        self._libres = {nombre: p.espacios_libres for nombre, p in self.parqueos.items()}
+        self._ubicacion = {}  # placa -> {parqueo: cantidad de autos}
+        for nombre, parqueo in self.parqueos.items():
+            for placa in parqueo.placas_autos:
+                lugares = self._ubicacion.setdefault(placa, {})
+                lugares[nombre] = lugares.get(nombre, 0) + 1
+
+    def _parqueo_preferido(self, placa):
+        # crc32 y no hash(): debe dar lo mismo en cada ejecución y en cada proceso
+        return zlib.crc32(placa.encode()) % len(self.nombres)
+
+    # ---------- Operaciones ----------
+    def entrada(self, placas, marca=None):
+        """
+        Reparte un lote de autos entre los parqueos y los registra. Retorna
+        dict parqueo -> ResultadoLote. Si la red no tiene espacio para todo
+        el lote lanza ValueError sin registrar nada.
+        """
+        placas = list(map(normalizar_placa, placas))
+        if len(placas) > self.espacios_libres:
+            raise ValueError(f"No hay suficientes espacios. Solo quedan {self.espacios_libres} en la red")
+        if marca is None:
+            marca = time.time()
+
+        libres = dict(self._libres)
+        grupos = {}
+        cantidad_parqueos = len(self.nombres)
+        for placa in placas:
+            indice = self._parqueo_preferido(placa)
+            nombre = self.nombres[indice]
+            while not libres[nombre]:
+                indice = (indice + 1) % cantidad_parqueos
+                nombre = self.nombres[indice]
+            libres[nombre] -= 1
+            grupos.setdefault(nombre, []).append(placa)
+
+        resultados = {}
+        for nombre, grupo in grupos.items():
+            resultados[nombre] = self.parqueos[nombre].entrada_lote(grupo, marca)
+            self._libres[nombre] -= len(grupo)
+            for placa in grupo:
+                lugares = self._ubicacion.setdefault(placa, {})
+                lugares[nombre] = lugares.get(nombre, 0) + 1
+        self.espacios_ocupados += len(placas)
+        self.espacios_libres -= len(placas)
+        return resultados
+
+    def salida(self, placas, marca=None):
+        """Registra la salida de un lote de autos, estén en el parqueo que estén"""
+        placas = list(map(normalizar_placa, placas))
+        pendientes = {}
+        grupos = {}
+        for placa in placas:
+            lugares = pendientes.get(placa)
+            if lugares is None:
+                lugares = pendientes[placa] = dict(self._ubicacion.get(placa, {}))
+            nombre = next((n for n, cantidad in lugares.items() if cantidad), None)
+            if nombre is None:
+                raise ValueError(f"La placa {placa} no se encuentra en la red (o no hay tantos autos)")
+            lugares[nombre] -= 1
+            grupos.setdefault(nombre, []).append(placa)
+
+        if marca is None:
+            marca = time.time()
+        resultados = {}
+        for nombre, grupo in grupos.items():
+            resultados[nombre] = self.parqueos[nombre].salida_lote(grupo, marca)
+            self._libres[nombre] += len(grupo)
+        for placa, lugares in pendientes.items():
+            lugares = {n: c for n, c in lugares.items() if c}
+            if lugares:
+                self._ubicacion[placa] = lugares
+            else:
+                del self._ubicacion[placa]
+        self.espacios_ocupados -= len(placas)
+        self.espacios_libres += len(placas)
+        return resultados
+
+    # ---------- Consultas ----------
+    def ubicar(self, placa):
+        """Parqueos donde está la placa: dict parqueo -> cantidad (O(1))"""
+        return dict(self._ubicacion.get(normalizar_placa(placa), {}))
+
+    def calcular_porcentaje_ocupacion(self):
+        return (self.espacios_ocupados / self.capacidad) * 100
+
+    def estado_por_parqueo(self):
+        return [
+            (nombre, self.parqueos[nombre].CAPACIDAD_MAXIMA - self._libres[nombre], self._libres[nombre])
+            for nombre in self.nombres
+        ]
+
+    # ---------- Simulación en paralelo ----------
+    def simular(self, horas, tasa_llegadas=20.0, inicio=None, semilla=0, max_workers=None):
+        """
+        Simula `horas` de tráfico en cada parqueo, uno por proceso, partiendo
+        de parqueos vacíos. tasa_llegadas puede ser un número o un dict
+        parqueo -> autos por hora. Todos los parqueos arrancan en la misma
+        hora simulada `inicio` (por defecto, ahora). Reemplaza los parqueos de
+        la red por los simulados y retorna dict parqueo -> resumen.
+        """
+        if inicio is None:
+            inicio = time.time()
+        tasas = tasa_llegadas if isinstance(tasa_llegadas, dict) else \
+            dict.fromkeys(self.nombres, tasa_llegadas)
+        trabajadores = min(len(self.nombres), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(trabajadores) as pool:
+            futuros = [
+                pool.submit(_simular_parqueo, nombre, self.parqueos[nombre].CAPACIDAD_MAXIMA,
+                            tasas[nombre], horas, inicio, semilla)
+                for nombre in self.nombres
+            ]
+            # Se recogen en el orden de la red, no en el de terminación
+            resultados = [futuro.result() for futuro in futuros]
+
+        resumenes = {}
+        for nombre, (sistema, resumen) in zip(self.nombres, resultados):
+            self.parqueos[nombre] = sistema
+            resumenes[nombre] = resumen
+        self._reconstruir_agregados()
+        return resumenes
+
+    def eventos(self):
+        """
+        Historiales de todos los parqueos combinados en orden de hora; los
+        empates se resuelven por el orden de la red y luego por el orden
+        dentro de cada parqueo. Genera (parqueo, placa, tipo, hora, tarifa).
+        """
+        def flujo(posicion, nombre):
+            registro = self.parqueos[nombre].historial_eventos
+            for i, (codigo, tipo, marca, tarifa) in enumerate(
+                    zip(registro.codigos, registro.tipos, registro.marcas, registro.tarifas)):
+                yield marca, posicion, i, nombre, registro.placa(codigo), tipo, tarifa
+
+        combinados = heapq.merge(*(flujo(posicion, nombre) for posicion, nombre in enumerate(self.nombres)))
+        for marca, _, _, nombre, placa, tipo, tarifa in combinados:
+            yield nombre, placa, TIPOS_EVENTO[tipo], formatear_hora(marca), tarifa
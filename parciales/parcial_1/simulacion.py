@@ -0,0 +1,210 @@
+'''
+Simulación de eventos discretos del parqueo con reloj simulado.
+
+En lugar de esperar con time.sleep(), los eventos se procesan en orden de
+hora simulada, adelantando el reloj directamente al siguiente evento. Un día
+de tráfico se simula en milisegundos.
+
+- Llegadas: proceso de Poisson (tiempos entre llegadas exponenciales). Las
+  horas de llegada, las placas (placas.generar_codigos) y las estadías se
+  generan por bloques con NumPy; solo las salidas pendientes van en el
+  calendario (heapq).
+- Los eventos con la misma hora se aplican como un solo lote (entrada_codigos
+  / salida_espacios). Con `resolucion` las horas se redondean hacia arriba a
+  ese múltiplo de segundos, así que más eventos comparten hora y los lotes
+  son más grandes.
+- Estadías: distribución configurable (funciones estadia_* de este módulo).
+- Tarifas: calculadas con la estadía simulada (SistemaParqueo.calcular_tarifa).
+'''
+
+import heapq
+import math
+import random
+import time
+
+import numpy as np
+
+from placas import generar_codigos
+
+# Llegadas que se generan de una vez (horas, placas y estadías)
+LLEGADAS_POR_BLOQUE = 4096
+
+
+# ---------- Distribuciones de estadía (retornan segundos) ----------
+# Cada una retorna una función generador -> segundos; su atributo `lote`
+# (np.random.Generator, cantidad) -> array genera muchas estadías de una vez.
+def estadia_exponencial(media_horas=2.0):
+    escala = media_horas * 3600
+    estadia = lambda generador: generador.expovariate(1 / escala)
+    estadia.lote = lambda generador, cantidad: generador.exponential(escala, cantidad)
+    return estadia
+
+
+def estadia_lognormal(media_horas=2.0, sigma=0.75):
+    """Estadías sesgadas a la derecha: muchas cortas y pocas muy largas"""
+    # mu tal que la media de la lognormal sea media_horas
+    mu = math.log(media_horas * 3600) - sigma ** 2 / 2
+    estadia = lambda generador: generador.lognormvariate(mu, sigma)
+    estadia.lote = lambda generador, cantidad: generador.lognormal(mu, sigma, cantidad)
+    return estadia
+
+
+def estadia_uniforme(minimo_horas=0.5, maximo_horas=4.0):
+    estadia = lambda generador: generador.uniform(minimo_horas * 3600, maximo_horas * 3600)
+    estadia.lote = lambda generador, cantidad: generador.uniform(minimo_horas * 3600, maximo_horas * 3600,
+                                                                 cantidad)
+    return estadia
+
+
+class SimulacionParqueo:
+    """
+    Motor de eventos discretos sobre un SistemaParqueo.
+
+    tasa_llegadas: autos por hora (media del proceso de Poisson)
+    estadia: función generador -> segundos de estadía (con atributo `lote`
+        opcional, como las estadia_* de este módulo)
+    inicio: hora simulada inicial (segundos epoch; por defecto, ahora)
+    semilla: semilla del generador propio de la simulación (reproducible)
+    resolucion: segundos; si se indica, las horas de los eventos se redondean
+        hacia arriba a ese múltiplo y los eventos de un mismo instante se
+        procesan como un lote
+    """
+
+    def __init__(self, sistema, tasa_llegadas=20.0, estadia=None, inicio=None, semilla=None,
+                 resolucion=None):
+        if tasa_llegadas <= 0:
+            raise ValueError("La tasa de llegadas debe ser mayor a 0")
+        if resolucion is not None and resolucion <= 0:
+            raise ValueError("La resolución debe ser mayor a 0")
+        self.sistema = sistema
+        self.tasa_llegadas = tasa_llegadas
+        self.estadia = estadia or estadia_lognormal()
+        self.resolucion = resolucion
+        self.generador = random.Random(semilla)
+        # Generador de NumPy para los bloques, derivado del anterior (la semilla puede ser un str)
+        self._generador_lote = np.random.default_rng(self.generador.getrandbits(64))
+        self.reloj = time.time() if inicio is None else float(inicio)
+        self.inicio = self.reloj
+
+        # Salidas pendientes: (hora, espacio, tarifa). El espacio no se repite
+        # entre autos estacionados, así que también desempata
+        self._calendario = []
+
+        # Bloque actual de llegadas (listas paralelas) y la siguiente por procesar
+        self._ultima_llegada = self.reloj  # hora sin redondear de la última llegada generada
+        self._horas_llegada = []
+        self._codigos = []
+        self._estadias = []
+        self._siguiente = 0
+
+        # Contadores
+        self.llegadas = 0
+        self.rechazados = 0
+        self.salidas = 0
+        self.ingresos = 0.0
+        self._area_ocupacion = 0.0  # integral de espacios_ocupados en el tiempo
+
+        self._generar_llegadas()
+
+    def _generar_llegadas(self):
+        """Genera el próximo bloque de llegadas: horas, códigos de placa y estadías"""
+        generador = self._generador_lote
+        cantidad = LLEGADAS_POR_BLOQUE
+        horas = self._ultima_llegada + np.cumsum(generador.exponential(3600 / self.tasa_llegadas, cantidad))
+        self._ultima_llegada = float(horas[-1])
+        if self.resolucion is not None:
+            horas = np.ceil(horas / self.resolucion) * self.resolucion
+        self._horas_llegada = horas.tolist()
+        self._codigos = generar_codigos(cantidad, generador).tolist()
+        lote = getattr(self.estadia, "lote", None)
+        if lote is not None:
+            self._estadias = lote(generador, cantidad).tolist()
+        else:
+            self._estadias = [self.estadia(self.generador) for _ in range(cantidad)]
+        self._siguiente = 0
+
+    def _avanzar(self, hora):
+        self._area_ocupacion += self.sistema.espacios_ocupados * (hora - self.reloj)
+        self.reloj = hora
+
+    def _llegadas(self, hora):
+        """Procesa las llegadas del bloque actual con esa hora como un lote"""
+        horas, codigos, estadias = self._horas_llegada, self._codigos, self._estadias
+        inicio = self._siguiente
+        fin = inicio + 1
+        while fin < len(horas) and horas[fin] == hora:
+            fin += 1
+        self._siguiente = fin
+        if fin == len(horas):
+            self._generar_llegadas()
+
+        sistema = self.sistema
+        self.llegadas += fin - inicio
+        admitidos = min(fin - inicio, sistema.espacios_libres)
+        self.rechazados += fin - inicio - admitidos
+        if not admitidos:
+            return
+        resultado = sistema.entrada_codigos(codigos[inicio:inicio + admitidos], marca=hora)
+        calcular_tarifa = sistema.calcular_tarifa
+        resolucion = self.resolucion
+        calendario = self._calendario
+        for espacio, estadia in zip(resultado.espacios, estadias[inicio:inicio + admitidos]):
+            salida = hora + estadia
+            if resolucion is not None:
+                salida = math.ceil(salida / resolucion) * resolucion
+            heapq.heappush(calendario, (salida, espacio, calcular_tarifa(estadia)))
+
+    def _salidas(self, hora):
+        """Procesa como un lote todas las salidas pendientes con esa hora"""
+        calendario = self._calendario
+        espacios = []
+        tarifas = []
+        while calendario and calendario[0][0] == hora:
+            _, espacio, tarifa = heapq.heappop(calendario)
+            espacios.append(espacio)
+            tarifas.append(tarifa)
+        self.sistema.salida_espacios(espacios, marca=hora, tarifas=tarifas)
+        self.salidas += len(espacios)
+        self.ingresos += sum(tarifas)
+
+    def ejecutar(self, horas=None, hasta=None):
+        """
+        Procesa eventos hasta `hasta` (segundos epoch) o durante `horas`
+        simuladas desde el reloj actual. Los autos que siguen dentro quedan
+        estacionados y sus salidas pendientes en el calendario, así que se
+        puede seguir llamando a ejecutar(). Retorna resumen().
+        """
+        if hasta is None:
+            if horas is None:
+                raise ValueError("Indique horas o hasta")
+            hasta = self.reloj + horas * 3600
+
+        calendario = self._calendario
+        while True:
+            llegada = self._horas_llegada[self._siguiente]
+            hora = min(llegada, calendario[0][0]) if calendario else llegada
+            if hora > hasta:
+                break
+            self._avanzar(hora)
+            # En un mismo instante salen primero los autos y después entran los nuevos
+            if calendario and calendario[0][0] == hora:
+                self._salidas(hora)
+            if llegada == hora:
+                self._llegadas(hora)
+        self._avanzar(hasta)
+        return self.resumen()
+
+    def resumen(self):
+        transcurrido = self.reloj - self.inicio
+        return {
+            "horas_simuladas": transcurrido / 3600,
+            "llegadas": self.llegadas,
+            "rechazados": self.rechazados,
+            "salidas": self.salidas,
+            "estacionados": self.sistema.espacios_ocupados,
+            "ingresos": round(self.ingresos, 2),
+            "ocupacion_promedio": (
+                self._area_ocupacion / transcurrido / self.sistema.CAPACIDAD_MAXIMA * 100
+                if transcurrido else 0.0
+            ),
+        }
@@ -0,0 +1,55 @@
+import random
+
+from analitica import AnaliticaParqueo, SerieOcupacion
+
+INICIO = 1_700_000_040.0
+
+
+def _cambios(cantidad, semilla):
+    """(marca, ocupación) crecientes en marca, con saltos largos de vez en cuando"""
+    generador = random.Random(semilla)
+    marca = INICIO
+    ocupacion = 0
+    for _ in range(cantidad):
+        marca += generador.choice((5, 30, 90, 600, 4000))
+        ocupacion = max(0, ocupacion + generador.randint(-3, 3))
+        yield marca, ocupacion
+
+
+def test_ventana_igual_a_la_serie_completa_en_sus_intervalos():
+    completa = SerieOcupacion(60)
+    ventana = SerieOcupacion(60, max_intervalos=30)
+    for marca, ocupacion in _cambios(3000, semilla=1):
+        completa.cambiar(marca, ocupacion, entradas=1)
+        ventana.cambiar(marca, ocupacion, entradas=1)
+
+        filas = ventana.intervalos()
+        assert len(filas) <= 30
+        assert filas == completa.intervalos(desde=filas[0][0])
+        assert len(ventana) <= 2 * 30 + 1
+
+
+def test_recortar_no_cambia_las_consultas():
+    serie = SerieOcupacion(60, max_intervalos=10)
+    for marca, ocupacion in _cambios(500, semilla=2):
+        serie.cambiar(marca, ocupacion)
+    antes = serie.intervalos()
+    serie.recortar()
+
+    assert serie.intervalos() == antes
+    assert len(serie) <= 11
+
+
+def test_minutos_acotados_y_horas_completas():
+    analitica = AnaliticaParqueo(10)
+    marca = INICIO
+    for dia in range(5):
+        for hora in range(24):
+            marca = INICIO + (dia * 24 + hora) * 3600
+            analitica.registrar_entradas([hora % 10], marca, 1)
+            analitica.registrar_salidas([hora % 10], marca + 1800, [5.0], 0)
+
+    assert len(analitica.ocupacion_por_minuto()) <= 24 * 60
+    assert len(analitica.ocupacion_por_hora()) == 5 * 24
+    assert analitica.resumen()["entradas"] == 5 * 24
+    assert analitica.resumen()["ingresos"] == 5 * 24 * 5.0
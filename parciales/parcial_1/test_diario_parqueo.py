@@ -0,0 +1,106 @@
+import os
+import pickle
+import random
+
+import pytest
+
+from analitica import MINUTOS_RETENIDOS
+from diario_parqueo import ARCHIVO_DIARIO, REGISTRO, abrir_parqueo
+
+
+def _operar(sistema, pasos, semilla):
+    """Entradas y salidas al azar (placas LLL-NNN y de formato libre)"""
+    generador = random.Random(semilla)
+    marca = 1_700_000_000.0
+    for _ in range(pasos):
+        marca += generador.random() * 60
+        r = generador.random()
+        if r < 0.5 and sistema.espacios_libres:
+            cantidad = generador.randint(1, min(sistema.espacios_libres, 40))
+            placas = [sistema.generar_placa_aleatoria() if generador.random() < 0.8
+                      else f"libre{generador.randint(0, 50)}" for _ in range(cantidad)]
+            sistema.entrada_lote(placas, marca)
+        elif r < 0.9 and sistema.espacios_ocupados:
+            sistema.salida_aleatoria(generador.randint(1, sistema.espacios_ocupados), marca)
+        elif sistema.espacios_ocupados:
+            sistema.salida_lote([sistema.placas_autos[0]], marca)
+
+
+def _assert_mismo_estado(original, recuperado):
+    assert list(recuperado.historial_eventos) == list(original.historial_eventos)
+    assert sorted(recuperado.placas_autos) == sorted(original.placas_autos)
+    assert sorted(recuperado._ocupados) == sorted(original._ocupados)
+    assert recuperado._pila_libres == original._pila_libres
+    assert recuperado._placa_en_espacio == original._placa_en_espacio
+    assert recuperado.analitica.resumen() == original.analitica.resumen()
+    assert recuperado.analitica.histograma == original.analitica.histograma
+
+
+@pytest.fixture
+def directorio(tmp_path):
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("instantanea_cada", [10**9, 300])
+def test_recuperar_sin_cerrar_reproduce_el_estado(directorio, instantanea_cada):
+    # Sin cerrar el diario, como si el proceso se cortara después de sincronizar
+    sistema = abrir_parqueo(directorio, 120, registros_por_grupo=50, instantanea_cada=instantanea_cada)
+    _operar(sistema, 600, semilla=3)
+    sistema.diario.sincronizar()
+
+    recuperado = abrir_parqueo(directorio, 120)
+    try:
+        _assert_mismo_estado(sistema, recuperado)
+        placa = sistema.historial_eventos[0][0]
+        assert recuperado.historial_eventos.de_placa(placa) == sistema.historial_eventos.de_placa(placa)
+    finally:
+        sistema.diario.cerrar()
+        recuperado.diario.cerrar()
+
+
+def test_registro_a_medias_se_descarta(directorio):
+    sistema = abrir_parqueo(directorio, 60, registros_por_grupo=16)
+    _operar(sistema, 200, semilla=7)
+    sistema.diario.cerrar()
+    # Un corte a mitad de escritura deja parte de un registro al final
+    with open(os.path.join(directorio, ARCHIVO_DIARIO), "ab") as archivo:
+        archivo.write(b"\x00" * (REGISTRO.size // 2))
+
+    recuperado = abrir_parqueo(directorio, 60)
+    try:
+        _assert_mismo_estado(sistema, recuperado)
+    finally:
+        recuperado.diario.cerrar()
+
+
+def test_recuperado_sigue_registrando(directorio):
+    sistema = abrir_parqueo(directorio, 80, registros_por_grupo=8)
+    _operar(sistema, 100, semilla=1)
+    sistema.diario.cerrar()
+
+    recuperado = abrir_parqueo(directorio, 80, registros_por_grupo=8)
+    _operar(recuperado, 100, semilla=2)
+    recuperado.diario.cerrar()
+
+    otra_vez = abrir_parqueo(directorio, 80)
+    try:
+        _assert_mismo_estado(recuperado, otra_vez)
+    finally:
+        otra_vez.diario.cerrar()
+
+
+def test_instantanea_acotada_en_el_tiempo(directorio):
+    sistema = abrir_parqueo(directorio, 20)
+    try:
+        marca = 1_700_000_000.0
+        for _ in range(3 * 24 * 60):
+            marca += 60
+            if sistema.espacios_libres:
+                sistema.entrada_lote([sistema.generar_placa_aleatoria()], marca)
+            else:
+                sistema.salida_aleatoria(5, marca)
+        estado = pickle.loads(pickle.dumps(sistema.estado_ocupacion()))
+        assert len(estado["analitica"].por_minuto) <= MINUTOS_RETENIDOS + 1
+        assert len(estado["analitica"].ocupacion_por_hora()) >= 3 * 24
+    finally:
+        sistema.diario.cerrar()
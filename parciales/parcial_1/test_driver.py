@@ -0,0 +1,69 @@
+import io
+import json
+import random
+
+from driver import COMANDO_INVALIDO, leer_comandos, percentil, reproducir
+from parcial_1 import SistemaParqueo
+
+JSONL = "\n".join([
+    '{"operacion": "entrada", "placa": "abc-123", "cantidad": 2, "marca": 100}',
+    '{"operacion": "entrada", "cantidad": 3, "marca": 110}',
+    '{"operacion": "salida", "placa": "ABC-123", "marca": 120}',
+    '{"operacion": "salida", "placa": "ZZZ-999", "marca": 130}',
+    '{"operacion": "entrada", "cantidad": null}',
+    '{"operacion": "historial", "placa": 5}',
+    '{"operacion": "volar"}',
+    '{"operacion": "entrada"',
+    '[1, 2]',
+    '',
+    '{"operacion": "entre", "desde": 100, "hasta": 125, "tipo": "SALIDA"}',
+    '{"operacion": "historial", "placa": "abc-123"}',
+    '{"operacion": "estado"}',
+])
+
+CSV = """operacion,placa,cantidad,marca,desde,hasta,tipo
+entrada,abc-123,2,100,,,
+entrada,aleatorio,3,110,,,
+salida,ABC-123,,120,,,
+salida,ZZZ-999,,130,,,
+entrada,,x,,,,
+ultimos,,5,,,,
+entre,,,,100,125,SALIDA
+"""
+
+
+def test_jsonl_cuenta_errores_por_comando_y_sigue():
+    random.seed(1)
+    sistema = SistemaParqueo(10)
+    reporte = reproducir(sistema, leer_comandos(io.StringIO(JSONL), "jsonl"))
+
+    operaciones = reporte["operaciones"]
+    assert (operaciones["entrada"]["cantidad"], operaciones["entrada"]["errores"]) == (3, 1)
+    assert (operaciones["salida"]["cantidad"], operaciones["salida"]["errores"]) == (2, 1)
+    assert operaciones["historial"]["errores"] == 1
+    assert operaciones["volar"] == {**operaciones["volar"], "cantidad": 0, "errores": 1}
+    assert operaciones[COMANDO_INVALIDO]["errores"] == 2
+    assert reporte["comandos"] == 9
+    assert reporte["estado_final"] == {"espacios_ocupados": 4, "espacios_libres": 6, "eventos": 6}
+    assert [e[0] for e in sistema.historial_eventos.de_placa("ABC-123")] == ["ABC-123"] * 3
+    json.dumps(reporte)  # el reporte se puede guardar con --json
+
+
+def test_csv_ignora_columnas_vacias():
+    random.seed(1)
+    sistema = SistemaParqueo(10)
+    reporte = reproducir(sistema, leer_comandos(io.StringIO(CSV), "csv"))
+
+    operaciones = reporte["operaciones"]
+    assert operaciones["entrada"]["errores"] == 1  # cantidad "x"
+    assert operaciones["salida"]["errores"] == 1  # placa ausente
+    assert set(operaciones) == {"entrada", "salida", "ultimos", "entre"}
+    assert reporte["estado_final"]["espacios_ocupados"] == 4
+    assert sistema.contar_placa("abc-123") == 1
+
+
+def test_percentil_por_rango_mas_cercano():
+    datos = list(range(1, 101))
+    assert [percentil(datos, p) for p in (0, 50, 90, 99, 100)] == [1, 50, 90, 99, 100]
+    assert percentil([7], 99) == 7
+    assert percentil([], 50) == 0
@@ -0,0 +1,84 @@
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from eventos import CODIGO_TIPO, RegistroEventos, formatear_hora
+
+INICIO = 1_700_000_000.0
+
+
+def _registro_aleatorio(semilla, lotes=40):
+    """Registro con lotes chicos y grandes (ambos caminos de _encadenar) y la lista esperada"""
+    generador = random.Random(semilla)
+    registro = RegistroEventos()
+    esperados = []
+    placas = [f"P{i:02d}" for i in range(30)] + ["AAA-001", "ZZZ-999"]
+    marca = INICIO
+    for _ in range(lotes):
+        marca += generador.choice((0, 1, 30, 600))
+        tipo = generador.choice(("ENTRADA", "SALIDA"))
+        lote = generador.choices(placas, k=generador.choice((1, 5, 63, 64, 200)))
+        tarifas = [float(i) for i in range(len(lote))] if tipo == "SALIDA" else None
+        registro.agregar_lote(lote, tipo, marca, tarifas)
+        for i, placa in enumerate(lote):
+            esperados.append((placa, tipo, marca, tarifas[i] if tarifas else 0.0))
+        if generador.random() < 0.3:
+            # Consultas intercaladas: la cadena se arma por partes
+            registro.de_placa(generador.choice(placas))
+    return registro, esperados, placas
+
+
+def _como_eventos(esperados):
+    return [(placa, tipo, formatear_hora(marca), tarifa) for placa, tipo, marca, tarifa in esperados]
+
+
+@pytest.mark.parametrize("semilla", [1, 2, 3])
+def test_de_placa_igual_que_filtrar(semilla):
+    registro, esperados, placas = _registro_aleatorio(semilla)
+    assert list(registro) == _como_eventos(esperados)
+    for placa in placas + ["NO-EXISTE"]:
+        filtrados = _como_eventos([e for e in esperados if e[0] == placa])
+        assert registro.de_placa(placa) == filtrados
+        assert registro.de_placa(placa.lower()) == filtrados
+
+    por_placa = registro.por_placa()
+    assert set(por_placa) == {e[0] for e in esperados}
+    assert "NO-EXISTE" not in por_placa
+    with pytest.raises(KeyError):
+        por_placa["NO-EXISTE"]
+
+
+@pytest.mark.parametrize("semilla", [4, 5])
+def test_entre_igual_que_filtrar(semilla):
+    registro, esperados, _ = _registro_aleatorio(semilla)
+    fin = esperados[-1][2]
+    generador = random.Random(semilla)
+    for _ in range(50):
+        desde, hasta = sorted(generador.uniform(INICIO - 10, fin + 10) for _ in range(2))
+        dentro = [e for e in esperados if desde <= e[2] < hasta]
+        assert registro.entre(desde, hasta) == _como_eventos(dentro)
+        assert registro.contar_entre(desde, hasta) == len(dentro)
+        for tipo in CODIGO_TIPO:
+            assert registro.entre(desde, hasta, tipo) == \
+                _como_eventos([e for e in dentro if e[1] == tipo])
+
+    # Acepta datetime además de segundos epoch
+    assert registro.entre(datetime.fromtimestamp(INICIO), datetime.fromtimestamp(fin + 1)) == \
+        list(registro)
+
+
+def test_marcas_no_retroceden():
+    registro = RegistroEventos()
+    registro.agregar("AAA-001", "ENTRADA", INICIO + 10)
+    registro.agregar("AAA-002", "ENTRADA", INICIO)  # el reloj retrocedió
+    registro.agregar_lote(["AAA-003", "AAA-004"], "ENTRADA", INICIO + 5)
+    registro.cargar_columnas(np.zeros(2), np.zeros(2), [INICIO, INICIO + 20], np.zeros(2))
+
+    assert list(registro.marcas) == [INICIO + 10] * 5 + [INICIO + 20]
+    assert registro.contar_entre(INICIO + 10, INICIO + 11) == 5
+    assert [e[0] for e in registro.ultimos(3)] == ["AAA-004", "AAA-000", "AAA-000"]
+    assert registro.ultimos(0) == []
+    with pytest.raises(IndexError):
+        registro[6]
@@ -0,0 +1,168 @@
+import random
+from collections import Counter
+
+import pytest
+
+from parcial_1 import SistemaParqueo
+
+
+def _assert_consistente(sistema):
+    """Las estructuras paralelas del parqueo describen los mismos autos"""
+    ocupados = list(sistema._ocupados)
+    assert len(ocupados) == len(set(ocupados)) == sistema.espacios_ocupados
+    assert sistema.espacios_libres == sistema.CAPACIDAD_MAXIMA - sistema.espacios_ocupados
+    for posicion, espacio in enumerate(ocupados):
+        assert sistema._posicion[espacio] == posicion
+        assert sistema._mapa_ocupados[espacio] == 1
+        assert sistema._placa_en_espacio[espacio] != -1
+    libres = set(range(sistema.CAPACIDAD_MAXIMA)) - set(ocupados)
+    assert sorted(sistema._pila_libres) == sorted(libres)
+    for espacio in libres:
+        assert sistema._posicion[espacio] == -1
+        assert sistema._mapa_ocupados[espacio] == 0
+        assert sistema._placa_en_espacio[espacio] == -1
+
+    por_placa = {}
+    for codigo, espacios in sistema._espacios_por_placa.items():
+        espacios = {espacios} if type(espacios) is int else espacios
+        assert len(espacios) >= 1
+        por_placa[codigo] = espacios
+    esperado = {}
+    for espacio in ocupados:
+        esperado.setdefault(sistema._placa_en_espacio[espacio], set()).add(espacio)
+    assert por_placa == esperado
+
+
+def test_placas_en_minusculas_son_la_misma_placa(capsys):
+    sistema = SistemaParqueo(10)
+    sistema.entrada_auto("abc-123")
+    sistema.entrada_auto("mi placa", 2)
+
+    assert sistema.esta_estacionado("ABC-123") and sistema.esta_estacionado("abc-123")
+    assert sistema.contar_placa("Mi Placa") == 2
+    sistema.salida_auto("abc-123")
+    sistema.salida_auto("mi placa", 2)
+
+    assert "Error" not in capsys.readouterr().out
+    assert sistema.espacios_ocupados == 0
+    assert len(sistema.historial_eventos.de_placa("abc-123")) == 2
+    _assert_consistente(sistema)
+
+
+def test_salida_lote_valida_antes_de_modificar():
+    sistema = SistemaParqueo(10)
+    sistema.entrada_lote(["AAA-001", "AAA-001", "BBB-002"], marca=0)
+
+    with pytest.raises(ValueError):
+        sistema.salida_lote(["aaa-001", "AAA-001", "AAA-001"], marca=1)
+    with pytest.raises(ValueError):
+        sistema.salida_lote(["BBB-002", "CCC-003"], marca=1)
+    assert Counter(sistema.placas_autos) == {"AAA-001": 2, "BBB-002": 1}
+    assert len(sistema.historial_eventos) == 3
+    _assert_consistente(sistema)
+
+
+@pytest.mark.parametrize("lote", [3, 300])
+def test_borrado_por_intercambio_consistente(lote):
+    random.seed(lote)
+    sistema = SistemaParqueo(1000)
+    estacionadas = Counter()
+    for paso in range(40):
+        if random.random() < 0.6 and sistema.espacios_libres >= lote:
+            # Algunas placas repetidas: la placa pasa a tener un set de espacios
+            placas = [f"P{random.randint(0, lote * 2)}" for _ in range(lote)]
+            sistema.entrada_lote(placas, marca=paso)
+            estacionadas.update(placas)
+        elif estacionadas:
+            placas = random.sample(list(estacionadas.elements()), min(lote, sum(estacionadas.values())))
+            sistema.salida_lote(placas, marca=paso)
+            estacionadas.subtract(placas)
+            estacionadas += Counter()
+        _assert_consistente(sistema)
+        assert Counter(sistema.placas_autos) == estacionadas
+
+
+@pytest.mark.parametrize("cantidad", [5, 400])
+def test_salida_aleatoria_saca_autos_estacionados(cantidad):
+    random.seed(cantidad)
+    sistema = SistemaParqueo(2000)
+    sistema.entrada_codigos(sistema.generar_codigos_aleatorios(1500), marca=0)
+    sistema.entrada_lote(["MI PLACA"] * 3 + ["AAA-001"] * 2, marca=0)
+    antes = Counter(sistema.placas_autos)
+
+    quitadas = Counter()
+    while sistema.espacios_ocupados >= cantidad:
+        resultado = sistema.salida_aleatoria(cantidad, marca=1)
+        assert len(set(resultado.espacios)) == cantidad
+        assert all(sistema.espacio_libre(espacio) for espacio in resultado.espacios)
+        quitadas.update(resultado.placas)
+        _assert_consistente(sistema)
+
+    assert quitadas + Counter(sistema.placas_autos) == antes
+    with pytest.raises(ValueError):
+        sistema.salida_aleatoria(sistema.espacios_ocupados + 1)
+    assert len(sistema.historial_eventos.entre(1, 2, "SALIDA")) == sum(quitadas.values())
+
+
+def test_salida_aleatoria_reproducible_con_semilla():
+    elegidos = []
+    for _ in range(2):
+        random.seed(9)
+        sistema = SistemaParqueo(600)
+        sistema.entrada_auto("aleatorio", 600)
+        elegidos.append((sistema.salida_aleatoria(10).espacios, sistema.salida_aleatoria(300).espacios))
+    assert elegidos[0] == elegidos[1]
+
+
+def test_salida_espacios_valida_los_espacios():
+    sistema = SistemaParqueo(10)
+    resultado = sistema.entrada_lote(["AAA-001", "BBB-002", "BBB-002"], marca=0)
+    libre = next(e for e in range(10) if sistema.espacio_libre(e))
+
+    for espacios in ([libre], [resultado.espacios[0]] * 2):
+        with pytest.raises(ValueError):
+            sistema.salida_espacios(espacios, marca=1)
+    sistema.salida_espacios(resultado.espacios[1:], marca=1)
+    assert sistema.placas_autos == ["AAA-001"]
+    _assert_consistente(sistema)
+
+
+def _estado(sistema):
+    return (list(sistema._ocupados), list(sistema._placa_en_espacio),
+            sorted(sistema._pila_libres), list(sistema.historial_eventos))
+
+
+@pytest.mark.parametrize("cantidad", [10, 600])
+def test_lote_igual_que_uno_por_uno(cantidad):
+    random.seed(cantidad)
+    placas = [f"P{random.randint(0, cantidad // 2)}" for _ in range(cantidad)]
+    salen = random.sample(placas, cantidad // 2)
+    tarifas = [float(i % 7) for i in range(len(salen))]
+
+    por_lote = SistemaParqueo(1000)
+    entrada = por_lote.entrada_lote(placas, marca=100)
+    salida = por_lote.salida_lote(salen, marca=200, tarifas=tarifas)
+
+    uno_por_uno = SistemaParqueo(1000)
+    for placa in placas:
+        uno_por_uno.entrada_lote([placa], marca=100)
+    for placa, tarifa in zip(salen, tarifas):
+        uno_por_uno.salida_lote([placa], marca=200, tarifas=[tarifa])
+
+    assert entrada.placas == placas and entrada.marca == 100
+    assert entrada.espacios == list(range(cantidad))  # los primeros libres primero
+    assert len(salida) == len(salen) and salida.total_tarifas == sum(tarifas)
+    # Los espacios liberados pueden diferir cuando una placa tiene varios autos
+    assert Counter(por_lote.placas_autos) == Counter(uno_por_uno.placas_autos)
+    assert list(por_lote.historial_eventos) == list(uno_por_uno.historial_eventos)
+    _assert_consistente(por_lote)
+
+
+def test_entrada_lote_sin_espacio_no_registra_nada():
+    sistema = SistemaParqueo(5)
+    sistema.entrada_lote(["AAA-001", "AAA-002"], marca=0)
+    antes = _estado(sistema)
+    with pytest.raises(ValueError):
+        sistema.entrada_lote(["BBB-001"] * 4, marca=1)
+    assert _estado(sistema) == antes
+    assert sistema.espacios_libres == 3
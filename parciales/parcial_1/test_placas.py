@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from placas import (
+    CODIGOS_FORMATO, LOTE_VECTORIZADO, TablaPlacas, codificar_formato, codificar_vector,
+    decodificar_formato, generar_codigos, generar_placas, texto_placas,
+)
+
+LIBRES = ["MI PLACA", "ABC-1234", "AB-123", "ABC_123", "ÁBC-123", "ABC-12٣", "", "abc-12"]
+
+
+def test_formato_ida_y_vuelta_en_los_extremos():
+    for placa in ("AAA-000", "AAA-001", "ABC-123", "ZZZ-999"):
+        codigo = codificar_formato(placa)
+        assert 0 <= codigo < CODIGOS_FORMATO
+        assert decodificar_formato(codigo) == placa
+    assert codificar_formato("ZZZ-999") == CODIGOS_FORMATO - 1
+    for placa in LIBRES:
+        assert codificar_formato(placa.upper()) is None
+
+
+@pytest.mark.parametrize("cantidad", [10, LOTE_VECTORIZADO * 4])
+def test_tabla_ida_y_vuelta_con_placas_libres(cantidad):
+    tabla = TablaPlacas()
+    placas = generar_placas(cantidad, 3)
+    # Placas libres y en minúsculas mezcladas, algunas repetidas
+    for i, libre in enumerate(LIBRES * 2):
+        placas[(i * 7) % cantidad] = libre
+    placas[1] = placas[0].lower()
+
+    codigos = tabla.codificar_lote(placas)
+    assert codigos == [tabla.codificar(placa) for placa in placas]
+    assert len(tabla) == len({p.upper() for p in placas if codificar_formato(p.upper()) is None})
+    assert tabla.decodificar_lote(codigos) == [placa.upper() for placa in placas]
+    assert tabla.buscar_lote(placas) == codigos
+    assert tabla.buscar("otra placa") is None and tabla.buscar("mi placa") == tabla.codificar("MI PLACA")
+
+
+def test_vector_igual_que_escalar():
+    placas = generar_placas(500, 8) + [p.upper() for p in LIBRES]
+    codigos, validas = codificar_vector(placas)
+    for placa, codigo, valida in zip(placas, codigos.tolist(), validas.tolist()):
+        escalar = codificar_formato(placa)
+        assert valida == (escalar is not None), placa
+        if valida:
+            assert codigo == escalar
+
+
+def test_generar_codigos_reproducible_y_en_rango():
+    codigos = generar_codigos(1000, 5)
+    assert codigos.dtype == np.int32
+    assert codigos.min() >= 0 and codigos.max() < CODIGOS_FORMATO
+    assert np.array_equal(codigos, generar_codigos(1000, np.random.default_rng(5)))
+    assert texto_placas(codigos) == [decodificar_formato(c) for c in codigos.tolist()]
@@ -0,0 +1,84 @@
+from collections import Counter
+
+import pytest
+
+from red_parqueos import RedParqueos
+
+CAPACIDADES = {"norte": 40, "sur": 40, "este": 40}
+
+
+def _placas(cantidad):
+    return [f"{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}X-{i:03d}" for i in range(cantidad)]
+
+
+def test_reparto_determinista_entre_instancias():
+    placas = _placas(60)
+    primera = RedParqueos(CAPACIDADES)
+    segunda = RedParqueos(CAPACIDADES)
+
+    assert [primera._parqueo_preferido(p) for p in placas] == \
+        [segunda._parqueo_preferido(p) for p in placas]
+    primera.entrada(placas, marca=0)
+    segunda.entrada(placas, marca=0)
+    assert primera.estado_por_parqueo() == segunda.estado_por_parqueo()
+    assert all(primera.ubicar(p) == segunda.ubicar(p) for p in placas)
+
+
+def test_cada_placa_va_a_su_parqueo_preferido_si_hay_lugar():
+    red = RedParqueos(CAPACIDADES)
+    placas = _placas(30)
+    red.entrada(placas, marca=0)
+
+    for placa in placas:
+        assert red.ubicar(placa) == {red.nombres[red._parqueo_preferido(placa)]: 1}
+
+
+def test_parqueo_lleno_desborda_al_siguiente():
+    red = RedParqueos({"a": 2, "b": 2, "c": 2})
+    placas = _placas(6)
+    red.entrada(placas, marca=0)
+
+    assert red.espacios_libres == 0
+    assert [ocupados for _, ocupados, _ in red.estado_por_parqueo()] == [2, 2, 2]
+    with pytest.raises(ValueError):
+        red.entrada(["ZZZ-999"], marca=1)
+    assert red.espacios_ocupados == 6
+
+
+def test_ubicar_y_salida_normalizan_la_placa():
+    red = RedParqueos(CAPACIDADES)
+    red.entrada(["abc-123", "ABC-123", "xyz-789"], marca=0)
+    assert sum(red.ubicar("Abc-123").values()) == 2
+
+    red.salida(["abc-123"], marca=10)
+    assert sum(red.ubicar("ABC-123").values()) == 1
+    with pytest.raises(ValueError):
+        red.salida(["XYZ-789", "xyz-789"], marca=20)
+    assert red.ubicar("xyz-789") != {}
+
+
+def test_agregados_coinciden_con_los_parqueos():
+    red = RedParqueos(CAPACIDADES)
+    placas = _placas(90)
+    red.entrada(placas, marca=0)
+    red.salida(placas[::3], marca=5)
+
+    ocupados = {nombre: p.espacios_ocupados for nombre, p in red.parqueos.items()}
+    assert red.espacios_ocupados == sum(ocupados.values()) == 60
+    assert [o for _, o, _ in red.estado_por_parqueo()] == [ocupados[n] for n in red.nombres]
+    conteo = Counter()
+    for nombre, parqueo in red.parqueos.items():
+        conteo.update((placa, nombre) for placa in parqueo.placas_autos)
+    assert all(red.ubicar(placa) == {nombre: cantidad} for (placa, nombre), cantidad in conteo.items())
+
+
+def test_simular_no_depende_de_los_procesos():
+    resultados = []
+    for trabajadores in (1, 2):
+        red = RedParqueos({"a": 30, "b": 30})
+        resumenes = red.simular(horas=6, tasa_llegadas=15, inicio=1_700_000_000, semilla=4,
+                                max_workers=trabajadores)
+        resultados.append((resumenes, list(red.eventos())))
+
+    assert resultados[0] == resultados[1]
+    assert resultados[0][1]
@@ -0,0 +1,64 @@
+import builtins
+
+import pytest
+
+import parcial_1
+from diario_parqueo import abrir_parqueo
+from parcial_1 import SistemaParqueo
+from simulacion import SimulacionParqueo, estadia_exponencial, estadia_uniforme
+
+INICIO = 1_700_000_000.0
+
+
+def _simular(semilla, **opciones):
+    sistema = SistemaParqueo(80)
+    simulacion = SimulacionParqueo(sistema, tasa_llegadas=60, inicio=INICIO, semilla=semilla, **opciones)
+    resumen = simulacion.ejecutar(horas=12)
+    return resumen, list(sistema.historial_eventos), sorted(sistema.placas_autos)
+
+
+@pytest.mark.parametrize("opciones", [
+    {},
+    {"resolucion": 60},
+    {"estadia": estadia_exponencial(1.5)},
+    {"estadia": estadia_uniforme(0.5, 3)},
+])
+def test_misma_semilla_misma_simulacion(opciones):
+    primera = _simular(5, **opciones)
+    assert primera == _simular(5, **opciones)
+    assert primera != _simular(6, **opciones)
+    resumen = primera[0]
+    assert resumen["llegadas"] == resumen["rechazados"] + resumen["salidas"] + resumen["estacionados"]
+
+
+def test_ejecutar_por_tramos_igual_que_de_una_vez():
+    completa = SistemaParqueo(50)
+    SimulacionParqueo(completa, 40, inicio=INICIO, semilla="s").ejecutar(horas=10)
+    por_tramos = SistemaParqueo(50)
+    simulacion = SimulacionParqueo(por_tramos, 40, inicio=INICIO, semilla="s")
+    for _ in range(4):
+        simulacion.ejecutar(horas=2.5)
+
+    assert list(por_tramos.historial_eventos) == list(completa.historial_eventos)
+
+
+def test_marcas_redondeadas_a_la_resolucion():
+    sistema = SistemaParqueo(30)
+    SimulacionParqueo(sistema, 30, inicio=INICIO, semilla=1, resolucion=300).ejecutar(horas=6)
+
+    assert all(marca % 300 == 0 for marca in sistema.historial_eventos.marcas)
+
+
+def test_simulacion_del_menu_no_toca_el_parqueo_guardado(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(parcial_1, "DIRECTORIO_DATOS", str(tmp_path))
+    respuestas = iter(["1", "ABC-123", "", "7", "4", "30", "8"])
+    monkeypatch.setattr(builtins, "input", lambda _="": next(respuestas))
+    parcial_1.main()
+
+    assert "h simuladas" in capsys.readouterr().out
+    sistema = abrir_parqueo(str(tmp_path))
+    try:
+        assert sistema.placas_autos == ["ABC-123"]
+        assert len(sistema.historial_eventos) == 1
+    finally:
+        sistema.diario.cerrar()
@@ -1,12 +1,99 @@
+from array import array
+from collections import deque
+from collections.abc import Sequence
+from itertools import repeat
+
+import numpy as np
+
+# Puntos por alerta según [atendida][real] (mismas reglas que evaluar_alerta)
+TABLA_DELTAS = np.array([[0, -2],
+                         [-1, 2]], dtype=np.int8)
+TABLA_RESULTADOS = (("Correcto (0)", "Crítico (-2)"),
+                    ("Error (-1)", "Correcto (+2)"))
+
+
 class SistemaPuntuacion:
     """
     Clase encargada de calcular y administrar el puntaje del juego
     según las decisiones del administrador de sistemas TI.
     """
 
-    def __init__(self, puntos_iniciales=15):
+    def __init__(self, puntos_iniciales=15, turnos_con_detalle=100):
+        """
+        turnos_con_detalle: cuántos de los últimos turnos conservan el detalle
+        por alerta (None = todos, 0 = ninguno).
+        """
+        if turnos_con_detalle is not None and turnos_con_detalle < 0:
+            raise ValueError("turnos_con_detalle no puede ser negativo")
         self.puntos = puntos_iniciales
-        self.historial = []  # Guarda las evaluaciones de cada turno
+        self.puntos_iniciales = puntos_iniciales
+        # Sumas prefijas de los puntos por turno: _acumulados[k] = puntos de
+        # los turnos 1..k, así que cualquier total o rango de turnos es O(1)
+        self._acumulados = array("q", [0])
+        # Detalle por alerta (resultados de procesar_turno) de los últimos
+        # turnos, uno por turno y en orden (None en los de procesar_lote): el
+        # último elemento es el del turno cantidad_turnos
+        self.turnos_con_detalle = turnos_con_detalle
+        self._detalle = deque(maxlen=turnos_con_detalle)
+
+    @property
+    def historial(self):
+        """Vista de solo lectura de los turnos (compatible con la lista de dicts anterior)"""
+        return _HistorialTurnos(self)
+
+    @property
+    def cantidad_turnos(self):
+        return len(self._acumulados) - 1
+
+    def _validar_turno(self, turno):
+        if not 1 <= turno <= self.cantidad_turnos:
+            raise IndexError(f"turno fuera de rango: {turno} (hay {self.cantidad_turnos})")
+
+    def puntos_despues_de(self, turno):
+        """Puntaje total al terminar el turno `turno` (desde 1)"""
+        self._validar_turno(turno)
+        return self.puntos_iniciales + self._acumulados[turno]
+
+    def puntos_entre(self, desde, hasta):
+        """Puntos obtenidos en los turnos desde..hasta (ambos incluidos, desde 1)"""
+        self._validar_turno(desde)
+        self._validar_turno(hasta)
+        if desde > hasta:
+            raise ValueError(f"rango de turnos vacío: {desde}..{hasta}")
+        return self._acumulados[hasta] - self._acumulados[desde - 1]
+
+    def puntos_del_turno(self, turno):
+        self._validar_turno(turno)
+        return self._acumulados[turno] - self._acumulados[turno - 1]
+
+    def detalle_turno(self, turno):
+        """Resultados por alerta del turno, o None si ya no se conservan"""
+        self._validar_turno(turno)
+        # El detalle guarda los últimos len(_detalle) turnos de forma contigua
+        posicion = turno - (self.cantidad_turnos - len(self._detalle)) - 1
+        if posicion < 0:
+            return None
+        return self._detalle[posicion]
+
+    def _agregar_turnos(self, puntos_por_turno, detalle=None):
+        """
+        Agrega los puntos de uno o más turnos. `detalle` son los resultados
+        del único turno agregado; sin él los turnos quedan sin detalle. La
+        deque (maxlen=turnos_con_detalle) descarta el detalle que quedó viejo.
+        """
+        base = self._acumulados[-1]
+        cantidad = len(puntos_por_turno)
+        if cantidad == 1:
+            self._acumulados.append(base + int(puntos_por_turno[0]))
+        else:
+            acumulados = base + np.cumsum(puntos_por_turno, dtype=np.int64)
+            self._acumulados.frombytes(acumulados.tobytes())
+        if detalle is not None:
+            self._detalle.append(detalle)
+        elif self.turnos_con_detalle is None:
+            self._detalle.extend(repeat(None, cantidad))
+        else:
+            self._detalle.extend(repeat(None, min(cantidad, self.turnos_con_detalle)))
 
     def evaluar_alerta(self, alerta, atendida):
         """
@@ -42,7 +129,8 @@ class SistemaPuntuacion:
         Procesa un turno completo y devuelve un resumen de resultados.
 
         Args:
-            alertas (list): Lista de alertas generadas en el turno.
+            alertas (list): Lista de alertas generadas en el turno (Alerta, o
+                dicts con la clave "real").
             seleccionadas (set): Índices de alertas atendidas por el jugador.
         """
         resultados = []
@@ -59,22 +147,101 @@ class SistemaPuntuacion:
                 "delta": delta
             })
 
-        # Guardar en el historial global
-        self.historial.append({
-            "alertas": resultados,
-            "puntos_turno": puntos_turno,
-            "puntos_totales": self.puntos
-        })
+        # Guardar en el historial global (el detalle solo si entra en la ventana)
+        self._agregar_turnos((puntos_turno,), resultados)
 
         return resultados, puntos_turno
 
+    def procesar_lote(self, real, atendida, turno=None, cantidad_turnos=None):
+        """
+        Puntúa muchas alertas (y muchos turnos) de una vez con NumPy, con los
+        mismos puntos que procesar_turno.
+
+        Args:
+            real (array bool): Si cada alerta era real (por ejemplo la columna
+                "real" de devices.generar_alertas_lote).
+            atendida (array bool): Si el jugador atendió cada alerta.
+            turno (array int, opcional): Turno de cada alerta, contado desde 0
+                (por ejemplo la columna "tick"). Sin él, un array 1-D es un
+                solo turno y uno 2-D tiene una fila por turno.
+            cantidad_turnos (int, opcional): Total de turnos del lote, para
+                incluir los turnos finales sin alertas.
+
+        Returns:
+            (deltas por alerta, puntos por turno) como arrays. Estos turnos
+            no guardan detalle por alerta.
+        """
+        real = np.asarray(real, dtype=bool)
+        atendida = np.asarray(atendida, dtype=bool)
+        if real.shape != atendida.shape:
+            raise ValueError("real y atendida deben tener la misma forma")
+        # Índice en la tabla aplanada: 2 * atendida + real
+        deltas = TABLA_DELTAS.ravel()[(atendida.view(np.uint8) << 1) | real.view(np.uint8)]
+
+        if turno is None:
+            # 1-D: un turno; 2-D (turnos x alertas): una fila por turno
+            puntos_por_turno = deltas.sum(axis=-1, dtype=np.int64).reshape(-1)
+        else:
+            puntos_por_turno = np.bincount(turno, weights=deltas,
+                                           minlength=cantidad_turnos or 0).astype(np.int64)
+
+        if len(puntos_por_turno):
+            self._agregar_turnos(puntos_por_turno)
+            self.puntos += int(puntos_por_turno.sum())
+        return deltas, puntos_por_turno
+
     def obtener_puntaje_total(self):
         """Devuelve los puntos acumulados actuales."""
         return self.puntos
 
-    def resumen(self):
-        """Devuelve un resumen textual del progreso del jugador."""
-        texto = ["=== Historial de Turnos ==="]
-        for idx, turno in enumerate(self.historial, start=1):
-            texto.append(f"Turno {idx}: +{turno['puntos_turno']} puntos (Total: {turno['puntos_totales']})")
-        return "\n".join(texto)
+    def lineas_resumen(self, desde=1, hasta=None):
+        """Genera las líneas del resumen de los turnos desde..hasta, una por vez"""
+        hasta = self.cantidad_turnos if hasta is None else min(hasta, self.cantidad_turnos)
+        acumulados = self._acumulados
+        for idx in range(max(desde, 1), hasta + 1):
+            yield (f"Turno {idx}: +{acumulados[idx] - acumulados[idx - 1]} puntos "
+                   f"(Total: {self.puntos_iniciales + acumulados[idx]})")
+
+    def resumen(self, pagina=None, por_pagina=50):
+        """
+        Devuelve un resumen textual del progreso del jugador. Con `pagina`
+        (desde 1) solo incluye esos `por_pagina` turnos; para historiales
+        largos conviene lineas_resumen o escribir_resumen.
+        """
+        if pagina is None:
+            desde, hasta = 1, None
+        else:
+            desde = (pagina - 1) * por_pagina + 1
+            hasta = desde + por_pagina - 1
+        return "\n".join(["=== Historial de Turnos ===", *self.lineas_resumen(desde, hasta)])
+
+    def escribir_resumen(self, archivo):
+        """Escribe el resumen completo en un archivo abierto sin armarlo en memoria"""
+        archivo.write("=== Historial de Turnos ===\n")
+        for linea in self.lineas_resumen():
+            archivo.write(linea + "\n")
+
+
+class _HistorialTurnos(Sequence):
+    """historial[i] -> {"alertas", "puntos_turno", "puntos_totales"} armado al pedirlo"""
+
+    def __init__(self, sistema):
+        self._sistema = sistema
+
+    def __len__(self):
+        return self._sistema.cantidad_turnos
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("turno fuera de rango")
+        turno = indice + 1
+        sistema = self._sistema
+        return {
+            "alertas": sistema.detalle_turno(turno),
+            "puntos_turno": sistema.puntos_del_turno(turno),
+            "puntos_totales": sistema.puntos_despues_de(turno),
+        }
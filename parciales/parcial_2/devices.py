@@ -1,6 +1,88 @@
 import random
 from datetime import datetime
 
+import numpy as np
+
+TIPOS_DISPOSITIVO = ("Movimiento", "Temperatura", "Energía", "Ruido", "Cámara")
+
+# Una fila por alerta del lote; el mensaje no se guarda, se arma al mostrarla
+ALERTA_DTYPE = np.dtype([
+    ("tick", np.uint32),
+    ("dispositivo", np.uint32),  # índice en la lista de dispositivos
+    ("tipo", np.uint8),  # índice en TIPOS_DISPOSITIVO
+    ("lectura", np.float32),
+    ("severidad", np.uint8),
+    ("real", np.bool_),
+])
+
+
+class Alerta:
+    """
+    Alerta inmutable: el dispositivo que la generó, la lectura cruda y la
+    severidad y `real` empaquetadas en un entero. El mensaje se arma recién al
+    leerlo. Admite alerta["real"], alerta["mensaje"]... como los dicts que
+    reemplaza. Es un valor, como esos dicts: dos alertas son iguales si
+    tienen el mismo dispositivo (por nombre), lectura, severidad y `real`. Se puede copiar y
+    serializar con pickle (__reduce__ la reconstruye con __init__).
+    """
+
+    __slots__ = ("_dispositivo", "lectura", "_banderas")
+
+    def __init__(self, dispositivo, lectura, severidad, real):
+        object.__setattr__(self, "_dispositivo", dispositivo)
+        object.__setattr__(self, "lectura", lectura)
+        object.__setattr__(self, "_banderas", int(severidad) << 1 | bool(real))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Alerta es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Alerta es inmutable")
+
+    def __reduce__(self):
+        # pickle y copy no pueden asignar los slots (__setattr__ lo impide)
+        return Alerta, (self._dispositivo, self.lectura, self.severidad, self.real)
+
+    def __eq__(self, otra):
+        if not isinstance(otra, Alerta):
+            return NotImplemented
+        return (self.lectura == otra.lectura and self._banderas == otra._banderas
+                and self.dispositivo == otra.dispositivo)
+
+    def __hash__(self):
+        return hash((self.dispositivo, self.lectura, self._banderas))
+
+    @property
+    def dispositivo(self):
+        return self._dispositivo.nombre
+
+    @property
+    def fuente(self):
+        """Dispositivo que generó la alerta"""
+        return self._dispositivo
+
+    @property
+    def severidad(self):
+        return self._banderas >> 1
+
+    @property
+    def real(self):
+        return bool(self._banderas & 1)
+
+    @property
+    def mensaje(self):
+        return self._dispositivo.mensaje(self.lectura)
+
+    def __getitem__(self, clave):
+        return _LEER_CLAVE[clave](self)
+
+    def __repr__(self):
+        return f"Alerta({self.dispositivo!r}, {self.mensaje!r}, severidad={self.severidad}, real={self.real})"
+
+
+# alerta["clave"] -> función que lee esa propiedad (KeyError si no existe)
+_LEER_CLAVE = {clave: getattr(Alerta, clave).fget for clave in ("dispositivo", "mensaje", "severidad", "real")}
+
 
 class Dispositivo:
     def __init__(self, nombre, tipo, fiabilidad=0.9):
@@ -8,9 +90,25 @@ class Dispositivo:
         self.tipo = tipo
         self.fiabilidad = fiabilidad
 
+    @property
+    def codigo_tipo(self):
+        return TIPOS_DISPOSITIVO.index(self.tipo)
+
     def generar_alerta(self):
         raise NotImplementedError
 
+    def generar_lote(self, generador, ticks):
+        """
+        Versión vectorizada de generar_alerta para `ticks` turnos. Retorna los
+        arrays (emite, lectura, severidad, real), con la misma distribución
+        que llamar generar_alerta una vez por turno.
+        """
+        raise NotImplementedError
+
+    def mensaje(self, lectura):
+        """Texto de la alerta a partir de la lectura"""
+        raise NotImplementedError
+
 
 class MotionSensor(Dispositivo):
     def __init__(self, nombre):
@@ -20,12 +118,19 @@ class MotionSensor(Dispositivo):
         movimiento = random.choices([True, False])
         real = movimiento and random.random() < 0.8
         if movimiento or random.random() < 0.2:
-            return {
-                "dispositivo": self.nombre,
-                "mensaje": "Movimiento detectado" if movimiento else "Falsa detección",
-                "severidad": random.randint(1, 5),
-                "real": real,
-            }
+            return Alerta(self, 1.0 if movimiento else 0.0, random.randint(1, 5), real)
+
+    def generar_lote(self, generador, ticks):
+        # random.choices devuelve una lista ([True] o [False]) y siempre es
+        # verdadera: generar_alerta emite en todos los turnos, con real ~ 80 %
+        # y el mensaje "Movimiento detectado". El lote reproduce eso mismo.
+        emite = np.ones(ticks, dtype=bool)
+        real = generador.random(ticks) < 0.8
+        severidad = generador.integers(1, 6, size=ticks, dtype=np.uint8)
+        return emite, np.ones(ticks, dtype=np.float32), severidad, real
+
+    def mensaje(self, lectura):
+        return "Movimiento detectado" if lectura else "Falsa detección"
 
 
 class TemperatureSensor(Dispositivo):
@@ -36,12 +141,16 @@ class TemperatureSensor(Dispositivo):
         temp = random.uniform(15, 50)
         real = temp > 40
         if random.random() < 0.3 or real:
-            return {
-                "dispositivo": self.nombre,
-                "mensaje": f"Temperatura {temp:.1f}°C",
-                "severidad": 5 if real else 2,
-                "real": real,
-            }
+            return Alerta(self, temp, 5 if real else 2, real)
+
+    def generar_lote(self, generador, ticks):
+        temp = generador.uniform(15, 50, ticks)
+        real = temp > 40
+        emite = real | (generador.random(ticks) < 0.3)
+        return emite, temp, np.where(real, 5, 2), real
+
+    def mensaje(self, lectura):
+        return f"Temperatura {lectura:.1f}°C"
 
 
 class PowerSensor(Dispositivo):
@@ -52,12 +161,16 @@ class PowerSensor(Dispositivo):
         consumo = random.uniform(50, 700)
         real = consumo > 600
         if random.random() < 0.3 or real:
-            return {
-                "dispositivo": self.nombre,
-                "mensaje": f"Consumo {consumo:.0f}W",
-                "severidad": 4 if real else 2,
-                "real": real,
-            }
+            return Alerta(self, consumo, 4 if real else 2, real)
+
+    def generar_lote(self, generador, ticks):
+        consumo = generador.uniform(50, 700, ticks)
+        real = consumo > 600
+        emite = real | (generador.random(ticks) < 0.3)
+        return emite, consumo, np.where(real, 4, 2), real
+
+    def mensaje(self, lectura):
+        return f"Consumo {lectura:.0f}W"
 
 
 class NoiseSensor(Dispositivo):
@@ -68,25 +181,78 @@ class NoiseSensor(Dispositivo):
         ruido = random.uniform(20, 100)
         real = ruido > 80
         if random.random() < 0.3 or real:
-            return {
-                "dispositivo": self.nombre,
-                "mensaje": f"Ruido {ruido:.0f}db",
-                "severidad": 3,
-                "real": real,
-            }
+            return Alerta(self, ruido, 3, real)
+
+    def generar_lote(self, generador, ticks):
+        ruido = generador.uniform(20, 100, ticks)
+        real = ruido > 80
+        emite = real | (generador.random(ticks) < 0.3)
+        return emite, ruido, np.full(ticks, 3), real
+
+    def mensaje(self, lectura):
+        return f"Ruido {lectura:.0f}db"
 
 
 class Camera(Dispositivo):
+    EVENTOS = ["movimiento", "error", "ok"]
+
     def __init__(self, nombre):
         super().__init__(nombre, "Cámara")
 
     def generar_alerta(self):
-        evento = random.choice(["movimiento", "error", "ok"])
+        evento = random.choice(self.EVENTOS)
         real = evento == "movimiento"
         if evento != "ok":
-            return {
-                "dispositivo": self.nombre,
-                "mensaje": f"Cámara detecta {evento}",
-                "severidad": 4 if real else 2,
-                "real": real,
-            }
+            return Alerta(self, float(self.EVENTOS.index(evento)), 4 if real else 2, real)
+
+    def generar_lote(self, generador, ticks):
+        # La lectura es el índice del evento en EVENTOS
+        evento = generador.integers(0, 3, size=ticks)
+        real = evento == 0
+        return evento != 2, evento, np.where(real, 4, 2), real
+
+    def mensaje(self, lectura):
+        return f"Cámara detecta {self.EVENTOS[int(lectura)]}"
+
+
+def generar_alertas_lote(dispositivos, ticks, semilla=None):
+    """
+    Genera las alertas de `ticks` turnos de todos los dispositivos en una
+    pasada vectorizada. Retorna un array estructurado (ALERTA_DTYPE) ordenado
+    por turno y, dentro del turno, en el orden de `dispositivos` (el mismo
+    orden en que main.py llama a generar_alerta). semilla: entero o
+    np.random.Generator.
+    """
+    generador = np.random.default_rng(semilla)
+    cantidad = len(dispositivos)
+    emite = np.empty((ticks, cantidad), dtype=bool)
+    lectura = np.empty((ticks, cantidad), dtype=np.float32)
+    severidad = np.empty((ticks, cantidad), dtype=np.uint8)
+    real = np.empty((ticks, cantidad), dtype=bool)
+    for j, dispositivo in enumerate(dispositivos):
+        emite[:, j], lectura[:, j], severidad[:, j], real[:, j] = dispositivo.generar_lote(generador, ticks)
+
+    tick, indice = np.nonzero(emite)
+    alertas = np.empty(len(tick), dtype=ALERTA_DTYPE)
+    alertas["tick"] = tick
+    alertas["dispositivo"] = indice
+    alertas["tipo"] = np.array([d.codigo_tipo for d in dispositivos], dtype=np.uint8)[indice]
+    alertas["lectura"] = lectura[emite]
+    alertas["severidad"] = severidad[emite]
+    alertas["real"] = real[emite]
+    return alertas
+
+
+def mensaje_alerta(dispositivos, alerta):
+    """Mensaje de una fila del lote (se arma solo al mostrarla)"""
+    return dispositivos[alerta["dispositivo"]].mensaje(alerta["lectura"])
+
+
+def alertas_del_lote(dispositivos, alertas):
+    """Filas del lote como Alerta, igual que las de generar_alerta (para mostrarlas en la interfaz)"""
+    return [
+        Alerta(dispositivos[indice], lectura, severidad, real)
+        for indice, lectura, severidad, real in zip(
+            alertas["dispositivo"].tolist(), alertas["lectura"].tolist(),
+            alertas["severidad"].tolist(), alertas["real"].tolist())
+    ]
@@ -0,0 +1,181 @@
+"""
+Evaluación de políticas de atención de alertas sin interfaz (Monte Carlo).
+
+Cada corrida genera los turnos con devices.generar_alertas_lote, decide qué
+alertas atender según cada política y puntúa con SistemaPuntuacion. Todas las
+políticas de una corrida ven las mismas alertas, así la comparación entre
+ellas tiene menos ruido. Las corridas se reparten en un ProcessPoolExecutor y
+cada una usa su propio flujo aleatorio (SeedSequence.spawn), por lo que el
+resultado no depende de cuántos procesos se usen.
+
+Uso:
+    python evaluacion_politicas.py --corridas 200 --turnos 100000 --semilla 1
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from devices import (TIPOS_DISPOSITIVO, Camera, MotionSensor, NoiseSensor, PowerSensor,
+                     TemperatureSensor, generar_alertas_lote)
+
+# "Sistema de puntuacion.py" tiene espacios en el nombre: se carga por ruta
+_spec = importlib.util.spec_from_file_location(
+    "sistema_de_puntuacion", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Sistema de puntuacion.py"))
+_puntuacion = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_puntuacion)
+SistemaPuntuacion = _puntuacion.SistemaPuntuacion
+
+# Turnos generados por bloque dentro de una corrida (acota la memoria)
+TURNOS_POR_BLOQUE = 250_000
+# z de la normal para el intervalo de confianza del 95 %
+Z_95 = 1.959963984540054
+
+
+def dispositivos_por_defecto():
+    """Los mismos dispositivos que main.py"""
+    return [
+        MotionSensor("Sensor de Movimiento"),
+        TemperatureSensor("Sensor de Temperatura"),
+        PowerSensor("Sensor de Energía"),
+        NoiseSensor("Sensor de Ruido"),
+        Camera("Cámara de Seguridad"),
+    ]
+
+
+# ---------- Políticas ----------
+# Una política recibe el array de alertas (devices.ALERTA_DTYPE) y retorna la
+# máscara de las que se atienden. Son clases de nivel de módulo para poder
+# enviarlas a otros procesos.
+
+class AtenderTodas:
+    nombre = "atender todas"
+
+    def __call__(self, alertas):
+        return np.ones(len(alertas), dtype=bool)
+
+
+class PoliticaSeveridad:
+    """Atiende las alertas con severidad >= minima"""
+
+    def __init__(self, minima):
+        self.minima = minima
+        self.nombre = f"severidad >= {minima}"
+
+    def __call__(self, alertas):
+        return alertas["severidad"] >= self.minima
+
+
+class PoliticaPorTipo:
+    """
+    Umbral de severidad por tipo de dispositivo: dict tipo -> severidad mínima
+    (los tipos que no aparecen usan `por_defecto`; None = no se atienden).
+    """
+
+    def __init__(self, umbrales, por_defecto=None, nombre=None):
+        self.umbrales = dict(umbrales)
+        self.por_defecto = por_defecto
+        self.nombre = nombre or "por tipo " + ", ".join(f"{tipo}>={minima}" for tipo, minima in self.umbrales.items())
+        # Tabla código de tipo -> severidad mínima (6 = nunca, la severidad máxima es 5)
+        self._minimas = np.array([
+            6 if minima is None else minima
+            for minima in (self.umbrales.get(tipo, por_defecto) for tipo in TIPOS_DISPOSITIVO)
+        ], dtype=np.uint8)
+
+    def __call__(self, alertas):
+        return alertas["severidad"] >= self._minimas[alertas["tipo"]]
+
+
+def politicas_por_defecto():
+    return [
+        AtenderTodas(),
+        *(PoliticaSeveridad(minima) for minima in range(2, 6)),
+        PoliticaPorTipo({"Movimiento": 1, "Temperatura": 5, "Energía": 4, "Ruido": 3, "Cámara": 4},
+                        nombre="umbrales por tipo (M1 T5 E4 R3 C4)"),
+    ]
+
+
+# ---------- Corridas ----------
+def _corrida(politicas, turnos, semilla, puntos_iniciales):
+    """Trabajo de un proceso: una corrida completa; retorna el puntaje final de cada política"""
+    generador = np.random.default_rng(semilla)
+    dispositivos = dispositivos_por_defecto()
+    sistemas = [SistemaPuntuacion(puntos_iniciales, turnos_con_detalle=0) for _ in politicas]
+    for inicio in range(0, turnos, TURNOS_POR_BLOQUE):
+        bloque = min(TURNOS_POR_BLOQUE, turnos - inicio)
+        alertas = generar_alertas_lote(dispositivos, bloque, generador)
+        for politica, sistema in zip(politicas, sistemas):
+            sistema.procesar_lote(alertas["real"], politica(alertas), alertas["tick"], bloque)
+    return [sistema.obtener_puntaje_total() for sistema in sistemas]
+
+
+def estadisticas(puntajes):
+    """Media, varianza muestral e intervalo de confianza del 95 % (aproximación normal)"""
+    puntajes = np.asarray(puntajes, dtype=np.float64)
+    n = len(puntajes)
+    media = float(puntajes.mean())
+    varianza = float(puntajes.var(ddof=1)) if n > 1 else 0.0
+    margen = Z_95 * math.sqrt(varianza / n) if n > 1 else 0.0
+    return {
+        "corridas": n,
+        "media": media,
+        "varianza": varianza,
+        "desviacion": math.sqrt(varianza),
+        "ic95": (media - margen, media + margen),
+        "minimo": float(puntajes.min()),
+        "maximo": float(puntajes.max()),
+    }
+
+
+def evaluar_politicas(politicas=None, corridas=100, turnos=10_000, semilla=0,
+                      puntos_iniciales=15, max_workers=None):
+    """
+    Juega `corridas` partidas de `turnos` turnos con cada política y retorna
+    dict nombre de política -> estadísticas del puntaje final.
+    """
+    politicas = politicas or politicas_por_defecto()
+    # Un flujo independiente y reproducible por corrida
+    semillas = np.random.SeedSequence(semilla).spawn(corridas)
+    trabajadores = min(corridas, max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(trabajadores) as pool:
+        futuros = [pool.submit(_corrida, politicas, turnos, semilla_corrida, puntos_iniciales)
+                   for semilla_corrida in semillas]
+        # Se recogen en el orden de las corridas, no en el de terminación
+        puntajes = np.array([futuro.result() for futuro in futuros])
+
+    return {politica.nombre: estadisticas(puntajes[:, i]) for i, politica in enumerate(politicas)}
+
+
+def imprimir_resultados(resultados):
+    print(f"{'política':>36} | {'media':>12} | {'desviación':>10} | {'IC 95 %':>27}")
+    for nombre, datos in sorted(resultados.items(), key=lambda item: -item[1]["media"]):
+        inferior, superior = datos["ic95"]
+        print(f"{nombre:>36} | {datos['media']:>12,.1f} | {datos['desviacion']:>10,.1f} | "
+              f"[{inferior:>11,.1f}, {superior:>11,.1f}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evalúa políticas de atención de alertas (Monte Carlo)")
+    parser.add_argument("--corridas", type=int, default=100)
+    parser.add_argument("--turnos", type=int, default=10_000, help="turnos por corrida")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--puntos-iniciales", type=int, default=15)
+    parser.add_argument("--workers", type=int, help="procesos (por defecto, uno por CPU)")
+    parser.add_argument("--json", help="guarda los resultados en este archivo JSON")
+    args = parser.parse_args()
+
+    resultados = evaluar_politicas(corridas=args.corridas, turnos=args.turnos, semilla=args.semilla,
+                                   puntos_iniciales=args.puntos_iniciales, max_workers=args.workers)
+    imprimir_resultados(resultados)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
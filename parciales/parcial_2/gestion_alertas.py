@@ -38,7 +38,7 @@ def procesar_decisiones(self):
         
         if atendida:
             # el admin decidio atender esta alerta
-            if alerta["real"]:
+            if alerta.real:
                 resultado = "CORRECTO (+2)"
                 self.puntos += 2
                 puntos_ganados += 2
@@ -48,7 +48,7 @@ def procesar_decisiones(self):
                 puntos_ganados -= 1
         else:
             # el admin decidio no atender esta alerta
-            if alerta["real"]:
+            if alerta.real:
                 resultado = "CRÍTICO (-2)"
                 self.puntos -= 2
                 puntos_ganados -= 2
@@ -112,16 +112,16 @@ def dibujar_pantalla_analizando(self):
         pygame.draw.rect(self.screen, color_borde, rect, 3, border_radius=8)
         
         # info alerta para análisis
-        self.dibujar_texto(f"#{i+1} - {alerta['dispositivo']}", 
+        self.dibujar_texto(f"#{i+1} - {alerta.dispositivo}", 
                           30, y + 10, self.font_normal, self.NEGRO)
         
-        self.dibujar_texto(f"Mensaje: {alerta['mensaje']}", 
+        self.dibujar_texto(f"Mensaje: {alerta.mensaje}", 
                           30, y + 35, self.font_pequeña, self.GRIS_OSCURO)
         
         #severidad???????
-        sev_color = self.ROJO if alerta['severidad'] >= 4 else (
-            self.NARANJA if alerta['severidad'] >= 3 else self.AMARILLO)
-        self.dibujar_texto(f"Severidad: {alerta['severidad']}/5", 
+        sev_color = self.ROJO if alerta.severidad >= 4 else (
+            self.NARANJA if alerta.severidad >= 3 else self.AMARILLO)
+        self.dibujar_texto(f"Severidad: {alerta.severidad}/5", 
                           30, y + 60, self.font_pequeña, sev_color)
         
         # ta selecionada 
@@ -188,12 +188,12 @@ def dibujar_pantalla_resultado(self):
     
     for dato in self.juego.resultado_turno["resultados"]:
         alerta = dato["alerta"]
-        tipo = "REAL" if alerta["real"] else "FALSA"
+        tipo = "REAL" if alerta.real else "FALSA"
         estado = "Atendida" if dato["atendida"] else "Ignorada"
         
         color = self.VERDE if "CORRECTO" in dato["resultado"] else self.ROJO
         
-        texto = f"[{tipo}] {estado} - {alerta['dispositivo']}: {dato['resultado']}"
+        texto = f"[{tipo}] {estado} - {alerta.dispositivo}: {dato['resultado']}"
         self.dibujar_texto(texto, 30, y, self.font_pequeña, color)
         y += 25
     
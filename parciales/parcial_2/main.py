@@ -65,7 +65,7 @@ while running:
         color = ROJO if i == alerta_seleccionada else AZUL
         pygame.draw.rect(screen, color, (20, y, 760, 40), 2)
         dibujar_texto(
-            f"{alerta['dispositivo']} - {alerta['mensaje']}, (Sev: {alerta['severidad']})",
+            f"{alerta.dispositivo} - {alerta.mensaje}, (Sev: {alerta.severidad})",
             30,
             y + 10,
         )
@@ -88,7 +88,7 @@ while running:
 
             elif event.key == pygame.K_r and alerta_seleccionada is not None:
                 alerta = alertas[alerta_seleccionada]
-                if alerta["real"]:
+                if alerta.real:
                     puntaje += 10
                     mensaje = "Correcto (+10)"
                 else:
@@ -0,0 +1,73 @@
+import copy
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from devices import (TIPOS_DISPOSITIVO, Alerta, Camera, MotionSensor, NoiseSensor, PowerSensor,
+                     TemperatureSensor, alertas_del_lote, generar_alertas_lote)
+
+CLASES = (MotionSensor, TemperatureSensor, PowerSensor, NoiseSensor, Camera)
+
+
+def _dispositivos(por_clase=2):
+    return [clase(f"{clase.__name__}-{i}") for i in range(por_clase) for clase in CLASES]
+
+
+@pytest.mark.parametrize("clase", CLASES)
+def test_generar_lote_mismas_tasas_que_generar_alerta(clase):
+    dispositivo = clase("d")
+    turnos = 20_000
+    random.seed(12)
+    emitidas = [a for a in (dispositivo.generar_alerta() for _ in range(turnos)) if a is not None]
+    emite, _, severidad, real = dispositivo.generar_lote(np.random.default_rng(12), turnos)
+
+    # ~5 desvíos estándar de una proporción con 20 000 turnos
+    assert emite.mean() == pytest.approx(len(emitidas) / turnos, abs=0.02)
+    assert real[emite].mean() == pytest.approx(np.mean([a.real for a in emitidas]), abs=0.02)
+    assert severidad[emite].mean() == pytest.approx(np.mean([a.severidad for a in emitidas]), abs=0.1)
+
+
+def test_generar_alertas_lote_ordenado_y_reproducible():
+    dispositivos = _dispositivos()
+    alertas = generar_alertas_lote(dispositivos, 500, semilla=1)
+    claves = alertas["tick"].astype(np.int64) * len(dispositivos) + alertas["dispositivo"]
+
+    assert (np.diff(claves) > 0).all()  # por turno y, dentro del turno, por dispositivo
+    tipos = [TIPOS_DISPOSITIVO[t] for t in alertas["tipo"].tolist()]
+    assert tipos == [dispositivos[i].tipo for i in alertas["dispositivo"].tolist()]
+    assert np.array_equal(alertas, generar_alertas_lote(dispositivos, 500, semilla=1))
+
+    convertidas = alertas_del_lote(dispositivos, alertas[:20])
+    assert [a.dispositivo for a in convertidas] == \
+        [dispositivos[i].nombre for i in alertas["dispositivo"][:20].tolist()]
+
+
+def test_mas_de_65535_dispositivos():
+    dispositivos = [MotionSensor(f"m{i}") for i in range(70_000)]
+    alertas = generar_alertas_lote(dispositivos, 1, semilla=0)
+
+    # MotionSensor emite en todos los turnos: una alerta por dispositivo
+    assert alertas["dispositivo"].tolist() == list(range(70_000))
+
+
+def test_alerta_es_un_valor_inmutable_y_serializable():
+    sensor = TemperatureSensor("Sala")
+    alerta = Alerta(sensor, 41.5, 3, True)
+    assert (alerta["dispositivo"], alerta["severidad"], alerta["real"]) == ("Sala", 3, True)
+    assert alerta["mensaje"] == alerta.mensaje == sensor.mensaje(41.5)
+    with pytest.raises(KeyError):
+        alerta["fiabilidad"]
+    with pytest.raises(AttributeError):
+        alerta.lectura = 0
+
+    for copia in (pickle.loads(pickle.dumps(alerta)), copy.copy(alerta), copy.deepcopy(alerta)):
+        assert copia == alerta and hash(copia) == hash(alerta)
+        assert (copia.severidad, copia.real, copia.mensaje) == (3, True, alerta.mensaje)
+
+    # Igualdad por valor: otro dispositivo con el mismo nombre da alertas iguales
+    assert Alerta(TemperatureSensor("Sala"), 41.5, 3, True) == alerta
+    assert len({alerta, Alerta(sensor, 41.5, 3, False), Alerta(sensor, 41.5, 2, True),
+                Alerta(sensor, 40.0, 3, True), Alerta(sensor, 41.5, 3, True)}) == 4
+    assert alerta != {"dispositivo": "Sala"}
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from devices import TIPOS_DISPOSITIVO, generar_alertas_lote
+from evaluacion_politicas import (AtenderTodas, PoliticaPorTipo, PoliticaSeveridad,
+                                  dispositivos_por_defecto, estadisticas, evaluar_politicas)
+
+
+def test_misma_semilla_mismo_resultado_con_cualquier_cantidad_de_procesos():
+    resultados = [evaluar_politicas(corridas=6, turnos=300, semilla=3, max_workers=trabajadores)
+                  for trabajadores in (1, 3, 3)]
+    assert resultados[0] == resultados[1] == resultados[2]
+    assert evaluar_politicas(corridas=6, turnos=300, semilla=4, max_workers=2) != resultados[0]
+
+    # Todas las políticas de una corrida ven las mismas alertas
+    for datos in resultados[0].values():
+        assert datos["corridas"] == 6
+        assert datos["minimo"] <= datos["media"] <= datos["maximo"]
+
+
+def test_politicas_sobre_las_alertas():
+    alertas = generar_alertas_lote(dispositivos_por_defecto(), 2000, semilla=5)
+    assert AtenderTodas()(alertas).all()
+    assert np.array_equal(PoliticaSeveridad(3)(alertas), alertas["severidad"] >= 3)
+
+    politica = PoliticaPorTipo({"Movimiento": 1, "Cámara": 4}, por_defecto=None)
+    tipos = [TIPOS_DISPOSITIVO[t] for t in alertas["tipo"].tolist()]
+    esperado = [(tipo == "Movimiento" and severidad >= 1) or (tipo == "Cámara" and severidad >= 4)
+                for tipo, severidad in zip(tipos, alertas["severidad"].tolist())]
+    assert politica(alertas).tolist() == esperado
+    assert PoliticaPorTipo({}, por_defecto=2)(alertas).tolist() == \
+        (alertas["severidad"] >= 2).tolist()
+
+
+def test_estadisticas_del_puntaje():
+    datos = estadisticas([10, 12, 14])
+    assert (datos["media"], datos["varianza"], datos["minimo"], datos["maximo"]) == (12.0, 4.0, 10.0, 14.0)
+    inferior, superior = datos["ic95"]
+    assert inferior < 12 < superior and 12 - inferior == pytest.approx(superior - 12)
+    assert estadisticas([5])["ic95"] == (5.0, 5.0)
@@ -0,0 +1,96 @@
+import io
+
+import numpy as np
+import pytest
+
+from devices import Camera, MotionSensor, NoiseSensor, PowerSensor, TemperatureSensor, \
+    alertas_del_lote, generar_alertas_lote
+from evaluacion_politicas import SistemaPuntuacion
+
+CLASES = (MotionSensor, TemperatureSensor, PowerSensor, NoiseSensor, Camera)
+
+
+def _dispositivos():
+    return [clase(f"{clase.__name__}-{i}") for i in range(2) for clase in CLASES]
+
+
+def test_procesar_lote_igual_que_procesar_turno():
+    dispositivos = _dispositivos()
+    turnos = 200
+    alertas = generar_alertas_lote(dispositivos, turnos, semilla=4)
+    atendida = np.random.default_rng(9).random(len(alertas)) < 0.5
+
+    escalar = SistemaPuntuacion(turnos_con_detalle=None)
+    lista = alertas_del_lote(dispositivos, alertas)
+    for turno in range(turnos):
+        indices = np.flatnonzero(alertas["tick"] == turno).tolist()
+        seleccionadas = {i for i, j in enumerate(indices) if atendida[j]}
+        escalar.procesar_turno([lista[j] for j in indices], seleccionadas)
+
+    lote = SistemaPuntuacion()
+    _, puntos_por_turno = lote.procesar_lote(alertas["real"], atendida, turno=alertas["tick"],
+                                             cantidad_turnos=turnos)
+
+    assert lote.cantidad_turnos == escalar.cantidad_turnos == turnos
+    assert lote.obtener_puntaje_total() == escalar.obtener_puntaje_total()
+    assert puntos_por_turno.tolist() == [escalar.puntos_del_turno(t) for t in range(1, turnos + 1)]
+    assert lote.puntos_entre(50, 150) == escalar.puntos_entre(50, 150)
+    assert lote.detalle_turno(turnos) is None
+    assert len(escalar.detalle_turno(turnos)) == int((alertas["tick"] == turnos - 1).sum())
+
+
+def test_procesar_lote_por_filas():
+    real = np.array([[True, False, True], [False, False, True]])
+    atendida = np.array([[True, True, False], [False, True, True]])
+    sistema = SistemaPuntuacion(puntos_iniciales=0)
+    deltas, puntos_por_turno = sistema.procesar_lote(real, atendida)
+
+    assert deltas.tolist() == [[2, -1, -2], [0, -1, 2]]
+    assert puntos_por_turno.tolist() == [-1, 1]
+    assert sistema.obtener_puntaje_total() == 0
+
+
+def test_detalle_solo_de_los_ultimos_turnos():
+    sistema = SistemaPuntuacion(turnos_con_detalle=2)
+    alerta = {"real": True}
+    for _ in range(3):
+        sistema.procesar_turno([alerta], {0})
+    sistema.procesar_lote([True], [False])
+
+    assert sistema.detalle_turno(2) is None
+    assert sistema.detalle_turno(3)[0]["delta"] == 2
+    assert sistema.detalle_turno(4) is None
+    with pytest.raises(IndexError):
+        sistema.detalle_turno(5)
+    with pytest.raises(ValueError):
+        sistema.puntos_entre(3, 2)
+    with pytest.raises(ValueError):
+        SistemaPuntuacion(turnos_con_detalle=-1)
+
+
+def test_sumas_prefijas_igual_que_sumar_turnos():
+    generador = np.random.default_rng(6)
+    sistema = SistemaPuntuacion(puntos_iniciales=15, turnos_con_detalle=0)
+    puntos = []
+    for _ in range(30):
+        filas = int(generador.integers(1, 20))
+        real = generador.random((filas, 4)) < 0.5
+        atendida = generador.random((filas, 4)) < 0.5
+        puntos.extend(sistema.procesar_lote(real, atendida)[1].tolist())
+
+    acumulados = np.cumsum(puntos).tolist()
+    assert sistema.cantidad_turnos == len(puntos)
+    assert sistema.obtener_puntaje_total() == 15 + acumulados[-1]
+    for desde, hasta in generador.integers(1, len(puntos) + 1, size=(50, 2)).tolist():
+        desde, hasta = min(desde, hasta), max(desde, hasta)
+        assert sistema.puntos_entre(desde, hasta) == sum(puntos[desde - 1:hasta])
+        assert sistema.puntos_despues_de(hasta) == 15 + acumulados[hasta - 1]
+
+    historial = sistema.historial
+    assert historial[-1] == {"alertas": None, "puntos_turno": puntos[-1],
+                             "puntos_totales": sistema.obtener_puntaje_total()}
+    salida = io.StringIO()
+    sistema.escribir_resumen(salida)
+    assert salida.getvalue() == sistema.resumen() + "\n"
+    assert sistema.resumen(pagina=2, por_pagina=5).splitlines()[1] == \
+        f"Turno 6: +{puntos[5]} puntos (Total: {15 + acumulados[5]})"
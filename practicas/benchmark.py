@@ -0,0 +1,173 @@
+"""
+Benchmark reproducible de simulacion_iot.py: lectura dispositivo por
+dispositivo vs. el motor de muestreo por lotes
+
+main.py (la versión didáctica) ya usa el mismo historial, estadísticas,
+reloj y registro que simulacion_iot.py, así que compararlos no mide ninguna
+de esas optimizaciones y no se incluye. Se comparan los tres caminos de
+lectura de la flota optimizada:
+- "lectura": leer_datos() de cada dispositivo en cada tick
+- "lotes": MotorMuestreo.muestrear(), un tick por llamada
+- "bloque": MotorMuestreo.muestrear_bloque(), todos los ticks de una vez
+
+Para cada tamaño de flota y camino mide:
+- tiempo de construcción de los dispositivos
+- lecturas por segundo
+- memoria asignada (tracemalloc) tras construir y tras los ticks
+- tamaño por instancia (objeto + __dict__ si existe)
+- tiempo de generar el reporte (obtener_informacion + estadísticas)
+
+Uso:
+    python benchmark.py --tamanos 1000 10000 100000 --ticks 10 --salida resultados.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import simulacion_iot as optimizado
+
+
+def crear_flota(modulo, cantidad):
+    """Flota mixta (1/3 de cada clase); modulo es el que define las clases de dispositivos"""
+    dispositivos = []
+    for i in range(cantidad):
+        tipo = i % 3
+        if tipo == 0:
+            dispositivos.append(
+                modulo.SensorTemperatura(f"TEMP{i}", f"Sensor {i}", f"Zona {i % 50}", -10, 50)
+            )
+        elif tipo == 1:
+            dispositivos.append(
+                modulo.SensorMovimiento(f"MOV{i}", f"Detector {i}", f"Zona {i % 50}", "media")
+            )
+        else:
+            dispositivos.append(
+                modulo.CamaraSeguridad(f"CAM{i}", f"Cámara {i}", f"Zona {i % 50}", "1080p")
+            )
+    return dispositivos
+
+
+def tamano_instancia(dispositivo):
+    tamano = sys.getsizeof(dispositivo)
+    if hasattr(dispositivo, "__dict__"):
+        tamano += sys.getsizeof(dispositivo.__dict__)
+    return tamano
+
+
+def ejecutar_ticks(dispositivos, ticks):
+    for _ in range(ticks):
+        for dispositivo in dispositivos:
+            dispositivo.leer_datos()
+
+
+def ejecutar_ticks_lotes(dispositivos, ticks):
+    motor = optimizado.MotorMuestreo(dispositivos)
+    for _ in range(ticks):
+        motor.muestrear()
+
+
+def ejecutar_ticks_bloque(dispositivos, ticks, intervalo_ns=1_000_000_000):
+    # Los ticks de una vez, separados por intervalo_ns (1 s simulado)
+    motor = optimizado.MotorMuestreo(dispositivos)
+    inicio = optimizado.RELOJ.ahora()
+    motor.muestrear_bloque([inicio + t * intervalo_ns for t in range(ticks)])
+
+
+MODOS = {"lectura": ejecutar_ticks, "lotes": ejecutar_ticks_lotes, "bloque": ejecutar_ticks_bloque}
+
+
+def generar_reporte(dispositivos):
+    return [
+        (d.obtener_informacion(), d.obtener_estadisticas()) for d in dispositivos
+    ]
+
+
+def medir(modulo, cantidad, ticks, semilla, modo="lectura"):
+    """Mide un camino de lectura (clave de MODOS) con un tamaño de flota dado"""
+    resultado = {"dispositivos": cantidad, "ticks": ticks}
+    correr_ticks = MODOS[modo]
+
+    # Pasada de tiempos (sin tracemalloc, que enlentece las asignaciones)
+    random.seed(semilla)
+    gc.collect()
+    inicio = time.perf_counter()
+    dispositivos = crear_flota(modulo, cantidad)
+    resultado["construccion_s"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    correr_ticks(dispositivos, ticks)
+    duracion = time.perf_counter() - inicio
+    resultado["ticks_s"] = duracion
+    resultado["lecturas_por_segundo"] = cantidad * ticks / duracion if duracion else None
+
+    inicio = time.perf_counter()
+    generar_reporte(dispositivos)
+    resultado["reporte_s"] = time.perf_counter() - inicio
+
+    resultado["bytes_por_instancia"] = tamano_instancia(dispositivos[0])
+    del dispositivos
+    gc.collect()
+
+    # Pasada de memoria
+    random.seed(semilla)
+    tracemalloc.start()
+    dispositivos = crear_flota(modulo, cantidad)
+    construidos, _ = tracemalloc.get_traced_memory()
+    correr_ticks(dispositivos, ticks)
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultado["memoria_construccion_bytes"] = construidos
+    resultado["memoria_bytes_por_dispositivo"] = construidos / cantidad
+    resultado["memoria_tras_ticks_bytes"] = actual
+    resultado["memoria_pico_bytes"] = pico
+    resultado["memoria_bytes_por_lectura"] = (
+        (actual - construidos) / (cantidad * ticks) if ticks else None
+    )
+    del dispositivos
+    gc.collect()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="benchmark_resultados.json")
+    args = parser.parse_args()
+
+    resultados = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+        "resultados": [],
+    }
+
+    for cantidad in args.tamanos:
+        for modo in MODOS:
+            fila = {"modo": modo}
+            fila.update(medir(optimizado, cantidad, args.ticks, args.semilla, modo))
+            resultados["resultados"].append(fila)
+            print(
+                f"{modo:>7} | {cantidad:>7} disp. | "
+                f"construcción {fila['construccion_s']:.3f}s | "
+                f"{fila['lecturas_por_segundo']:,.0f} lecturas/s | "
+                f"reporte {fila['reporte_s']:.3f}s | "
+                f"{fila['memoria_bytes_por_dispositivo']:.0f} B/disp."
+            )
+
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Aplicación de funciones sobre listas de dispositivos en serie o en paralelo
+
+executor:
+- "serial": un dispositivo tras otro en el proceso actual
+- "thread": bloques de dispositivos en un ThreadPoolExecutor (E/S, esperas)
+- "process": bloques de dispositivos en un ProcessPoolExecutor (CPU); cada
+  bloque vuelve con el estado actualizado de sus dispositivos, que se copia
+  sobre los objetos originales
+
+Los resultados conservan el orden de entrada. Si la función falla para un
+dispositivo, en su posición se devuelve un ErrorDispositivo y el resto de la
+lista se sigue procesando.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
+EJECUTORES = ("serial", "thread", "process")
+
+
+class ErrorDispositivo:
+    """Resultado de un dispositivo cuya función de procesamiento falló"""
+
+    __slots__ = ("indice", "dispositivo", "excepcion")
+
+    def __init__(self, indice, dispositivo, excepcion):
+        self.indice = indice
+        self.dispositivo = dispositivo  # nombre del dispositivo
+        self.excepcion = excepcion
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return (
+            f"ErrorDispositivo({self.indice}, {self.dispositivo!r}, "
+            f"{type(self.excepcion).__name__}: {self.excepcion})"
+        )
+
+
+def _procesar_bloque(funcion, bloque, inicio):
+    resultados = []
+    for i, dispositivo in enumerate(bloque, start=inicio):
+        try:
+            resultados.append(funcion(dispositivo))
+        except Exception as e:
+            resultados.append(
+                ErrorDispositivo(i, getattr(dispositivo, "nombre", None), e)
+            )
+    return resultados
+
+
+def _procesar_bloque_en_proceso(funcion, bloque, inicio):
+    # Los dispositivos viajan como copias: se devuelven para actualizar el padre
+    return _procesar_bloque(funcion, bloque, inicio), bloque
+
+
+# Atributos que no se copian desde el proceso hijo
+_NO_COPIAR = ("__dict__", "__weakref__", "_registro")
+
+
+def _copiar_estado(destino, origen):
+    """Copia los atributos de origen en destino (con __dict__ o __slots__)"""
+    if hasattr(origen, "__dict__"):
+        for nombre, valor in vars(origen).items():
+            if nombre not in _NO_COPIAR:
+                setattr(destino, nombre, valor)
+    for clase in type(origen).__mro__:
+        slots = getattr(clase, "__slots__", ())
+        for nombre in (slots,) if isinstance(slots, str) else slots:
+            if nombre not in _NO_COPIAR and hasattr(origen, nombre):
+                setattr(destino, nombre, getattr(origen, nombre))
+
+    # El registro del padre no vio los cambios hechos en el hijo
+    registro = getattr(destino, "_registro", None)
+    if registro is not None:
+        registro.reindexar(destino)
+
+
+def procesar_dispositivos(lista_dispositivos, funcion_procesamiento,
+                          executor="serial", tamano_bloque=None, max_workers=None):
+    """
+    FUNCIÓN QUE RECIBE OTRA FUNCIÓN COMO PARÁMETRO
+    Aplica funcion_procesamiento a cada dispositivo y retorna los resultados
+    en el mismo orden que lista_dispositivos.
+
+    Con executor="process" la función debe poder serializarse con pickle
+    (definida a nivel de módulo, no lambda).
+    """
+    if executor not in EJECUTORES:
+        raise ValueError(f"executor debe ser uno de {EJECUTORES}, no {executor!r}")
+
+    dispositivos = list(lista_dispositivos)
+    if executor == "serial" or not dispositivos:
+        return _procesar_bloque(funcion_procesamiento, dispositivos, 0)
+
+    trabajadores = max_workers or os.cpu_count() or 1
+    if tamano_bloque is None:
+        # ~4 bloques por trabajador para repartir la carga sin saturar de tareas
+        tamano_bloque = math.ceil(len(dispositivos) / (trabajadores * 4))
+    tamano_bloque = max(1, int(tamano_bloque))
+    inicios = range(0, len(dispositivos), tamano_bloque)
+    bloques = [dispositivos[i:i + tamano_bloque] for i in inicios]
+
+    resultados = []
+    if executor == "thread":
+        with ThreadPoolExecutor(trabajadores) as pool:
+            for parte in pool.map(_procesar_bloque, repeat(funcion_procesamiento),
+                                  bloques, inicios):
+                resultados.extend(parte)
+        return resultados
+
+    # `random` ya se vuelve a sembrar en cada proceso hijo (al hacer fork o al importarse)
+    with ProcessPoolExecutor(trabajadores) as pool:
+        partes = pool.map(_procesar_bloque_en_proceso, repeat(funcion_procesamiento),
+                          bloques, inicios)
+        for bloque, (parte, actualizados) in zip(bloques, partes):
+            resultados.extend(parte)
+            for original, copia in zip(bloque, actualizados):
+                _copiar_estado(original, copia)
+    return resultados
@@ -0,0 +1,311 @@
+"""
+Estadísticas incrementales (streaming) por dispositivo
+
+Cada lectura actualiza los agregados en O(1), sin recorrer el historial:
+- cantidad, mínimo, máximo
+- media y varianza con el algoritmo de Welford
+- percentiles aproximados p50/p95/p99 con el algoritmo P² (Jain & Chlamtac),
+  que usa 5 marcadores por percentil en lugar de guardar los valores
+
+Los estimadores P² se actualizan en bloques: las lecturas se acumulan (hasta
+LOTE_PERCENTILES) y se procesan juntas al llenarse el bloque o al consultar
+un percentil, con el mismo resultado que una por una. Los agregar_lote
+reciben todas las lecturas de un dispositivo de una vez (arrays de NumPy), y
+los agregar_columnas las de muchos dispositivos de la misma clase (una
+columna por dispositivo), con los agregados de todas las columnas calculados
+en una sola operación de NumPy.
+"""
+
+import math
+
+import numpy as np
+
+# Lecturas que esperan antes de actualizar los estimadores P²
+LOTE_PERCENTILES = 256
+
+
+class CuantilP2:
+    """Estimador P² de un percentil: memoria y costo O(1) por lectura"""
+
+    __slots__ = ("p", "_q", "_n", "_extra", "_base", "_incrementos")
+
+    def __init__(self, p):
+        self.p = p
+        self._q = []  # alturas de los 5 marcadores (o primeras lecturas)
+        self._n = [0, 1, 2, 3, 4]  # posiciones reales de los marcadores
+        self._extra = 0  # lecturas recibidas después de las 5 iniciales
+        # Posición deseada del marcador i: base[i] + extra * incrementos[i]
+        self._base = (0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0)
+        self._incrementos = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def agregar(self, x):
+        self.agregar_lote((x,))
+
+    def agregar_lote(self, valores):
+        """Procesa las lecturas en orden (mismo resultado que agregar una por una)"""
+        q = self._q
+        valores = iter(valores)
+        while len(q) < 5:
+            x = next(valores, None)
+            if x is None:
+                return
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+
+        # Marcadores en variables locales (el bucle corre una vez por lectura)
+        q0, q1, q2, q3, q4 = q
+        n0, n1, n2, n3, n4 = self._n
+        _, b1, b2, b3, _ = self._base
+        _, c1, c2, c3, _ = self._incrementos
+        extra = self._extra
+        for x in valores:
+            # Celda de x: los marcadores a su derecha avanzan una posición
+            if x < q0:
+                q0 = x
+                n1 += 1
+                n2 += 1
+                n3 += 1
+            elif x < q1:
+                n1 += 1
+                n2 += 1
+                n3 += 1
+            elif x < q2:
+                n2 += 1
+                n3 += 1
+            elif x < q3:
+                n3 += 1
+            elif x > q4:
+                q4 = x
+            n4 += 1
+            extra += 1
+
+            # Ajustar los marcadores centrales hacia su posición deseada
+            d = b1 + extra * c1 - n1
+            if (d >= 1 and n2 - n1 > 1) or (d <= -1 and n0 - n1 < -1):
+                d = 1 if d > 0 else -1
+                candidato = q1 + d / (n2 - n0) * (
+                    (n1 - n0 + d) * (q2 - q1) / (n2 - n1)
+                    + (n2 - n1 - d) * (q1 - q0) / (n1 - n0)
+                )
+                if not q0 < candidato < q2:
+                    # La parábola se sale del intervalo: interpolación lineal
+                    if d > 0:
+                        candidato = q1 + (q2 - q1) / (n2 - n1)
+                    else:
+                        candidato = q1 - (q0 - q1) / (n0 - n1)
+                q1 = candidato
+                n1 += d
+            d = b2 + extra * c2 - n2
+            if (d >= 1 and n3 - n2 > 1) or (d <= -1 and n1 - n2 < -1):
+                d = 1 if d > 0 else -1
+                candidato = q2 + d / (n3 - n1) * (
+                    (n2 - n1 + d) * (q3 - q2) / (n3 - n2)
+                    + (n3 - n2 - d) * (q2 - q1) / (n2 - n1)
+                )
+                if not q1 < candidato < q3:
+                    # La parábola se sale del intervalo: interpolación lineal
+                    if d > 0:
+                        candidato = q2 + (q3 - q2) / (n3 - n2)
+                    else:
+                        candidato = q2 - (q1 - q2) / (n1 - n2)
+                q2 = candidato
+                n2 += d
+            d = b3 + extra * c3 - n3
+            if (d >= 1 and n4 - n3 > 1) or (d <= -1 and n2 - n3 < -1):
+                d = 1 if d > 0 else -1
+                candidato = q3 + d / (n4 - n2) * (
+                    (n3 - n2 + d) * (q4 - q3) / (n4 - n3)
+                    + (n4 - n3 - d) * (q3 - q2) / (n3 - n2)
+                )
+                if not q2 < candidato < q4:
+                    # La parábola se sale del intervalo: interpolación lineal
+                    if d > 0:
+                        candidato = q3 + (q4 - q3) / (n4 - n3)
+                    else:
+                        candidato = q3 - (q2 - q3) / (n2 - n3)
+                q3 = candidato
+                n3 += d
+        q[:] = (q0, q1, q2, q3, q4)
+        self._n = [n0, n1, n2, n3, n4]
+        self._extra = extra
+
+    def valor(self):
+        q = self._q
+        if not q:
+            return None
+        if len(q) < 5:
+            # Pocas lecturas: percentil exacto sobre los valores guardados
+            ordenados = sorted(q)
+            return ordenados[min(len(q) - 1, int(round(self.p * (len(q) - 1))))]
+        return q[2]
+
+
+class EstadisticasStreaming:
+    """Agregados numéricos de un dispositivo (temperatura, calidad de imagen)"""
+
+    __slots__ = ("cantidad", "minimo", "maximo", "media", "_m2", "_percentiles", "_pendientes")
+
+    PERCENTILES = (0.50, 0.95, 0.99)
+
+    def __init__(self):
+        self.cantidad = 0
+        self.minimo = None
+        self.maximo = None
+        self.media = 0.0
+        self._m2 = 0.0  # suma de cuadrados de las diferencias (Welford)
+        self._percentiles = [CuantilP2(p) for p in self.PERCENTILES]
+        self._pendientes = []  # lecturas que aún no pasaron por los estimadores P²
+
+    def agregar(self, x):
+        self.cantidad += 1
+        if self.cantidad == 1:
+            self.minimo = self.maximo = x
+        elif x < self.minimo:
+            self.minimo = x
+        elif x > self.maximo:
+            self.maximo = x
+
+        delta = x - self.media
+        self.media += delta / self.cantidad
+        self._m2 += delta * (x - self.media)
+
+        pendientes = self._pendientes
+        pendientes.append(x)
+        if len(pendientes) >= LOTE_PERCENTILES:
+            self._actualizar_percentiles()
+
+    def agregar_lote(self, valores):
+        """
+        Agrega un bloque de lecturas (array de NumPy o secuencia): mínimo,
+        máximo, media y varianza con NumPy (combinación de Chan et al.) y los
+        percentiles en un solo recorrido por estimador.
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        cantidad = len(valores)
+        if not cantidad:
+            return
+        media = valores.mean().item()
+        self._combinar(cantidad, valores.min().item(), valores.max().item(), media,
+                       float(((valores - media) ** 2).sum()))
+        self._agregar_pendientes(valores.tolist())
+
+    @classmethod
+    def agregar_columnas(cls, estadisticas, valores):
+        """
+        Igual que llamar estadisticas[j].agregar_lote(valores[:, j]) para cada
+        j, con una matriz (lecturas, dispositivos): los agregados de todas las
+        columnas salen de una sola pasada de NumPy.
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        cantidad = len(valores)
+        if not cantidad:
+            return
+        medias = valores.mean(axis=0)
+        m2 = ((valores - medias) ** 2).sum(axis=0)
+        for e, minimo, maximo, media, m2_columna, columna in zip(
+                estadisticas, valores.min(axis=0).tolist(), valores.max(axis=0).tolist(),
+                medias.tolist(), m2.tolist(), valores.T.tolist()):
+            e._combinar(cantidad, minimo, maximo, media, m2_columna)
+            e._agregar_pendientes(columna)
+
+    def _combinar(self, cantidad, minimo, maximo, media, m2):
+        """Suma los agregados de otras `cantidad` lecturas (Chan et al.)"""
+        if not self.cantidad:
+            self.minimo, self.maximo = minimo, maximo
+        else:
+            self.minimo = min(self.minimo, minimo)
+            self.maximo = max(self.maximo, maximo)
+        total = self.cantidad + cantidad
+        delta = media - self.media
+        self.media += delta * cantidad / total
+        self._m2 += m2 + delta * delta * self.cantidad * cantidad / total
+        self.cantidad = total
+
+    def _agregar_pendientes(self, valores):
+        pendientes = self._pendientes
+        pendientes.extend(valores)
+        if len(pendientes) >= LOTE_PERCENTILES:
+            self._actualizar_percentiles()
+
+    def _actualizar_percentiles(self):
+        pendientes = self._pendientes
+        if pendientes:
+            for cuantil in self._percentiles:
+                cuantil.agregar_lote(pendientes)
+            pendientes.clear()
+
+    def varianza(self):
+        """Varianza muestral (n - 1)"""
+        return self._m2 / (self.cantidad - 1) if self.cantidad > 1 else 0.0
+
+    def percentil(self, p):
+        self._actualizar_percentiles()
+        for cuantil in self._percentiles:
+            if cuantil.p == p:
+                return cuantil.valor()
+        raise ValueError(f"Percentil no calculado: {p}")
+
+    def resumen(self):
+        varianza = self.varianza()
+        resumen = {
+            "cantidad": self.cantidad,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "media": self.media if self.cantidad else None,
+            "varianza": varianza,
+            "desviacion": math.sqrt(varianza),
+        }
+        self._actualizar_percentiles()
+        for cuantil in self._percentiles:
+            resumen[f"p{round(cuantil.p * 100)}"] = cuantil.valor()
+        return resumen
+
+    @classmethod
+    def combinar(cls, estadisticas):
+        """
+        Combina los agregados de varios dispositivos (Chan et al.) en O(n
+        dispositivos). Los percentiles no se combinan.
+        """
+        total = cls()
+        for e in estadisticas:
+            if e.cantidad:
+                total._combinar(e.cantidad, e.minimo, e.maximo, e.media, e._m2)
+        return total
+
+
+class ContadorDetecciones:
+    """Tasa de detección de un sensor de movimiento"""
+
+    __slots__ = ("cantidad", "detecciones")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.detecciones = 0
+
+    def agregar(self, detectado):
+        self.cantidad += 1
+        if detectado:
+            self.detecciones += 1
+
+    def agregar_lote(self, detectados):
+        self.cantidad += len(detectados)
+        self.detecciones += int(np.count_nonzero(detectados))
+
+    @classmethod
+    def agregar_columnas(cls, contadores, detectados):
+        """Igual que EstadisticasStreaming.agregar_columnas (una columna por sensor)"""
+        cantidad = len(detectados)
+        for contador, detecciones in zip(contadores, np.count_nonzero(detectados, axis=0).tolist()):
+            contador.cantidad += cantidad
+            contador.detecciones += detecciones
+
+    def tasa(self):
+        return self.detecciones / self.cantidad if self.cantidad else 0.0
+
+    def resumen(self):
+        return {
+            "cantidad": self.cantidad,
+            "detecciones": self.detecciones,
+            "tasa_deteccion": self.tasa(),
+        }
@@ -0,0 +1,306 @@
+"""
+Historial columnar de lecturas para los dispositivos IoT
+
+En lugar de una lista de tuplas (una tupla + un string de hora por lectura),
+cada dispositivo guarda sus lecturas en dos columnas tipadas de `array`:
+- valores: un número por lectura (float, entero o bool como 0/1)
+- marcas: nanosegundos desde epoch (int64), conserva fecha y hora
+
+Las columnas forman un buffer circular: con una política de retención
+(máximo de lecturas y/o edad máxima) el buffer deja de crecer al llegar a su
+tope y las lecturas nuevas sobrescriben a las más antiguas, sin asignar
+memoria nueva.
+
+agregar_lote escribe un bloque de lecturas de una vez, asignando segmentos
+completos (slices) sobre vistas NumPy de las columnas.
+"""
+
+import time
+from array import array
+
+import numpy as np
+
+
+class HistorialColumnar:
+    __slots__ = (
+        "_tipo",
+        "_valores",
+        "_marcas",
+        "_inicio",
+        "_cantidad",
+        "_total",
+        "max_lecturas",
+        "_max_edad_ns",
+    )
+
+    CAPACIDAD_INICIAL = 16
+
+    def __init__(self, tipo_valor="d", capacidad=CAPACIDAD_INICIAL,
+                 max_lecturas=None, max_edad=None):
+        """
+        tipo_valor es el typecode de `array` para la columna de valores:
+        "d" (float), "B" (entero 0-255, p. ej. bool o porcentaje), etc.
+        Con "O" la columna es una lista de objetos Python (p. ej. dicts).
+        """
+        self._tipo = tipo_valor
+        self._inicio = 0  # posición física de la lectura más antigua
+        self._cantidad = 0  # lecturas retenidas
+        self._total = 0  # lecturas recibidas en toda la vida del dispositivo
+        self.max_lecturas = None
+        self._max_edad_ns = None
+        capacidad = max(1, int(capacidad))
+        self._valores = self._nueva_columna(tipo_valor, capacidad)
+        self._marcas = self._nueva_columna("q", capacidad)
+        self.configurar_retencion(max_lecturas, max_edad)
+
+    @staticmethod
+    def _nueva_columna(tipo, capacidad):
+        if tipo == "O":
+            return [None] * capacidad
+        return array(tipo, bytes(array(tipo).itemsize * capacidad))
+
+    def __len__(self):
+        return self._cantidad
+
+    @property
+    def tipo_valor(self):
+        """Typecode de la columna de valores ("O" si guarda objetos)"""
+        return self._tipo
+
+    def total_lecturas(self):
+        """Lecturas recibidas desde la creación (incluye las ya descartadas)"""
+        return self._total
+
+    def capacidad(self):
+        return len(self._valores)
+
+    # ---------- Retención ----------
+    def configurar_retencion(self, max_lecturas=None, max_edad=None):
+        """
+        Limita el historial a las últimas max_lecturas y/o a las lecturas con
+        menos de max_edad segundos. None desactiva cada límite.
+        """
+        if max_lecturas is not None and max_lecturas < 1:
+            raise ValueError("max_lecturas debe ser mayor a 0")
+        if max_edad is not None and max_edad <= 0:
+            raise ValueError("max_edad debe ser mayor a 0")
+
+        self.max_lecturas = max_lecturas
+        self._max_edad_ns = None if max_edad is None else int(max_edad * 1e9)
+
+        if max_lecturas is not None and self._cantidad > max_lecturas:
+            self._descartar(self._cantidad - max_lecturas)
+        if max_lecturas is not None and self.capacidad() > max_lecturas:
+            self._reubicar(max_lecturas)
+        if self._max_edad_ns is not None and self._cantidad:
+            self.purgar(self[-1][1])
+
+    def purgar(self, ahora_ns=None):
+        """Descarta las lecturas más viejas que max_edad (respecto de ahora_ns)"""
+        if self._max_edad_ns is None:
+            return
+        if ahora_ns is None:
+            ahora_ns = time.time_ns()
+        limite = ahora_ns - self._max_edad_ns
+        marcas = self._marcas
+        capacidad = len(marcas)
+        vencidas = 0
+        i = self._inicio
+        while vencidas < self._cantidad and marcas[i] < limite:
+            vencidas += 1
+            i += 1
+            if i == capacidad:
+                i = 0
+        if vencidas:
+            self._descartar(vencidas)
+
+    def _descartar(self, cantidad):
+        """Descarta las `cantidad` lecturas más antiguas"""
+        if self._tipo == "O":
+            # Liberar las referencias a los objetos descartados
+            for a, b in self._segmentos(0, cantidad):
+                self._valores[a:b] = [None] * (b - a)
+        self._inicio = (self._inicio + cantidad) % len(self._valores)
+        self._cantidad -= cantidad
+
+    def _reubicar(self, capacidad):
+        """Copia las lecturas retenidas (en orden) a columnas nuevas desde 0"""
+        valores = self._nueva_columna(self._tipo, capacidad)
+        marcas = self._nueva_columna("q", capacidad)
+        destino = 0
+        for a, b in self._segmentos(0, self._cantidad):
+            n = b - a
+            valores[destino:destino + n] = self._valores[a:b]
+            marcas[destino:destino + n] = self._marcas[a:b]
+            destino += n
+        # Columnas nuevas: las vistas (memoryview) ya entregadas siguen válidas
+        self._valores = valores
+        self._marcas = marcas
+        self._inicio = 0
+
+    def agregar(self, valor, marca_ns):
+        """Agrega una lectura (valor, nanosegundos desde epoch) en O(1)"""
+        if (self._max_edad_ns is not None and self._cantidad
+                and self._marcas[self._inicio] < marca_ns - self._max_edad_ns):
+            self.purgar(marca_ns)
+
+        capacidad = len(self._valores)
+        if self._cantidad == capacidad:
+            if self.max_lecturas is not None and capacidad >= self.max_lecturas:
+                # Buffer lleno: la nueva lectura ocupa el lugar de la más antigua
+                self._descartar(1)
+            else:
+                # OPTIMIZACIÓN: crecimiento geométrico (x2) hasta el tope de retención
+                capacidad *= 2
+                if self.max_lecturas is not None:
+                    capacidad = min(capacidad, self.max_lecturas)
+                self._reubicar(capacidad)
+
+        i = self._inicio + self._cantidad
+        if i >= capacidad:
+            i -= capacidad
+        self._valores[i] = valor
+        self._marcas[i] = marca_ns
+        self._cantidad += 1
+        self._total += 1
+
+    def agregar_lote(self, valores, marcas_ns):
+        """
+        Agrega un bloque de lecturas (secuencias o arrays del mismo largo,
+        marcas en orden creciente). El resultado es el mismo que llamar
+        agregar() con cada una, pero copiando columnas completas.
+        """
+        cantidad = len(valores)
+        if cantidad != len(marcas_ns):
+            raise ValueError("valores y marcas deben tener el mismo largo")
+        if not cantidad:
+            return
+        if self._tipo == "O":
+            for valor, marca in zip(valores, marcas_ns):
+                self.agregar(valor, marca)
+            return
+
+        self._total += cantidad
+        marcas_ns = np.asarray(marcas_ns, dtype=np.int64)
+        inicio = 0
+        if self._max_edad_ns is not None:
+            ultima = int(marcas_ns[-1])
+            self.purgar(ultima)
+            # Las del bloque que ya vencieron respecto de la última tampoco se guardan
+            inicio = int(np.searchsorted(marcas_ns, ultima - self._max_edad_ns))
+        if self.max_lecturas is not None:
+            inicio = max(inicio, cantidad - self.max_lecturas)
+        cantidad -= inicio
+
+        necesaria = self._cantidad + cantidad
+        capacidad = len(self._valores)
+        if self.max_lecturas is not None and necesaria > self.max_lecturas:
+            # Buffer lleno: las nuevas ocupan el lugar de las más antiguas
+            self._descartar(necesaria - self.max_lecturas)
+            necesaria = self.max_lecturas
+        if necesaria > capacidad:
+            # Crecimiento geométrico (x2) hasta el tope de retención
+            while capacidad < necesaria:
+                capacidad *= 2
+            if self.max_lecturas is not None:
+                capacidad = min(capacidad, self.max_lecturas)
+            self._reubicar(capacidad)
+
+        columna_valores = np.frombuffer(self._valores, dtype=self._valores.typecode)
+        columna_marcas = np.frombuffer(self._marcas, dtype=np.int64)
+        origen = inicio
+        for a, b in self._segmentos(self._cantidad, self._cantidad + cantidad):
+            columna_valores[a:b] = valores[origen:origen + b - a]
+            columna_marcas[a:b] = marcas_ns[origen:origen + b - a]
+            origen += b - a
+        self._cantidad += cantidad
+
+    # ---------- Acceso ----------
+    def _segmentos(self, inicio, fin):
+        """Rangos físicos (a, b) que cubren las lecturas lógicas [inicio, fin)"""
+        n = fin - inicio
+        if n <= 0:
+            return ()
+        capacidad = len(self._valores)
+        a = (self._inicio + inicio) % capacidad
+        if a + n <= capacidad:
+            return ((a, a + n),)
+        return ((a, capacidad), (0, a + n - capacidad))
+
+    def _rango(self, inicio, fin):
+        return slice(inicio, fin).indices(self._cantidad)[:2]
+
+    def vistas(self, inicio=0, fin=None):
+        """
+        Vistas sin copia de las lecturas en [inicio, fin): lista de pares
+        (valores, marcas) de memoryview, uno o dos según el rango dé la
+        vuelta al buffer circular.
+        """
+        if self._tipo == "O":
+            raise TypeError("Un historial de objetos no admite memoryview")
+        valores = memoryview(self._valores)
+        marcas = memoryview(self._marcas)
+        return [(valores[a:b], marcas[a:b]) for a, b in self._segmentos(*self._rango(inicio, fin))]
+
+    def _columna(self, columna, inicio, fin):
+        segmentos = self._segmentos(*self._rango(inicio, fin))
+        if self._tipo == "O" and columna is self._valores:
+            return [v for a, b in segmentos for v in columna[a:b]]
+        if len(segmentos) == 1:
+            a, b = segmentos[0]
+            return memoryview(columna)[a:b]
+        # El rango da la vuelta al buffer: se devuelve una copia contigua
+        copia = array(columna.typecode)
+        for a, b in segmentos:
+            copia.extend(columna[a:b])
+        return copia
+
+    def valores(self, inicio=0, fin=None):
+        """
+        Valores en [inicio, fin): memoryview sin copia si el rango es
+        contiguo en el buffer (usar vistas() para garantizar cero copias).
+        """
+        return self._columna(self._valores, inicio, fin)
+
+    def marcas(self, inicio=0, fin=None):
+        """Marcas de tiempo en [inicio, fin), con las mismas reglas que valores()"""
+        return self._columna(self._marcas, inicio, fin)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self._cantidad
+        if not 0 <= indice < self._cantidad:
+            raise IndexError("Índice de lectura fuera de rango")
+        i = (self._inicio + indice) % len(self._valores)
+        return self._valores[i], self._marcas[i]
+
+    def __iter__(self):
+        for a, b in self._segmentos(0, self._cantidad):
+            yield from zip(self._valores[a:b], self._marcas[a:b])
+
+    def ultima(self):
+        """Retorna la última lectura (valor, marca_ns) o None si está vacío"""
+        return self[-1] if self._cantidad else None
+
+    # ---------- Agregados leídos directamente de los buffers ----------
+    def _recorrer(self):
+        valores = memoryview(self._valores) if self._tipo != "O" else self._valores
+        return [valores[a:b] for a, b in self._segmentos(0, self._cantidad)]
+
+    def suma(self):
+        return sum(sum(segmento) for segmento in self._recorrer())
+
+    def minimo(self):
+        return min(min(s) for s in self._recorrer()) if self._cantidad else None
+
+    def maximo(self):
+        return max(max(s) for s in self._recorrer()) if self._cantidad else None
+
+    def promedio(self):
+        return self.suma() / self._cantidad if self._cantidad else None
+
+
+def configurar_retencion(dispositivos, max_lecturas=None, max_edad=None):
+    """Aplica la misma política de retención a toda una flota de dispositivos"""
+    for dispositivo in dispositivos:
+        dispositivo.configurar_retencion(max_lecturas, max_edad)
@@ -10,12 +10,22 @@ Este sistema demuestra conceptos de POO como:
 """
 import random
 import time
-from datetime import datetime
+from estadisticas import ContadorDetecciones, EstadisticasStreaming
+from historial import HistorialColumnar
+from ejecucion import procesar_dispositivos  # serial, thread o process
+from monitoreo import ejecutar_monitoreo
+from registro import RegistroDispositivos
+from reloj import RELOJ, formatear_marca
 
 
 # ==================== CLASE BASE ====================
 class DispositivoIoT:
 
+    # Clase de agregados incrementales (las subclases pueden cambiarla)
+    CLASE_ESTADISTICAS = EstadisticasStreaming
+    # Typecode de la columna de valores del historial: "d" = float
+    TIPO_HISTORIAL = "d"
+
     def __init__(self, id_dispositivo, nombre, ubicacion):
         """
         Constructor de la clase base
@@ -29,8 +39,12 @@ class DispositivoIoT:
         # Atributos privados (inician con _)
         # Estos no deberían ser accedidos directamente desde fuera de la clase
         self._estado = "Inactivo"  # Estado del dispositivo
-        self._datos_historicos = []  # Lista de lecturas históricas
-        self._tiempo_creacion = datetime.now()  # Tiempo de creación
+        # Lecturas históricas en un buffer circular (columna numérica + marcas)
+        self._datos_historicos = HistorialColumnar(self.TIPO_HISTORIAL)
+        # Estadísticas que se actualizan en O(1) con cada lectura
+        self._estadisticas = self.CLASE_ESTADISTICAS()
+        self._tiempo_creacion = RELOJ.ahora()  # Tiempo de creación (ns, sin formatear)
+        self._registro = None  # Registro que indexa este dispositivo (si hay)
 
     # Metodo privado (inicia con _)
     def _validar_lectura(self, valor):
@@ -48,9 +62,26 @@ class DispositivoIoT:
     # Metodo público para cambiar el estado
     def cambiar_estado(self, nuevo_estado):
         """Setter para cambiar el estado del dispositivo"""
+        anterior = self._estado
         self._estado = nuevo_estado
+        # Avisar al registro para que actualice su índice por estado
+        if self._registro is not None:
+            self._registro._estado_cambiado(self, anterior)
         return self._estado
 
+    # Metodo público para limitar el historial
+    def configurar_retencion(self, max_lecturas=None, max_edad=None):
+        """
+        Limita el historial a las últimas max_lecturas y/o a las lecturas
+        con menos de max_edad segundos (None = sin límite)
+        """
+        self._datos_historicos.configurar_retencion(max_lecturas, max_edad)
+
+    # Metodo público para consultar los agregados
+    def obtener_estadisticas(self):
+        """Retorna los agregados de todas las lecturas sin recorrer el historial"""
+        return self._estadisticas.resumen()
+
     # Metodo que será sobrescrito en las subclases (POLIMORFISMO)
     def leer_datos(self):
         """
@@ -67,8 +98,11 @@ class DispositivoIoT:
             'nombre': self.nombre,
             'ubicacion': self.ubicacion,
             'estado': self._estado,
-            'tiempo_creacion': self._tiempo_creacion.strftime("%Y-%m-%d %H:%M:%S"),
-            'lecturas_historicas': len(self._datos_historicos)
+            'tiempo_creacion': formatear_marca(self._tiempo_creacion, "%Y-%m-%d %H:%M:%S"),
+            'lecturas_historicas': {
+                'retenidas': len(self._datos_historicos),
+                'totales': self._datos_historicos.total_lecturas()
+            }
         }
 
 
@@ -100,11 +134,9 @@ class SensorTemperatura(DispositivoIoT):
 
         # Validación usando metodo privado del padre
         if self._validar_lectura(temperatura):
-            self._datos_historicos.append({
-                'valor': temperatura,
-                'unidad': '°C',
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
+            self._estadisticas.agregar(temperatura)
+            # Solo el número (la unidad es siempre °C); la marca es un entero
+            self._datos_historicos.agregar(temperatura, RELOJ.ahora())
             return temperatura
         return None
 
@@ -112,6 +144,10 @@ class SensorTemperatura(DispositivoIoT):
 class SensorMovimiento(DispositivoIoT):
     """Subclase para sensor de movimiento"""
 
+    # Para movimiento interesa la tasa de detección, no media ni percentiles
+    CLASE_ESTADISTICAS = ContadorDetecciones
+    TIPO_HISTORIAL = "B"  # detección como 0/1
+
     def __init__(self, id_dispositivo, nombre, ubicacion, sensibilidad="media"):
         super().__init__(id_dispositivo, nombre, ubicacion)
         self.sensibilidad = sensibilidad
@@ -129,10 +165,9 @@ class SensorMovimiento(DispositivoIoT):
         movimiento_detectado = random.random() < prob
 
         if self._validar_lectura(movimiento_detectado):
-            self._datos_historicos.append({
-                'valor': "Movimiento detectado" if movimiento_detectado else "Sin movimiento",
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
+            self._estadisticas.agregar(movimiento_detectado)
+            # El texto ("Movimiento detectado") se arma al mostrarlo
+            self._datos_historicos.agregar(movimiento_detectado, RELOJ.ahora())
             return movimiento_detectado
         return None
 
@@ -140,6 +175,8 @@ class SensorMovimiento(DispositivoIoT):
 class CamaraSeguridad(DispositivoIoT):
     """Subclase para cámara de seguridad"""
 
+    TIPO_HISTORIAL = "B"  # calidad 60-100 %
+
     def __init__(self, id_dispositivo, nombre, ubicacion, resolucion="1080p"):
         super().__init__(id_dispositivo, nombre, ubicacion)
         self.resolucion = resolucion
@@ -154,11 +191,9 @@ class CamaraSeguridad(DispositivoIoT):
         calidad_imagen = random.randint(60, 100)  # Porcentaje de calidad
 
         if self._validar_lectura(calidad_imagen):
-            self._datos_historicos.append({
-                'valor': f"Imagen capturada - Calidad: {calidad_imagen}%",
-                'resolucion': self.resolucion,
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
+            self._estadisticas.agregar(calidad_imagen)
+            # La resolución es fija por cámara: no se repite en cada lectura
+            self._datos_historicos.agregar(calidad_imagen, RELOJ.ahora())
             return calidad_imagen
         return None
 
@@ -197,20 +232,6 @@ def funcion_recursiva_monitoreo(ciclos, mostrar_progreso=False):
     return 1 + funcion_recursiva_monitoreo(ciclos - 1, mostrar_progreso)
 
 
-def procesar_dispositivos(lista_dispositivos, funcion_procesamiento):
-    """
-    FUNCIÓN QUE RECIBE OTRA FUNCIÓN COMO PARÁMETRO
-    Aplica una función de procesamiento a cada dispositivo
-    """
-    resultados = []
-
-    for dispositivo in lista_dispositivos:
-        resultado = funcion_procesamiento(dispositivo)
-        resultados.append(resultado)
-
-    return resultados
-
-
 # Funciones para usar como parámetro
 def leer_y_mostrar_datos(dispositivo):
     """Función que lee datos de un dispositivo y los muestra"""
@@ -245,6 +266,10 @@ def main():
         CamaraSeguridad("CAM002", "Cámara Externa", "Entrada", "1080p")
     ]
 
+    # Registro con índices: búsquedas por id, tipo, ubicación y estado sin
+    # recorrer la lista (se mantiene solo cuando cambia el estado)
+    registro = RegistroDispositivos(dispositivos)
+
     # 2. DEMOSTRAR POLIMORFISMO
     print(f"\nDEMOSTRANDO POLIMORFISMO...")
     print("El mismo método 'leer_datos()' se comporta diferente en cada clase:")
@@ -258,6 +283,11 @@ def main():
     print(f"\nEJECUTANDO MONITOREO RECURSIVO...")
     funcion_recursiva_monitoreo(5)  # Iniciamos con 5 ciclos
 
+    # La versión para flotas reales: cada dispositivo se lee en su propia
+    # tarea asíncrona, con ticks a ritmo fijo
+    print(f"\nEJECUTANDO MONITOREO ASÍNCRONO...")
+    ejecutar_monitoreo(dispositivos, 5, periodo=0.1)
+
     # 4. FUNCIÓN QUE RECIBE OTRA FUNCIÓN COMO PARÁMETRO
     print(f"\nUSANDO FUNCIÓN DE ORDEN SUPERIOR...")
     # Activamos todos los dispositivos usando una función como parámetro
@@ -282,11 +312,25 @@ def main():
         print(f"   • Suma total: {sum(valores_numericos)}")
         print(f"   • Valores ordenados: {sorted(valores_numericos)}")
 
+    # Los agregados de TODAS las lecturas ya están calculados en cada
+    # dispositivo: este reporte recorre dispositivos, no lecturas
+    print(f"Agregados de todas las lecturas:")
+    for dispositivo in dispositivos:
+        e = dispositivo.obtener_estadisticas()
+        if isinstance(dispositivo, SensorMovimiento):
+            print(f"   • {dispositivo.nombre}: tasa de detección {e['tasa_deteccion']:.0%}")
+        elif e['cantidad']:
+            print(f"   • {dispositivo.nombre}: media {e['media']:.1f} ± {e['desviacion']:.1f}"
+                  f" (p50 {e['p50']:.1f}, p95 {e['p95']:.1f}, p99 {e['p99']:.1f})")
+
     # Ordenar dispositivos por nombre
     dispositivos_ordenados = sorted(dispositivos, key=lambda d: d.nombre)
     print(f"   • Dispositivos ordenados por nombre:")
     for disp in dispositivos_ordenados:
         print(f"     - {disp.nombre}")
+    # El registro ya los mantiene ordenados, sin volver a ordenar la lista
+    print(f"   • Mismo orden desde el registro: "
+          f"{registro.ordenados_por_nombre() == dispositivos_ordenados}")
 
     # 6. USO DE FUNCIÓN LAMBDA
     print(f"\nUSANDO FUNCIÓN LAMBDA...")
@@ -296,6 +340,8 @@ def main():
     print(f"Sensores de temperatura encontrados: {len(sensores_temp)}")
     for sensor in sensores_temp:
         print(f"      • {sensor.nombre} en {sensor.ubicacion}")
+    # Lo mismo desde el índice por tipo del registro (no recorre la lista)
+    print(f"Sensores de temperatura en el registro: {len(registro.por_tipo('Sensor de Temperatura'))}")
 
     # Transformar nombres a mayúsculas usando lambda
     nombres_mayus = list(map(lambda d: d.nombre.upper(), dispositivos))
@@ -306,6 +352,8 @@ def main():
     # Crear lista de dispositivos activos usando lambda
     dispositivos_activos = list(filter(lambda d: d.obtener_estado() == "Activo", dispositivos))
     print(f"Dispositivos activos: {len(dispositivos_activos)}")
+    # Desde el índice por estado del registro
+    print(f"Dispositivos activos en el registro: {registro.contar(estado='Activo')}")
 
     # 7. MOSTRAR INFORMACIÓN FINAL
     print(f"\nRESUMEN FINAL DEL SISTEMA...")
@@ -316,7 +364,8 @@ def main():
         print(f"{info['nombre']} ({info['id']})")
         print(f"Estado: {info['estado']}")
         print(f"Ubicación: {info['ubicacion']}")
-        print(f"Lecturas históricas: {info['lecturas_historicas']}")
+        lecturas = info['lecturas_historicas']
+        print(f"Lecturas históricas: {lecturas['retenidas']} (total: {lecturas['totales']})")
         print()
 
     print("¡Sistema de dispositivos IoT ejecutado exitosamente!")
@@ -0,0 +1,176 @@
+"""
+Monitoreo asíncrono de dispositivos IoT con ritmo de tiempo real
+
+Reemplaza a funcion_recursiva_monitoreo (que bloqueaba con time.sleep y no
+leía ningún dispositivo) por un planificador asyncio:
+- Cada dispositivo tiene su propio periodo y su propia tarea.
+- Los ticks se planifican sobre una grilla fija (inicio + k * periodo), así el
+  retraso de un ciclo no se acumula en los siguientes (compensación de deriva).
+- Las lecturas síncronas se ejecutan por defecto en un ThreadPoolExecutor
+  propio y acotado (las corrutinas se esperan directamente), con un límite de
+  tiempo: un dispositivo lento pierde sus propios ticks pero no detiene el
+  bucle ni a los demás.
+- Una lectura que supera el límite se abandona: el monitoreo sigue y al
+  terminar cierra el ejecutor sin esperarla (cancel_futures=True,
+  wait=False). Un hilo no se puede interrumpir, así que la lectura colgada
+  sigue ocupando su hilo hasta que leer_datos() retorne.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Tope de hilos para las lecturas síncronas (uno por dispositivo hasta este número)
+MAX_HILOS = 32
+
+
+async def _monitorear_dispositivo(dispositivo, periodo, ciclos, inicio, limite,
+                                  ejecutor, eventos):
+    """
+    Tarea de un dispositivo: lee en cada tick planificado de su grilla.
+    ejecutor: ThreadPoolExecutor para las lecturas síncronas, o None para
+    llamarlas directamente en el bucle.
+    """
+    leer = dispositivo.leer_datos
+    asincrono = asyncio.iscoroutinefunction(leer)
+    bucle = asyncio.get_running_loop()
+    lectura_pendiente = None
+
+    for ciclo in range(ciclos):
+        planificado = inicio + ciclo * periodo
+        espera = planificado - time.monotonic()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        real = time.monotonic()
+
+        if not asincrono and ejecutor is None:
+            # Lectura simulada (rápida, en memoria): directa, sin crear tareas
+            try:
+                leer()
+                leido = True
+            except Exception:
+                leido = False
+            eventos.append((planificado, real, leido))
+            continue
+
+        # Si la lectura anterior sigue en curso se omite este tick en lugar
+        # de encolar lecturas y desplazar la grilla
+        if lectura_pendiente is not None and not lectura_pendiente.done():
+            eventos.append((planificado, real, False))
+            continue
+
+        lectura_pendiente = asyncio.ensure_future(
+            leer() if asincrono else bucle.run_in_executor(ejecutor, leer)
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(lectura_pendiente), limite)
+            leido = True
+        except Exception:
+            # Tiempo agotado o error del dispositivo: no afecta a los demás
+            leido = False
+        eventos.append((planificado, real, leido))
+
+    if lectura_pendiente is not None and not lectura_pendiente.done():
+        # No esperar indefinidamente a un dispositivo colgado: la lectura se abandona
+        lectura_pendiente.cancel()
+
+
+async def monitorear(dispositivos, ciclos, periodo=0.1, periodos=None, limite=None,
+                     en_hilo=True, max_hilos=None):
+    """
+    Monitorea todos los dispositivos de forma concurrente.
+
+    Args:
+        dispositivos: lista de objetos con leer_datos()
+        ciclos: número de ciclos de la grilla base (periodo)
+        periodo: periodo por defecto en segundos
+        periodos: dict opcional {id_dispositivo: periodo} para periodos propios
+        limite: tiempo máximo por lectura (por defecto, el periodo del dispositivo)
+        en_hilo: ejecutar leer_datos() síncronos en hilos (por defecto), así
+            una lectura que bloquea (p. ej. E/S real) no frena el bucle. Con
+            False se llaman directamente: solo para lecturas simuladas en
+            memoria, que no bloquean. Si leer_datos es una corrutina se
+            espera directamente.
+        max_hilos: hilos del ejecutor (por defecto, uno por dispositivo hasta
+            MAX_HILOS). Las lecturas que superan `limite` se abandonan.
+
+    Retorna un reporte por ciclo (lista de dicts) con la hora planificada, la
+    hora real promedio del tick, el desfase máximo y cuántos dispositivos se
+    leyeron u omitieron.
+    Los tiempos son segundos relativos al inicio del monitoreo.
+    """
+    periodos = periodos or {}
+    inicio = time.monotonic()
+    duracion = ciclos * periodo
+    eventos = []
+
+    # Ejecutor propio y acotado en lugar del predeterminado de asyncio.to_thread:
+    # asyncio.run espera a los hilos del predeterminado al cerrar, y una
+    # lectura colgada lo dejaría bloqueado
+    ejecutor = None
+    if en_hilo and dispositivos:
+        ejecutor = ThreadPoolExecutor(max_hilos or min(MAX_HILOS, len(dispositivos)),
+                                      thread_name_prefix="lectura")
+
+    tareas = []
+    for dispositivo in dispositivos:
+        propio = periodos.get(getattr(dispositivo, "id_dispositivo", None), periodo)
+        ciclos_propios = max(1, round(duracion / propio)) if ciclos > 0 else 0
+        tareas.append(
+            _monitorear_dispositivo(
+                dispositivo, propio, ciclos_propios, inicio,
+                limite if limite is not None else propio, ejecutor, eventos,
+            )
+        )
+    try:
+        await asyncio.gather(*tareas)
+    finally:
+        if ejecutor is not None:
+            # Las lecturas abandonadas no se esperan; las que no empezaron se descartan
+            ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    # Agrupar los eventos en los ciclos de la grilla base
+    reporte = [
+        {"ciclo": c + 1, "planificado": c * periodo, "real": None,
+         "desfase_max": 0.0, "dispositivos_leidos": 0, "omitidos": 0}
+        for c in range(ciclos)
+    ]
+    suma_real = [0.0] * ciclos
+    cuenta_real = [0] * ciclos
+    for planificado, real, leido in eventos:
+        c = min(ciclos - 1, int((planificado - inicio) / periodo + 1e-9))
+        fila = reporte[c]
+        desfase = real - planificado
+        suma_real[c] += real - inicio
+        cuenta_real[c] += 1
+        if desfase > fila["desfase_max"]:
+            fila["desfase_max"] = desfase
+        if leido:
+            fila["dispositivos_leidos"] += 1
+        else:
+            fila["omitidos"] += 1
+
+    for c, fila in enumerate(reporte):
+        if cuenta_real[c]:
+            fila["real"] = suma_real[c] / cuenta_real[c]
+    return reporte
+
+
+def ejecutar_monitoreo(dispositivos, ciclos, periodo=0.1, periodos=None,
+                       limite=None, en_hilo=True, mostrar_progreso=False, max_hilos=None):
+    """Punto de entrada síncrono: ejecuta monitorear() con asyncio.run"""
+    reporte = asyncio.run(
+        monitorear(dispositivos, ciclos, periodo, periodos, limite, en_hilo, max_hilos)
+    )
+
+    if mostrar_progreso:
+        for fila in reporte:
+            real = f"{fila['real']:.3f}s" if fila["real"] is not None else "-"
+            print(
+                f"Ciclo {fila['ciclo']}: planificado {fila['planificado']:.3f}s, "
+                f"real {real}, leídos {fila['dispositivos_leidos']}, "
+                f"omitidos {fila['omitidos']}"
+            )
+        print("Monitoreo completado!")
+
+    return reporte
@@ -0,0 +1,300 @@
+"""
+Persistencia binaria de historiales con mmap
+
+Un archivo por clase de dispositivo (p. ej. SensorTemperatura.bin) con
+registros de tamaño fijo:
+
+    id (uint32) | marca (int64, ns desde epoch) | valor (float64)  -> 20 bytes
+
+más un archivo .ids con el id_dispositivo de cada índice (uno por línea).
+El archivo se abre con mmap: un proceso que reinicia se vuelve a conectar a
+gigas de historial sin parsear nada. Los registros se mantienen ordenados
+por marca, así que las consultas por rango de tiempo devuelven vistas NumPy
+sobre el mapa (sin copias) que solo tocan las páginas que leen. Las de un
+dispositivo (lecturas_de) filtran por id y devuelven una copia.
+"""
+
+import mmap
+import os
+
+import numpy as np
+
+MAGICO = b"IOTH"
+VERSION = 1
+
+CABECERA = np.dtype([("magico", "S4"), ("version", "<u4"), ("cantidad", "<u8")])
+REGISTRO = np.dtype([("id", "<u4"), ("marca", "<i8"), ("valor", "<f8")])
+
+
+class ArchivoHistorial:
+    """Archivo de registros fijos mapeado en memoria (solo se agrega al final)"""
+
+    CAPACIDAD_INICIAL = 4096
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) < CABECERA.itemsize
+        self._archivo = open(ruta, "w+b" if nuevo else "r+b")
+        if nuevo:
+            self._archivo.truncate(CABECERA.itemsize + REGISTRO.itemsize * self.CAPACIDAD_INICIAL)
+        self._mapear()
+        if nuevo:
+            self._cabecera["magico"] = MAGICO
+            self._cabecera["version"] = VERSION
+            self._cabecera["cantidad"] = 0
+        elif self._cabecera["magico"][0] != MAGICO:
+            raise ValueError(f"{ruta} no es un archivo de historial")
+
+        self._ids = []
+        self._indice_ids = {}
+        self._extremos = None  # índice -> [primera, última] posición (se arma al consultarse)
+        self._ruta_ids = ruta + ".ids"
+        if os.path.exists(self._ruta_ids):
+            with open(self._ruta_ids, encoding="utf-8") as archivo:
+                for linea in archivo:
+                    self._registrar_id(linea.rstrip("\n"))
+
+    def _mapear(self):
+        anterior = getattr(self, "_mmap", None)
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        self._mmap = mmap.mmap(self._archivo.fileno(), tamano)
+        self._cabecera = np.frombuffer(self._mmap, CABECERA, count=1)
+        capacidad = (tamano - CABECERA.itemsize) // REGISTRO.itemsize
+        self._registros = np.frombuffer(
+            self._mmap, REGISTRO, count=capacidad, offset=CABECERA.itemsize
+        )
+        if anterior is not None:
+            try:
+                anterior.close()
+            except BufferError:
+                pass  # quedan vistas del mapa anterior: se libera cuando se suelten
+
+    def _registrar_id(self, id_dispositivo):
+        self._indice_ids[id_dispositivo] = len(self._ids)
+        self._ids.append(id_dispositivo)
+
+    def __len__(self):
+        return int(self._cabecera["cantidad"][0])
+
+    def capacidad(self):
+        return len(self._registros)
+
+    def indice_de(self, id_dispositivo):
+        """Índice uint32 de un dispositivo (lo crea si es nuevo)"""
+        indice = self._indice_ids.get(id_dispositivo)
+        if indice is None:
+            with open(self._ruta_ids, "a", encoding="utf-8") as archivo:
+                archivo.write(f"{id_dispositivo}\n")
+            self._registrar_id(id_dispositivo)
+            indice = self._indice_ids[id_dispositivo]
+        return indice
+
+    def id_de(self, indice):
+        return self._ids[indice]
+
+    def _extremos_por_indice(self):
+        """índice -> [primera, última] posición de sus registros (un recorrido al primer uso)"""
+        if self._extremos is None:
+            self._extremos = {}
+            self._actualizar_extremos(self._registros["id"][:len(self)], 0)
+        return self._extremos
+
+    def _actualizar_extremos(self, ids, desplazamiento):
+        if not len(ids):
+            return
+        indices, primeras = np.unique(ids, return_index=True)
+        _, ultimas = np.unique(ids[::-1], return_index=True)
+        ultimas = len(ids) - 1 - ultimas + desplazamiento
+        extremos = self._extremos
+        for indice, primera, ultima in zip(indices.tolist(), (primeras + desplazamiento).tolist(),
+                                           ultimas.tolist()):
+            actuales = extremos.get(indice)
+            if actuales is None or actuales[0] >= desplazamiento:
+                # Nuevo, o todos sus registros estaban en el tramo reescrito
+                extremos[indice] = [primera, ultima]
+            else:
+                actuales[1] = ultima
+
+    def ultima_marca(self, id_dispositivo):
+        """Marca del último registro guardado de un dispositivo (None si no tiene)"""
+        indice = self._indice_ids.get(id_dispositivo)
+        extremos = None if indice is None else self._extremos_por_indice().get(indice)
+        if extremos is None:
+            return None
+        return int(self._registros["marca"][extremos[1]])
+
+    # ---------- Escritura ----------
+    def _asegurar_capacidad(self, necesaria):
+        capacidad = self.capacidad()
+        if necesaria <= capacidad:
+            return
+        while capacidad < necesaria:
+            capacidad *= 2
+        self._mmap.flush()
+        self._archivo.truncate(CABECERA.itemsize + REGISTRO.itemsize * capacidad)
+        self._mapear()
+
+    def agregar_lote(self, indices, marcas, valores):
+        """
+        Agrega registros. indices puede ser un índice (de indice_de()) o un
+        array con uno por registro. Si las marcas son >= a las ya escritas
+        solo se agrega al final; si no, los registros se intercalan por marca
+        con la cola del archivo (se reescribe desde la primera marca mayor a
+        la más antigua del lote), así rango_tiempo() sigue siendo válido.
+        """
+        marcas = np.asarray(marcas, dtype=np.int64)
+        cantidad = len(marcas)
+        if not cantidad:
+            return
+        nuevos = np.empty(cantidad, dtype=REGISTRO)
+        nuevos["id"] = indices
+        nuevos["marca"] = marcas
+        nuevos["valor"] = np.asarray(valores, dtype=np.float64)
+        if (np.diff(marcas) < 0).any():
+            nuevos = nuevos[np.argsort(marcas, kind="stable")]
+
+        n = len(self)
+        inicio = n
+        if n and nuevos["marca"][0] < self._registros["marca"][n - 1]:
+            # Los registros ya escritos con la misma marca quedan antes que los nuevos
+            inicio = int(np.searchsorted(self._registros["marca"][:n], nuevos["marca"][0], side="right"))
+            cola = self._registros[inicio:n]
+            nuevos = np.concatenate([cola, nuevos])
+            nuevos = nuevos[np.argsort(nuevos["marca"], kind="stable")]
+        self._asegurar_capacidad(inicio + len(nuevos))
+        self._registros[inicio:inicio + len(nuevos)] = nuevos
+        # La cantidad se actualiza al final: un corte a mitad de un agregado
+        # al final no deja registros a medias (al reescribir la cola, sí puede)
+        self._cabecera["cantidad"] = inicio + len(nuevos)
+        if self._extremos is not None:
+            self._actualizar_extremos(nuevos["id"], inicio)
+
+    def sincronizar(self):
+        """Fuerza la escritura a disco de las páginas modificadas"""
+        self._mmap.flush()
+
+    def cerrar(self):
+        self.sincronizar()
+        self._registros = self._cabecera = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # quedan vistas en uso: el mapa se libera cuando se suelten
+        self._archivo.close()
+
+    # ---------- Consultas (vistas sin copia) ----------
+    def registros(self, inicio=0, fin=None):
+        """Vista NumPy estructurada (id, marca, valor) de los registros [inicio, fin)"""
+        return self._registros[:len(self)][inicio:fin]
+
+    def rango_tiempo(self, desde_ns, hasta_ns):
+        """
+        Registros con desde_ns <= marca < hasta_ns. Las marcas se escriben en
+        orden, así que se usa búsqueda binaria: solo se leen O(log n) páginas
+        más las del resultado.
+        """
+        marcas = self._registros["marca"][:len(self)]
+        inicio = int(np.searchsorted(marcas, desde_ns, side="left"))
+        fin = int(np.searchsorted(marcas, hasta_ns, side="left"))
+        return self.registros(inicio, fin)
+
+    def lecturas_de(self, id_dispositivo, desde_ns=None, hasta_ns=None):
+        """
+        Copia de los registros de un dispositivo (opcionalmente en un rango
+        de tiempo). Solo se recorre el tramo entre su primer y último
+        registro, acotado por el rango, y se filtra por id.
+        """
+        indice = self._indice_ids.get(id_dispositivo)
+        extremos = None if indice is None else self._extremos_por_indice().get(indice)
+        if extremos is None:
+            return self._registros[:0]
+        inicio, fin = extremos[0], extremos[1] + 1
+        marcas = self._registros["marca"]
+        if desde_ns is not None:
+            inicio = max(inicio, int(np.searchsorted(marcas[:fin], desde_ns, side="left")))
+        if hasta_ns is not None:
+            fin = min(fin, int(np.searchsorted(marcas[:fin], hasta_ns, side="left")))
+        registros = self.registros(inicio, max(inicio, fin))
+        return registros[registros["id"] == indice]
+
+
+class AlmacenHistoriales:
+    """
+    Directorio con un ArchivoHistorial por clase de dispositivo. volcar()
+    escribe solo las lecturas que cada dispositivo recibió desde el último
+    volcado; junto con la retención del historial en memoria, la RAM queda
+    acotada y el disco guarda todo. La primera vez que vuelca un dispositivo
+    (también al reabrir el directorio) retoma después de la última marca que
+    ya tiene guardada en su archivo. Los dispositivos de una clase se pueden
+    volcar por separado y en cualquier orden: el archivo intercala las
+    lecturas por marca.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self._archivos = {}
+        self._volcadas = {}  # id_dispositivo -> total_lecturas ya escritas
+
+    def archivo(self, clase):
+        nombre = clase if isinstance(clase, str) else clase.__name__
+        archivo = self._archivos.get(nombre)
+        if archivo is None:
+            archivo = ArchivoHistorial(os.path.join(self.directorio, f"{nombre}.bin"))
+            self._archivos[nombre] = archivo
+        return archivo
+
+    def volcar(self, dispositivos):
+        """Escribe a disco las lecturas nuevas; retorna cuántas se escribieron"""
+        pendientes_por_clase = {}
+        totales_por_clase = {}  # archivo -> {id_dispositivo: total_lecturas}
+        for dispositivo in dispositivos:
+            historial = dispositivo._datos_historicos
+            if historial.tipo_valor == "O":
+                raise TypeError(
+                    f"{dispositivo.id_dispositivo}: un historial de objetos no se puede persistir"
+                )
+            archivo = self.archivo(type(dispositivo))
+            total = historial.total_lecturas()
+            volcadas = self._volcadas.get(dispositivo.id_dispositivo)
+            if volcadas is not None:
+                pendientes = total - volcadas
+                # Las que la retención ya descartó no se pueden recuperar
+                pendientes = min(pendientes, len(historial))
+            else:
+                ultima = archivo.ultima_marca(dispositivo.id_dispositivo)
+                pendientes = len(historial)
+                if ultima is not None and pendientes:
+                    marcas = np.asarray(historial.marcas(), dtype=np.int64)
+                    pendientes -= int(np.searchsorted(marcas, ultima, side="right"))
+            if pendientes > 0:
+                inicio = len(historial) - pendientes
+                pendientes_por_clase.setdefault(archivo, []).append((
+                    archivo.indice_de(dispositivo.id_dispositivo),
+                    np.asarray(historial.marcas(inicio), dtype=np.int64),
+                    np.asarray(historial.valores(inicio), dtype=np.float64),
+                ))
+            totales_por_clase.setdefault(archivo, {})[dispositivo.id_dispositivo] = total
+
+        escritas = 0
+        for archivo, totales in totales_por_clase.items():
+            partes = pendientes_por_clase.get(archivo)
+            if partes:
+                # Un solo lote por archivo (agregar_lote lo ordena por marca)
+                indices = np.concatenate([np.full(len(m), i, dtype=np.uint32) for i, m, _ in partes])
+                marcas = np.concatenate([m for _, m, _ in partes])
+                valores = np.concatenate([v for _, _, v in partes])
+                archivo.agregar_lote(indices, marcas, valores)
+                escritas += len(marcas)
+            # Recién escritas cuentan como volcadas: si la escritura falla se reintentan
+            self._volcadas.update(totales)
+        return escritas
+
+    def sincronizar(self):
+        for archivo in self._archivos.values():
+            archivo.sincronizar()
+
+    def cerrar(self):
+        for archivo in self._archivos.values():
+            archivo.cerrar()
+        self._archivos.clear()
@@ -0,0 +1,226 @@
+"""
+Registro de dispositivos con índices hash
+
+Reemplaza las búsquedas lineales (filter/isinstance/sorted sobre la lista
+completa) por índices que se mantienen al agregar, eliminar o cambiar de
+estado un dispositivo:
+- id_dispositivo -> dispositivo
+- tipo, ubicacion y estado -> conjunto de dispositivos
+- lista ordenada por nombre (bisect)
+
+"Todas las cámaras activas en Entrada" es una intersección de conjuntos,
+no un recorrido de toda la flota. por_tipo/por_ubicacion/por_estado
+devuelven vistas de solo lectura de esos conjuntos, sin copiarlos.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Set
+from operator import itemgetter
+
+_NOMBRE = itemgetter(0)
+
+
+class _VistaIndice(Set):
+    """
+    Vista de solo lectura de los dispositivos con una clave de un índice.
+    Refleja los cambios del registro: para recorrerla mientras se agregan o
+    cambian dispositivos, copiarla antes con set(vista).
+    """
+
+    __slots__ = ("_indice", "_clave")
+
+    def __init__(self, indice, clave):
+        self._indice = indice
+        self._clave = clave
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Los operadores de conjuntos (&, |, -) devuelven un set normal
+        return set(iterable)
+
+    def _grupo(self):
+        # Se busca en cada acceso: el conjunto de la clave se borra al vaciarse
+        return self._indice.get(self._clave, ())
+
+    def __len__(self):
+        return len(self._grupo())
+
+    def __contains__(self, dispositivo):
+        return dispositivo in self._grupo()
+
+    def __iter__(self):
+        return iter(self._grupo())
+
+    def __repr__(self):
+        return f"<dispositivos con {self._clave!r}: {len(self)}>"
+
+
+class RegistroDispositivos:
+
+    def __init__(self, dispositivos=()):
+        self._por_id = {}
+        self._claves = {}  # id -> (tipo, ubicacion, estado, nombre) con que está indexado
+        self._por_tipo = {}
+        self._por_ubicacion = {}
+        self._por_estado = {}
+        self._nombres = []  # (nombre, id) ordenados
+        # cambiar_estado() puede llegar desde varios hilos (executor="thread")
+        self._candado = threading.RLock()
+        self.agregar_varios(dispositivos)
+
+    def __reduce__(self):
+        # Al enviar dispositivos a otro proceso no se copia el registro entero:
+        # llega vacío y el padre reindexa al recibir el estado actualizado
+        return (RegistroDispositivos, ())
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __contains__(self, dispositivo):
+        return self._por_id.get(dispositivo.id_dispositivo) is dispositivo
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    # ---------- Mantenimiento de índices ----------
+    @staticmethod
+    def _claves_de(dispositivo):
+        return (dispositivo.tipo, dispositivo.ubicacion, dispositivo._estado, dispositivo.nombre)
+
+    def _indexar(self, dispositivo, claves, ordenar=True):
+        tipo, ubicacion, estado, nombre = claves
+        self._por_tipo.setdefault(tipo, set()).add(dispositivo)
+        self._por_ubicacion.setdefault(ubicacion, set()).add(dispositivo)
+        self._por_estado.setdefault(estado, set()).add(dispositivo)
+        if ordenar:
+            insort(self._nombres, (nombre, dispositivo.id_dispositivo))
+        else:
+            self._nombres.append((nombre, dispositivo.id_dispositivo))
+        self._claves[dispositivo.id_dispositivo] = claves
+
+    def _desindexar(self, dispositivo):
+        id_dispositivo = dispositivo.id_dispositivo
+        tipo, ubicacion, estado, nombre = self._claves.pop(id_dispositivo)
+        for indice, clave in ((self._por_tipo, tipo),
+                              (self._por_ubicacion, ubicacion),
+                              (self._por_estado, estado)):
+            grupo = indice[clave]
+            grupo.discard(dispositivo)
+            if not grupo:
+                del indice[clave]
+        del self._nombres[bisect_left(self._nombres, (nombre, id_dispositivo))]
+
+    def agregar(self, dispositivo, _ordenar=True):
+        id_dispositivo = dispositivo.id_dispositivo
+        if id_dispositivo in self._por_id:
+            raise ValueError(f"Ya existe un dispositivo con id {id_dispositivo}")
+        if dispositivo._registro is not None and dispositivo._registro is not self:
+            raise ValueError(f"El dispositivo {id_dispositivo} ya pertenece a otro registro")
+
+        with self._candado:
+            self._por_id[id_dispositivo] = dispositivo
+            self._indexar(dispositivo, self._claves_de(dispositivo), _ordenar)
+            dispositivo._registro = self
+        return dispositivo
+
+    def agregar_varios(self, dispositivos):
+        """Carga masiva: un solo ordenamiento del índice por nombre al final"""
+        try:
+            for dispositivo in dispositivos:
+                self.agregar(dispositivo, _ordenar=False)
+        finally:
+            self._nombres.sort()
+
+    def eliminar(self, dispositivo):
+        id_dispositivo = dispositivo.id_dispositivo
+        if self._por_id.get(id_dispositivo) is not dispositivo:
+            raise KeyError(f"El dispositivo {id_dispositivo} no está en el registro")
+
+        with self._candado:
+            self._desindexar(dispositivo)
+            del self._por_id[id_dispositivo]
+            dispositivo._registro = None
+
+    def reindexar(self, dispositivo):
+        """
+        Actualiza los índices de un dispositivo cuyos atributos cambiaron
+        (ubicacion, nombre, tipo o estado asignados directamente).
+        """
+        if self._por_id.get(dispositivo.id_dispositivo) is not dispositivo:
+            return
+        with self._candado:
+            claves = self._claves_de(dispositivo)
+            if claves != self._claves[dispositivo.id_dispositivo]:
+                self._desindexar(dispositivo)
+                self._indexar(dispositivo, claves)
+
+    def _estado_cambiado(self, dispositivo, anterior):
+        """Llamado por cambiar_estado(): mueve el dispositivo entre conjuntos de estado"""
+        nuevo = dispositivo._estado
+        if nuevo == anterior:
+            return
+        with self._candado:
+            claves = self._claves.get(dispositivo.id_dispositivo)
+            if claves is None or self._por_id[dispositivo.id_dispositivo] is not dispositivo:
+                return
+            grupo = self._por_estado[claves[2]]
+            grupo.discard(dispositivo)
+            if not grupo:
+                del self._por_estado[claves[2]]
+            self._por_estado.setdefault(nuevo, set()).add(dispositivo)
+            self._claves[dispositivo.id_dispositivo] = (claves[0], claves[1], nuevo, claves[3])
+
+    # ---------- Consultas ----------
+    def obtener(self, id_dispositivo):
+        """Dispositivo por id en O(1) (None si no existe)"""
+        return self._por_id.get(id_dispositivo)
+
+    def por_tipo(self, tipo):
+        return _VistaIndice(self._por_tipo, tipo)
+
+    def por_ubicacion(self, ubicacion):
+        return _VistaIndice(self._por_ubicacion, ubicacion)
+
+    def por_estado(self, estado):
+        return _VistaIndice(self._por_estado, estado)
+
+    def _grupos(self, tipo, ubicacion, estado):
+        """Conjuntos de los criterios indicados, del más chico al más grande (None = sin criterios)"""
+        grupos = []
+        for indice, clave in ((self._por_tipo, tipo),
+                              (self._por_ubicacion, ubicacion),
+                              (self._por_estado, estado)):
+            if clave is not None:
+                grupos.append(indice.get(clave, set()))
+        if not grupos:
+            return None
+        grupos.sort(key=len)
+        return grupos
+
+    def buscar(self, tipo=None, ubicacion=None, estado=None):
+        """
+        Dispositivos que cumplen todos los criterios indicados. Se parte del
+        conjunto más chico y se intersecta con los demás.
+        """
+        grupos = self._grupos(tipo, ubicacion, estado)
+        if grupos is None:
+            return set(self._por_id.values())
+        return grupos[0].intersection(*grupos[1:])
+
+    def contar(self, tipo=None, ubicacion=None, estado=None):
+        """Como len(buscar(...)) sin armar el conjunto resultado"""
+        grupos = self._grupos(tipo, ubicacion, estado)
+        if grupos is None:
+            return len(self._por_id)
+        menor, *otros = grupos
+        if not otros:
+            return len(menor)
+        return sum(1 for dispositivo in menor if all(dispositivo in grupo for grupo in otros))
+
+    def ordenados_por_nombre(self, desde=None, hasta=None):
+        """Dispositivos en orden de nombre; opcionalmente solo nombres en [desde, hasta]"""
+        nombres = self._nombres
+        inicio = 0 if desde is None else bisect_left(nombres, desde, key=_NOMBRE)
+        fin = len(nombres) if hasta is None else bisect_right(nombres, hasta, key=_NOMBRE)
+        return [self._por_id[id_dispositivo] for _, id_dispositivo in self._nombres[inicio:fin]]
@@ -0,0 +1,82 @@
+"""
+Fuente de tiempo compartida por la flota y formateo perezoso de marcas
+
+Las lecturas guardan un entero (nanosegundos desde epoch) en lugar de un
+string: formatear con strftime en cada lectura era uno de los puntos más
+costosos de la simulación. El texto se genera solo al mostrarlo, y se
+reutiliza mientras no cambie el segundo.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Reloj:
+    """
+    Marcas de tiempo enteras que avanzan con el reloj monotónico.
+
+    Al crearse toma una referencia (epoch, monotónico); cada marca es
+    epoch_base + (monotonic_ns() - monotonica_base): se lee como hora real
+    pero nunca retrocede si se ajusta el reloj del sistema. La marca
+    monotónica cruda se recupera con monotonica(marca).
+
+    La marca congelada por tick() es propia de cada hilo y de cada tarea de
+    asyncio (ContextVar): un tick en curso no cambia la hora que ven los demás.
+    """
+
+    __slots__ = ("_base_epoch", "_base_monotonica", "_congelada")
+
+    def __init__(self):
+        self._congelada = ContextVar("marca_congelada", default=None)
+        self.resincronizar()
+
+    def resincronizar(self):
+        """Vuelve a alinear las marcas con la hora del sistema"""
+        self._base_monotonica = time.monotonic_ns()
+        self._base_epoch = time.time_ns()
+
+    def ahora(self):
+        """Marca actual en ns desde epoch (la del tick si hay uno en curso)"""
+        congelada = self._congelada.get()
+        if congelada is not None:
+            return congelada
+        return self._base_epoch + (time.monotonic_ns() - self._base_monotonica)
+
+    def monotonica(self, marca):
+        """Valor de time.monotonic_ns() que corresponde a una marca"""
+        return marca - self._base_epoch + self._base_monotonica
+
+    @contextmanager
+    def tick(self):
+        """
+        Congela la marca durante un tick: todas las lecturas dentro del
+        bloque (en este hilo o tarea) comparten el mismo timestamp.
+        """
+        marca = self.ahora()
+        token = self._congelada.set(marca)
+        try:
+            yield marca
+        finally:
+            self._congelada.reset(token)
+
+
+# Reloj de toda la flota
+RELOJ = Reloj()
+
+# Último texto generado por formato: (segundo, texto)
+_cache_formato = {}
+
+
+def formatear_marca(marca_ns, formato="%H:%M:%S"):
+    """
+    Formatea una marca (ns desde epoch) en hora local. Mientras el segundo
+    no cambie se devuelve el mismo string sin volver a llamar a strftime.
+    """
+    segundo = marca_ns // 1_000_000_000
+    cacheado = _cache_formato.get(formato)
+    if cacheado is not None and cacheado[0] == segundo:
+        return cacheado[1]
+    texto = time.strftime(formato, time.localtime(segundo))
+    _cache_formato[formato] = (segundo, texto)
+    return texto
@@ -3,8 +3,17 @@ Sistema de Simulación de Dispositivos IoT - Versión Optimizada
 """
 
 import random
-import time
-from datetime import datetime
+import tempfile
+
+import numpy as np
+
+from estadisticas import ContadorDetecciones, EstadisticasStreaming
+from historial import HistorialColumnar, configurar_retencion
+from ejecucion import procesar_dispositivos  # serial, thread o process
+from monitoreo import ejecutar_monitoreo
+from persistencia import AlmacenHistoriales
+from registro import RegistroDispositivos
+from reloj import RELOJ, formatear_marca
 
 """
 __slots__ es una optimización de memoria en Python
@@ -22,17 +31,29 @@ class DispositivoIoT:
         "ubicacion",
         "_estado",
         "_datos_historicos",
+        "_estadisticas",
         "_tiempo_creacion",
+        "_registro",
     )
 
+    # Typecode de `array` para la columna de valores del historial
+    _TIPO_HISTORIAL = "d"
+    # Agregados incrementales que se actualizan en cada lectura
+    _CLASE_ESTADISTICAS = EstadisticasStreaming
+
     def __init__(self, id_dispositivo, nombre, ubicacion):
         # OPTIMIZACIÓN: __slots__ para reducir uso de memoria
         self.id_dispositivo = id_dispositivo
         self.nombre = nombre
         self.ubicacion = ubicacion
         self._estado = "Inactivo"
-        self._datos_historicos = []
-        self._tiempo_creacion = datetime.now()
+        # OPTIMIZACIÓN: historial columnar (array tipado) en lugar de lista de tuplas
+        self._datos_historicos = HistorialColumnar(self._TIPO_HISTORIAL)
+        # OPTIMIZACIÓN: estadísticas O(1) por lectura, los reportes no recorren el historial
+        self._estadisticas = self._CLASE_ESTADISTICAS()
+        # Marca entera (ns): se formatea solo al mostrarla
+        self._tiempo_creacion = RELOJ.ahora()
+        self._registro = None  # RegistroDispositivos que indexa este dispositivo
 
     def _validar_lectura(self, valor):
         # OPTIMIZACIÓN: isinstance más rápido que type checking
@@ -42,21 +63,45 @@ class DispositivoIoT:
         return self._estado
 
     def cambiar_estado(self, nuevo_estado):
+        anterior = self._estado
         self._estado = nuevo_estado
+        if self._registro is not None:
+            # Mantiene el índice por estado del registro en O(1)
+            self._registro._estado_cambiado(self, anterior)
         return self._estado
 
+    def configurar_retencion(self, max_lecturas=None, max_edad=None):
+        # Buffer circular: O(1) por lectura y sin crecer más allá del tope
+        self._datos_historicos.configurar_retencion(max_lecturas, max_edad)
+
+    def _registrar(self, valor, marca_ns):
+        # Punto único de registro: historial + estadísticas incrementales
+        self._datos_historicos.agregar(valor, marca_ns)
+        self._estadisticas.agregar(valor)
+
+    def obtener_estadisticas(self):
+        return self._estadisticas.resumen()
+
     def leer_datos(self):
         raise NotImplementedError
 
     def obtener_informacion(self):
         # OPTIMIZACIÓN: Diccionario pre-construido más rápido
+        historial = self._datos_historicos
+        ultima = historial.ultima()
         return {
             "id": self.id_dispositivo,
             "nombre": self.nombre,
             "ubicacion": self.ubicacion,
             "estado": self._estado,
-            "tiempo_creacion": self._tiempo_creacion.strftime("%Y-%m-%d %H:%M:%S"),
-            "lecturas_historicas": len(self._datos_historicos),
+            "tiempo_creacion": formatear_marca(self._tiempo_creacion, "%Y-%m-%d %H:%M:%S"),
+            "lecturas_historicas": {
+                "retenidas": len(historial),
+                "totales": historial.total_lecturas(),
+            },
+            "ultima_lectura": ultima[0] if ultima else None,
+            "hora_ultima_lectura": formatear_marca(ultima[1]) if ultima else None,
+            "estadisticas": self._estadisticas.resumen(),
         }
 
 
@@ -75,10 +120,8 @@ class SensorTemperatura(DispositivoIoT):
         temperatura = round(random.uniform(self.rango_min, self.rango_max), 1)
 
         if self._validar_lectura(temperatura):
-            # Tupla en lugar de diccionario para menos overhead
-            self._datos_historicos.append(
-                (temperatura, "°C", datetime.now().strftime("%H:%M:%S"))
-            )
+            # Valor + marca en ns directo a las columnas (la unidad es siempre °C)
+            self._registrar(temperatura, RELOJ.ahora())
             return temperatura
         return None
 
@@ -86,6 +129,9 @@ class SensorTemperatura(DispositivoIoT):
 class SensorMovimiento(DispositivoIoT):
     __slots__ = ("sensibilidad", "tipo", "_probabilidades")
 
+    _TIPO_HISTORIAL = "B"  # bool como 0/1
+    _CLASE_ESTADISTICAS = ContadorDetecciones
+
     def __init__(self, id_dispositivo, nombre, ubicacion, sensibilidad="media"):
         DispositivoIoT.__init__(self, id_dispositivo, nombre, ubicacion)
         self.sensibilidad = sensibilidad
@@ -99,9 +145,7 @@ class SensorMovimiento(DispositivoIoT):
         movimiento_detectado = random.random() < prob
 
         if self._validar_lectura(movimiento_detectado):
-            self._datos_historicos.append(
-                (movimiento_detectado, datetime.now().strftime("%H:%M:%S"))
-            )
+            self._registrar(movimiento_detectado, RELOJ.ahora())
             return movimiento_detectado
         return None
 
@@ -109,6 +153,8 @@ class SensorMovimiento(DispositivoIoT):
 class CamaraSeguridad(DispositivoIoT):
     __slots__ = ("resolucion", "tipo", "_grabando")
 
+    _TIPO_HISTORIAL = "B"  # calidad 60-100 %
+
     def __init__(self, id_dispositivo, nombre, ubicacion, resolucion="1080p"):
         DispositivoIoT.__init__(self, id_dispositivo, nombre, ubicacion)
         self.resolucion = resolucion
@@ -120,9 +166,8 @@ class CamaraSeguridad(DispositivoIoT):
         calidad_imagen = random.randint(60, 100)
 
         if self._validar_lectura(calidad_imagen):
-            self._datos_historicos.append(
-                (calidad_imagen, self.resolucion, datetime.now().strftime("%H:%M:%S"))
-            )
+            # La resolución es fija por cámara: no se repite en cada lectura
+            self._registrar(calidad_imagen, RELOJ.ahora())
             return calidad_imagen
         return None
 
@@ -135,34 +180,128 @@ class CamaraSeguridad(DispositivoIoT):
         return self._grabando
 
 
-# ==================== FUNCIONES AUXILIARES OPTIMIZADAS ====================
-def funcion_recursiva_monitoreo(ciclos, mostrar_progreso=False):
+# ==================== MUESTREO POR LOTES DE LA FLOTA ====================
+class MotorMuestreo:
     """
-    OPTIMIZACIÓN: Recursión convertida a iteración para evitar stack overflow
+    OPTIMIZACIÓN: muestrea toda la flota con NumPy.
+
+    Agrupa los dispositivos por clase y reemplaza N llamadas a leer_datos()
+    (N random + N time_ns + N appends interpretados) por un solo lote de
+    números aleatorios y operaciones vectorizadas por grupo. Las lecturas
+    tienen la misma distribución que las de leer_datos(), pero salen del
+    generador propio del motor (np.random.Generator, reproducible con
+    `semilla`), no del módulo `random`.
+
+    muestrear() registra un tick lectura por lectura. muestrear_bloque()
+    toma varios ticks de una vez: cada historial recibe su columna completa
+    y las estadísticas de cada clase se calculan para todas las columnas en
+    una sola operación, que es lo que conviene cuando la flota es grande.
     """
-    ciclos_procesados = 0
-
-    while ciclos > 0:
-        if mostrar_progreso:
-            print(f"Monitoreando... Ciclos restantes: {ciclos}")
-
-        time.sleep(0.05)  # Reducido tiempo de sleep
-        ciclos_procesados += 1
-        ciclos -= 1
-
-    if mostrar_progreso:
-        print("Monitoreo completado!")
-
-    return ciclos_procesados
 
+    def __init__(self, dispositivos, semilla=None):
+        self.dispositivos = list(dispositivos)
+        self._generador = np.random.default_rng(semilla)
+        self.actualizar()
+
+    def actualizar(self):
+        """
+        Reconstruye los vectores por clase. Llamar si cambian rangos,
+        sensibilidades o la lista de dispositivos.
+        """
+        temperatura, movimiento, camara = [], [], []
+        for i, dispositivo in enumerate(self.dispositivos):
+            if isinstance(dispositivo, SensorTemperatura):
+                temperatura.append(i)
+            elif isinstance(dispositivo, SensorMovimiento):
+                movimiento.append(i)
+            elif isinstance(dispositivo, CamaraSeguridad):
+                camara.append(i)
+            else:
+                raise TypeError(
+                    f"Dispositivo no soportado por el motor: {type(dispositivo).__name__}"
+                )
+
+        disp = self.dispositivos
+        self._idx_temperatura = np.array(temperatura, dtype=np.intp)
+        self._idx_movimiento = np.array(movimiento, dtype=np.intp)
+        self._idx_camara = np.array(camara, dtype=np.intp)
+
+        self._rango_min = np.array([disp[i].rango_min for i in temperatura], dtype=float)
+        self._rango_ancho = (
+            np.array([disp[i].rango_max for i in temperatura], dtype=float) - self._rango_min
+        )
+        self._probabilidades = np.array(
+            [disp[i]._probabilidades.get(disp[i].sensibilidad, 0.4) for i in movimiento],
+            dtype=float,
+        )
+        self._registrar = [d._registrar for d in disp]
+        # Por grupo (mismo orden que _grupos): historiales y estadísticas de sus dispositivos
+        self._destinos = []
+        for indices in (temperatura, movimiento, camara):
+            estadisticas = [disp[i]._estadisticas for i in indices]
+            if len({type(e) for e in estadisticas}) > 1:
+                raise TypeError("Los dispositivos de una clase deben usar la misma clase de estadísticas")
+            self._destinos.append(([disp[i]._datos_historicos for i in indices], estadisticas))
+
+    def _grupos(self, lote):
+        """(índices, valores) por clase; lote es (dispositivos,) o (ticks, dispositivos)"""
+        return (
+            (self._idx_temperatura,
+             np.round(self._rango_min + self._rango_ancho * lote[..., self._idx_temperatura], 1)),
+            (self._idx_movimiento, lote[..., self._idx_movimiento] < self._probabilidades),
+            (self._idx_camara, 60 + (lote[..., self._idx_camara] * 41).astype(np.int64)),
+        )
 
-def procesar_dispositivos(lista_dispositivos, funcion_procesamiento):
-    """
-    OPTIMIZACIÓN: List comprehension más rápido que loop tradicional
-    """
-    return [funcion_procesamiento(dispositivo) for dispositivo in lista_dispositivos]
+    def muestrear(self):
+        """
+        Muestrea un tick de toda la flota y lo guarda en cada historial.
+        Retorna la lista de lecturas en el mismo orden que self.dispositivos.
+        """
+        cantidad = len(self.dispositivos)
+        if not cantidad:
+            return []
+
+        grupos = self._grupos(self._generador.random(cantidad))
+
+        # Una sola marca de tiempo para todo el tick
+        marca = RELOJ.ahora()
+        registrar = self._registrar
+        lecturas = [None] * cantidad
+        for indices, valores in grupos:
+            for i, valor in zip(indices.tolist(), valores.tolist()):
+                lecturas[i] = valor
+                registrar[i](valor, marca)
+        return lecturas
+
+    def muestrear_bloque(self, marcas_ns):
+        """
+        Muestrea len(marcas_ns) ticks seguidos (uno por marca, en orden
+        creciente), con los mismos valores que llamar muestrear() una vez
+        por tick con el mismo generador. Cada historial recibe todas sus
+        lecturas del bloque en una sola llamada y las estadísticas de cada
+        clase se actualizan juntas. Retorna un array (ticks, dispositivos)
+        con los valores (las detecciones como 0/1).
+        """
+        cantidad = len(self.dispositivos)
+        ticks = len(marcas_ns)
+        lecturas = np.empty((ticks, cantidad))
+        if not cantidad or not ticks:
+            return lecturas
+
+        lote = self._generador.random((ticks, cantidad))
+        marcas_ns = np.asarray(marcas_ns, dtype=np.int64)
+        for (indices, valores), (historiales, estadisticas) in zip(self._grupos(lote), self._destinos):
+            if not len(indices):
+                continue
+            lecturas[:, indices] = valores
+            # Una columna por dispositivo: su historial la copia por slices
+            for historial, columna in zip(historiales, valores.T):
+                historial.agregar_lote(columna, marcas_ns)
+            type(estadisticas[0]).agregar_columnas(estadisticas, valores)
+        return lecturas
 
 
+# ==================== FUNCIONES AUXILIARES OPTIMIZADAS ====================
 # Funciones optimizadas para usar como parámetro
 def leer_y_mostrar_datos(dispositivo):
     dato = dispositivo.leer_datos()
@@ -191,6 +330,12 @@ def main():
         CamaraSeguridad("CAM002", "Cámara Externa", "Entrada", "1080p"),
     ]
 
+    # Índices por id, tipo, ubicación y estado (se actualizan solos)
+    registro = RegistroDispositivos(dispositivos)
+
+    # Historial acotado: últimas 1000 lecturas de la última hora
+    configurar_retencion(dispositivos, max_lecturas=1000, max_edad=3600)
+
     # Operaciones por lotes
     print("\nDEMOSTRANDO POLIMORFISMO...")
     for dispositivo in dispositivos:
@@ -199,12 +344,17 @@ def main():
         print(f"• {dispositivo.tipo}: {dato}")
 
     print("\nEJECUTANDO MONITOREO...")
-    funcion_recursiva_monitoreo(3)  # Menos ciclos para demo
+    # Asíncrono: todos los dispositivos en paralelo, sin deriva acumulada
+    ejecutar_monitoreo(dispositivos, 3, periodo=0.05, mostrar_progreso=True)
 
     print("\nACTIVANDO DISPOSITIVOS...")
     estados = procesar_dispositivos(dispositivos, activar_dispositivo)
     datos = procesar_dispositivos(dispositivos, leer_y_mostrar_datos)
 
+    # Un tick de toda la flota en un solo lote vectorizado
+    motor = MotorMuestreo(dispositivos)
+    print(f"\nMUESTREO POR LOTES: {motor.muestrear()}")
+
     # Filtrado más eficiente
     valores_numericos = [dato for dato in datos if isinstance(dato, (int, float))]
 
@@ -217,18 +367,30 @@ def main():
         print(f"• Mínimo: {min(valores_numericos)}")
         print(f"• Suma: {sum(valores_numericos)}")
 
-    # Operaciones de filtrado más eficientes
-    sensores_temp = [d for d in dispositivos if isinstance(d, SensorTemperatura)]
+    # Consultas por índice en lugar de recorrer la lista
+    sensores_temp = registro.por_tipo("Sensor de Temperatura")
     print(f"\nSensores temperatura: {len(sensores_temp)}")
 
-    dispositivos_activos = [d for d in dispositivos if d.obtener_estado() == "Activo"]
-    print(f"Dispositivos activos: {len(dispositivos_activos)}")
+    print(f"Dispositivos activos: {registro.contar(estado='Activo')}")
+    camaras_entrada = registro.buscar("Cámara de Seguridad", "Entrada", "Activo")
+    print(f"Cámaras activas en Entrada: {len(camaras_entrada)}")
+
+    # Volcado de los historiales a archivos binarios mapeados en memoria
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen = AlmacenHistoriales(directorio)
+        escritas = almacen.volcar(dispositivos)
+        archivo_temp = almacen.archivo(SensorTemperatura)
+        print(f"\nPERSISTENCIA: {escritas} lecturas volcadas a disco")
+        print(f"• Lecturas de TEMP001 en disco: {len(archivo_temp.lecturas_de('TEMP001'))}")
+        almacen.cerrar()
 
     print("\nRESUMEN FINAL:")
     for dispositivo in dispositivos:
         info = dispositivo.obtener_informacion()
+        lecturas = info["lecturas_historicas"]
         print(
-            f"{info['nombre']} - Estado: {info['estado']} - Lecturas: {info['lecturas_historicas']}"
+            f"{info['nombre']} - Estado: {info['estado']} - "
+            f"Lecturas: {lecturas['retenidas']} (total {lecturas['totales']})"
         )
 
     print("\n¡Sistema optimizado ejecutado exitosamente!")
@@ -0,0 +1,32 @@
+import json
+import sys
+
+import pytest
+
+import benchmark
+import simulacion_iot
+
+
+@pytest.mark.parametrize("modo", list(benchmark.MODOS))
+def test_todos_los_caminos_hacen_el_mismo_trabajo(modo):
+    dispositivos = benchmark.crear_flota(simulacion_iot, 30)
+    benchmark.MODOS[modo](dispositivos, 4)
+    for dispositivo in dispositivos:
+        assert len(dispositivo._datos_historicos) == 4
+        assert dispositivo.obtener_estadisticas()["cantidad"] == 4
+
+
+def test_main_guarda_una_fila_por_tamano_y_modo(tmp_path, monkeypatch, capsys):
+    salida = tmp_path / "resultados.json"
+    monkeypatch.setattr(sys, "argv", ["benchmark.py", "--tamanos", "9", "30",
+                                      "--ticks", "3", "--salida", str(salida)])
+    benchmark.main()
+
+    resultados = json.loads(salida.read_text(encoding="utf-8"))
+    filas = [(fila["dispositivos"], fila["modo"]) for fila in resultados["resultados"]]
+    assert filas == [(cantidad, modo) for cantidad in (9, 30) for modo in benchmark.MODOS]
+    for fila in resultados["resultados"]:
+        assert fila["ticks"] == 3
+        assert fila["lecturas_por_segundo"] > 0
+        assert fila["memoria_pico_bytes"] >= fila["memoria_construccion_bytes"] > 0
+    assert "Resultados guardados" in capsys.readouterr().out
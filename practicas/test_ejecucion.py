@@ -0,0 +1,59 @@
+import pytest
+
+from ejecucion import EJECUTORES, ErrorDispositivo, procesar_dispositivos
+from registro import RegistroDispositivos
+from simulacion_iot import SensorTemperatura, activar_dispositivo
+
+
+def _leer_o_fallar(dispositivo):
+    # A nivel de módulo para poder enviarla a otro proceso
+    if dispositivo.id_dispositivo.endswith("3"):
+        raise ValueError(f"falla {dispositivo.id_dispositivo}")
+    return dispositivo.leer_datos()
+
+
+def _sensores(cantidad):
+    return [SensorTemperatura(f"T{i}", f"Sensor {i}", "Cocina", 10, 20) for i in range(cantidad)]
+
+
+@pytest.mark.parametrize("executor", EJECUTORES)
+def test_error_por_dispositivo_en_su_posicion(executor):
+    sensores = _sensores(15)
+    resultados = procesar_dispositivos(sensores, _leer_o_fallar, executor=executor,
+                                       tamano_bloque=4, max_workers=2)
+
+    assert len(resultados) == len(sensores)
+    for i, resultado in enumerate(resultados):
+        if i % 10 == 3:
+            # El error queda en la posición del dispositivo y el resto se procesa igual
+            assert isinstance(resultado, ErrorDispositivo)
+            assert not resultado
+            assert resultado.indice == i
+            assert resultado.dispositivo == f"Sensor {i}"
+            assert isinstance(resultado.excepcion, ValueError)
+        else:
+            assert 10 <= resultado <= 20
+
+
+@pytest.mark.parametrize("executor", ("thread", "process"))
+def test_estado_del_dispositivo_vuelve_al_original(executor):
+    sensores = _sensores(12)
+    registro = RegistroDispositivos(sensores)
+
+    procesar_dispositivos(sensores, _leer_o_fallar, executor=executor,
+                          tamano_bloque=5, max_workers=2)
+    for i, sensor in enumerate(sensores):
+        lecturas = 0 if i % 10 == 3 else 1
+        assert len(sensor._datos_historicos) == lecturas
+        assert sensor.obtener_estadisticas()["cantidad"] == lecturas
+
+    # Los cambios hechos en otro proceso se reflejan en los índices del registro
+    assert procesar_dispositivos(sensores, activar_dispositivo, executor=executor,
+                                 max_workers=2) == ["Activo"] * len(sensores)
+    assert set(registro.por_estado("Activo")) == set(sensores)
+    assert not registro.por_estado("Inactivo")
+
+
+def test_executor_desconocido():
+    with pytest.raises(ValueError):
+        procesar_dispositivos(_sensores(2), _leer_o_fallar, executor="gpu")
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from estadisticas import CuantilP2, EstadisticasStreaming
+
+
+@pytest.mark.parametrize("distribucion", ["uniforme", "normal", "exponencial"])
+def test_percentiles_p2_cerca_de_los_exactos(distribucion):
+    generador = np.random.default_rng(11)
+    valores = {
+        "uniforme": lambda: generador.uniform(0, 100, 20_000),
+        "normal": lambda: generador.normal(50, 10, 20_000),
+        "exponencial": lambda: generador.exponential(10, 20_000),
+    }[distribucion]()
+    estadisticas = EstadisticasStreaming()
+    for x in valores.tolist():
+        estadisticas.agregar(x)
+
+    rango = valores.max() - valores.min()
+    for p in EstadisticasStreaming.PERCENTILES:
+        exacto = np.percentile(valores, p * 100)
+        assert abs(estadisticas.percentil(p) - exacto) < 0.02 * rango, p
+
+
+def test_pocas_lecturas_dan_el_percentil_exacto():
+    cuantil = CuantilP2(0.5)
+    assert cuantil.valor() is None
+    for x in (3.0, 1.0, 2.0):
+        cuantil.agregar(x)
+    assert cuantil.valor() == 2.0
+
+
+def test_cuantil_agregar_lote_igual_que_agregar():
+    valores = np.random.default_rng(3).normal(size=2_000).tolist()
+    uno_por_uno = CuantilP2(0.95)
+    for x in valores:
+        uno_por_uno.agregar(x)
+    por_lotes = CuantilP2(0.95)
+    for inicio in range(0, len(valores), 137):
+        por_lotes.agregar_lote(valores[inicio:inicio + 137])
+
+    assert por_lotes.valor() == uno_por_uno.valor()
+
+
+def test_agregar_lote_igual_que_agregar():
+    valores = np.random.default_rng(8).normal(20, 5, 5_000)
+    uno_por_uno = EstadisticasStreaming()
+    for x in valores.tolist():
+        uno_por_uno.agregar(x)
+    por_lotes = EstadisticasStreaming()
+    for bloque in np.array_split(valores, 13):
+        por_lotes.agregar_lote(bloque)
+
+    esperado = uno_por_uno.resumen()
+    obtenido = por_lotes.resumen()
+    assert obtenido.keys() == esperado.keys()
+    for clave, valor in esperado.items():
+        assert obtenido[clave] == pytest.approx(valor, rel=1e-9), clave
+
+
+def test_combinar_igual_que_todas_juntas():
+    generador = np.random.default_rng(2)
+    partes = [generador.normal(i, 1 + i, 300) for i in range(4)]
+    por_dispositivo = []
+    for parte in partes:
+        estadisticas = EstadisticasStreaming()
+        estadisticas.agregar_lote(parte)
+        por_dispositivo.append(estadisticas)
+    total = EstadisticasStreaming.combinar(por_dispositivo)
+
+    todas = np.concatenate(partes)
+    assert total.cantidad == len(todas)
+    assert total.media == pytest.approx(todas.mean())
+    assert total.varianza() == pytest.approx(todas.var(ddof=1))
+    assert (total.minimo, total.maximo) == (todas.min(), todas.max())
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from historial import HistorialColumnar
+
+SEGUNDO = 1_000_000_000
+
+
+def test_buffer_circular_descarta_las_mas_antiguas():
+    historial = HistorialColumnar(max_lecturas=4)
+    for i in range(10):
+        historial.agregar(float(i), i * SEGUNDO)
+
+    assert len(historial) == 4
+    assert historial.total_lecturas() == 10
+    assert historial.capacidad() == 4  # llegó al tope y dejó de crecer
+    assert list(historial.valores()) == [6.0, 7.0, 8.0, 9.0]
+    assert list(historial.marcas()) == [6 * SEGUNDO, 7 * SEGUNDO, 8 * SEGUNDO, 9 * SEGUNDO]
+
+
+def test_edad_maxima_descarta_las_vencidas():
+    historial = HistorialColumnar(max_edad=3)
+    for i in range(10):
+        historial.agregar(float(i), i * SEGUNDO)
+
+    # Con la última en t=9 s quedan las de t >= 6 s
+    assert list(historial.valores()) == [6.0, 7.0, 8.0, 9.0]
+    historial.purgar(12 * SEGUNDO)
+    assert list(historial.valores()) == [9.0]
+
+
+def test_reducir_retencion_conserva_las_ultimas():
+    historial = HistorialColumnar()
+    for i in range(20):
+        historial.agregar(float(i), i * SEGUNDO)
+    historial.configurar_retencion(max_lecturas=5)
+
+    assert list(historial.valores()) == [15.0, 16.0, 17.0, 18.0, 19.0]
+    historial.agregar(20.0, 20 * SEGUNDO)
+    assert list(historial.valores()) == [16.0, 17.0, 18.0, 19.0, 20.0]
+
+
+@pytest.mark.parametrize("retencion", [
+    {},
+    {"max_lecturas": 7},
+    {"max_edad": 5},
+    {"max_lecturas": 30, "max_edad": 50},
+])
+def test_agregar_lote_igual_que_agregar(retencion):
+    generador = np.random.default_rng(5)
+    secuencial = HistorialColumnar(**retencion)
+    por_lotes = HistorialColumnar(**retencion)
+    marca = 0
+    for tamano in generador.integers(1, 40, size=30).tolist():
+        valores = generador.random(tamano)
+        marcas = marca + np.cumsum(generador.integers(0, 2 * SEGUNDO, size=tamano))
+        marca = int(marcas[-1])
+        for valor, m in zip(valores.tolist(), marcas.tolist()):
+            secuencial.agregar(valor, m)
+        por_lotes.agregar_lote(valores, marcas)
+
+        assert len(por_lotes) == len(secuencial)
+        assert por_lotes.total_lecturas() == secuencial.total_lecturas()
+        assert list(por_lotes.valores()) == list(secuencial.valores())
+        assert list(por_lotes.marcas()) == list(secuencial.marcas())
+
+
+def test_agregar_lote_rechaza_largos_distintos():
+    with pytest.raises(ValueError):
+        HistorialColumnar().agregar_lote([1.0, 2.0], [0])
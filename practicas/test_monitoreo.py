@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+from monitoreo import ejecutar_monitoreo
+
+
+class _Rapido:
+    def __init__(self, id_dispositivo="R"):
+        self.id_dispositivo = id_dispositivo
+        self.lecturas = 0
+
+    def leer_datos(self):
+        self.lecturas += 1
+        return self.lecturas
+
+
+class _Colgado:
+    """Bloquea en leer_datos hasta que se libere el evento"""
+
+    def __init__(self):
+        self.id_dispositivo = "C"
+        self.liberar = threading.Event()
+        self.llamadas = 0
+
+    def leer_datos(self):
+        self.llamadas += 1
+        self.liberar.wait(5)
+        return 0
+
+
+class _Fallido:
+    id_dispositivo = "F"
+
+    def leer_datos(self):
+        raise RuntimeError("sin señal")
+
+
+class _Asincrono:
+    id_dispositivo = "A"
+
+    def __init__(self):
+        self.lecturas = 0
+
+    async def leer_datos(self):
+        await asyncio.sleep(0)
+        self.lecturas += 1
+        return self.lecturas
+
+
+def test_lectura_en_curso_omite_ticks_sin_frenar_a_los_demas():
+    rapido, colgado = _Rapido(), _Colgado()
+    try:
+        reporte = ejecutar_monitoreo([rapido, colgado], ciclos=5, periodo=0.02, limite=0.005)
+    finally:
+        colgado.liberar.set()
+
+    # La primera lectura se abandona por tiempo y sigue pendiente: los ticks
+    # siguientes se omiten en lugar de encolar más lecturas
+    assert colgado.llamadas == 1
+    assert rapido.lecturas == 5
+    assert [fila["dispositivos_leidos"] for fila in reporte] == [1] * 5
+    assert [fila["omitidos"] for fila in reporte] == [1] * 5
+
+
+def test_grilla_fija_sin_deriva():
+    reporte = ejecutar_monitoreo([_Rapido()], ciclos=6, periodo=0.02)
+    assert [fila["planificado"] for fila in reporte] == [c * 0.02 for c in range(6)]
+    for fila in reporte:
+        # El tick real nunca se adelanta al planificado ni arrastra el retraso
+        assert fila["real"] >= fila["planificado"]
+        assert fila["desfase_max"] < 0.02
+
+
+def test_error_del_dispositivo_cuenta_como_omitido():
+    for en_hilo in (True, False):
+        reporte = ejecutar_monitoreo([_Fallido(), _Rapido()], ciclos=3, periodo=0.01,
+                                     en_hilo=en_hilo)
+        assert [(f["dispositivos_leidos"], f["omitidos"]) for f in reporte] == [(1, 1)] * 3
+
+
+def test_periodos_propios_y_lecturas_asincronas():
+    lento, asincrono = _Rapido("L"), _Asincrono()
+    reporte = ejecutar_monitoreo([lento, asincrono], ciclos=4, periodo=0.01,
+                                 periodos={"L": 0.02})
+    assert lento.lecturas == 2
+    assert asincrono.lecturas == 4
+    assert sum(fila["dispositivos_leidos"] for fila in reporte) == 6
+    assert sum(fila["omitidos"] for fila in reporte) == 0
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from persistencia import AlmacenHistoriales, ArchivoHistorial
+from simulacion_iot import SensorMovimiento, SensorTemperatura
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    almacen = AlmacenHistoriales(str(tmp_path))
+    yield almacen
+    almacen.cerrar()
+
+
+def _marcas_en_disco(archivo, id_dispositivo):
+    return archivo.lecturas_de(id_dispositivo)["marca"].tolist()
+
+
+def test_volcar_por_separado_intercala_por_marca(almacen):
+    a = SensorTemperatura("A", "a", "x")
+    b = SensorTemperatura("B", "b", "x")
+    for _ in range(5):
+        b.leer_datos()
+        a.leer_datos()
+    # b tiene marcas más viejas que las que ya guardó a
+    assert almacen.volcar([a]) == 5
+    assert almacen.volcar([b]) == 5
+
+    archivo = almacen.archivo(SensorTemperatura)
+    marcas = archivo.registros()["marca"]
+    assert (np.diff(marcas) >= 0).all()
+    assert _marcas_en_disco(archivo, "A") == list(a._datos_historicos.marcas())
+    assert _marcas_en_disco(archivo, "B") == list(b._datos_historicos.marcas())
+    assert almacen.volcar([a, b]) == 0
+
+
+def test_escritura_fallida_no_cuenta_como_volcada(almacen, monkeypatch):
+    sensor = SensorTemperatura("T", "t", "x")
+    for _ in range(4):
+        sensor.leer_datos()
+
+    def fallar(*args):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(ArchivoHistorial, "agregar_lote", fallar)
+    with pytest.raises(OSError):
+        almacen.volcar([sensor])
+    monkeypatch.undo()
+
+    assert almacen.volcar([sensor]) == 4
+    assert len(almacen.archivo(SensorTemperatura).lecturas_de("T")) == 4
+
+
+def test_reabrir_retoma_despues_de_lo_guardado(tmp_path):
+    sensores = [SensorMovimiento(f"M{i}", "m", "x") for i in range(3)]
+    for _ in range(6):
+        for sensor in sensores:
+            sensor.leer_datos()
+    almacen = AlmacenHistoriales(str(tmp_path))
+    assert almacen.volcar(sensores) == 18
+    almacen.cerrar()
+
+    for sensor in sensores:
+        sensor.leer_datos()
+    almacen = AlmacenHistoriales(str(tmp_path))
+    try:
+        assert almacen.volcar(sensores) == 3
+        archivo = almacen.archivo(SensorMovimiento)
+        assert len(archivo) == 21
+        valores = archivo.lecturas_de("M1")["valor"].tolist()
+        assert valores == [float(v) for v in sensores[1]._datos_historicos.valores()]
+    finally:
+        almacen.cerrar()
+
+
+def test_rango_tiempo_y_lecturas_de(tmp_path):
+    archivo = ArchivoHistorial(str(tmp_path / "prueba.bin"))
+    try:
+        x, y = archivo.indice_de("x"), archivo.indice_de("y")
+        archivo.agregar_lote(x, [10, 20, 30], [1.0, 2.0, 3.0])
+        archivo.agregar_lote(y, [15, 25], [4.0, 5.0])
+        archivo.agregar_lote(np.array([x, y]), [40, 5], [6.0, 7.0])
+
+        assert archivo.registros()["marca"].tolist() == [5, 10, 15, 20, 25, 30, 40]
+        rango = archivo.rango_tiempo(15, 30)
+        assert rango["valor"].tolist() == [4.0, 2.0, 5.0]
+        assert np.shares_memory(rango, archivo.registros())
+        assert archivo.lecturas_de("x")["valor"].tolist() == [1.0, 2.0, 3.0, 6.0]
+        assert archivo.lecturas_de("y", desde_ns=10)["marca"].tolist() == [15, 25]
+        assert archivo.ultima_marca("y") == 25
+        assert len(archivo.lecturas_de("z")) == 0
+    finally:
+        archivo.cerrar()
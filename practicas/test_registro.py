@@ -0,0 +1,78 @@
+import pytest
+
+from registro import RegistroDispositivos
+from simulacion_iot import CamaraSeguridad, SensorMovimiento, SensorTemperatura
+
+
+def _registro():
+    dispositivos = [
+        SensorTemperatura("T1", "Sensor Cocina", "Cocina"),
+        SensorTemperatura("T2", "Sensor Jardín", "Jardín"),
+        SensorMovimiento("M1", "Detector Entrada", "Entrada"),
+        CamaraSeguridad("C1", "Cámara Entrada", "Entrada"),
+        CamaraSeguridad("C2", "Cámara Salón", "Salón"),
+    ]
+    return RegistroDispositivos(dispositivos), {d.id_dispositivo: d for d in dispositivos}
+
+
+def test_vistas_reflejan_los_cambios_del_registro():
+    registro, d = _registro()
+    activos = registro.por_estado("Activo")
+    camaras = registro.por_tipo(d["C1"].tipo)
+    assert len(activos) == 0
+    assert set(camaras) == {d["C1"], d["C2"]}
+
+    d["C1"].cambiar_estado("Activo")
+    assert set(activos) == {d["C1"]}
+    assert d["C1"] in activos and d["C2"] not in activos
+
+    # El conjunto de la clave se borra al vaciarse y se recrea: la vista sigue valiendo
+    d["C1"].cambiar_estado("Inactivo")
+    assert len(activos) == 0
+    d["T1"].cambiar_estado("Activo")
+    assert set(activos) == {d["T1"]}
+
+    registro.eliminar(d["C2"])
+    assert set(camaras) == {d["C1"]}
+    assert isinstance(camaras & registro.por_ubicacion("Entrada"), set)
+
+
+def test_buscar_y_contar_intersectan_los_indices():
+    registro, d = _registro()
+    for clave in ("C1", "M1", "T2"):
+        d[clave].cambiar_estado("Activo")
+
+    assert registro.buscar(ubicacion="Entrada", estado="Activo") == {d["C1"], d["M1"]}
+    assert registro.buscar(tipo=d["C1"].tipo, estado="Activo") == {d["C1"]}
+    assert registro.buscar(ubicacion="Sótano") == set()
+    for criterios in ({}, {"estado": "Activo"}, {"ubicacion": "Entrada", "estado": "Activo"},
+                      {"tipo": d["T1"].tipo, "ubicacion": "Cocina", "estado": "Activo"}):
+        assert registro.contar(**criterios) == len(registro.buscar(**criterios))
+
+
+def test_orden_por_nombre_y_reindexar():
+    registro, d = _registro()
+    nombres = [x.nombre for x in registro.ordenados_por_nombre()]
+    assert nombres == sorted(nombres)
+    assert [x.id_dispositivo for x in registro.ordenados_por_nombre("D", "Sensor Cocina")] == \
+        ["M1", "T1"]
+
+    d["T2"].ubicacion = "Entrada"
+    d["T2"].nombre = "A Sensor"
+    registro.reindexar(d["T2"])
+    assert d["T2"] in registro.por_ubicacion("Entrada")
+    assert d["T2"] not in registro.por_ubicacion("Jardín")
+    assert registro.ordenados_por_nombre()[0] is d["T2"]
+
+
+def test_ids_repetidos_y_otro_registro():
+    registro, d = _registro()
+    with pytest.raises(ValueError):
+        registro.agregar(SensorTemperatura("T1", "Otro", "Cocina"))
+    with pytest.raises(ValueError):
+        RegistroDispositivos([d["T1"]])
+    registro.eliminar(d["T1"])
+    with pytest.raises(KeyError):
+        registro.eliminar(d["T1"])
+    assert registro.obtener("T1") is None
+    assert len(registro) == 4
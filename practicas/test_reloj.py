@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+from reloj import Reloj, formatear_marca
+
+
+def test_tick_congela_la_marca_dentro_del_bloque():
+    reloj = Reloj()
+    with reloj.tick() as marca:
+        time.sleep(0.002)
+        assert reloj.ahora() == marca
+    assert reloj.ahora() > marca
+    assert reloj.monotonica(marca) <= time.monotonic_ns()
+
+
+def test_tick_de_un_hilo_no_congela_a_los_demas():
+    reloj = Reloj()
+    en_tick, listo = threading.Event(), threading.Event()
+    vistas = []
+
+    def otro_hilo():
+        en_tick.wait(5)
+        time.sleep(0.002)
+        vistas.append(reloj.ahora())
+        listo.set()
+
+    hilo = threading.Thread(target=otro_hilo)
+    hilo.start()
+    with reloj.tick() as marca:
+        en_tick.set()
+        listo.wait(5)
+        assert reloj.ahora() == marca
+    hilo.join()
+    assert vistas[0] > marca
+
+
+def test_cada_tarea_ve_su_propio_tick():
+    reloj = Reloj()
+
+    async def tarea(antes, demora):
+        await asyncio.sleep(antes)
+        with reloj.tick() as marca:
+            # Las tareas se intercalan mientras sus ticks siguen abiertos
+            await asyncio.sleep(demora)
+            vista = reloj.ahora()
+        return marca, vista
+
+    async def ambas():
+        return await asyncio.gather(tarea(0.0, 0.01), tarea(0.002, 0.0))
+
+    (marca_a, vista_a), (marca_b, vista_b) = asyncio.run(ambas())
+    assert vista_a == marca_a
+    assert vista_b == marca_b
+    assert marca_b > marca_a
+
+
+def test_formatear_marca_reutiliza_el_texto_del_mismo_segundo():
+    segundo = 1_700_000_000
+    texto = formatear_marca(segundo * 1_000_000_000)
+    assert texto == time.strftime("%H:%M:%S", time.localtime(segundo))
+    assert formatear_marca(segundo * 1_000_000_000 + 999_999_999) is texto
+    assert formatear_marca((segundo + 1) * 1_000_000_000) != texto
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from estadisticas import ContadorDetecciones, EstadisticasStreaming
+from simulacion_iot import CamaraSeguridad, MotorMuestreo, SensorMovimiento, SensorTemperatura
+
+SEGUNDO = 1_000_000_000
+
+
+def _flota(cantidad=30):
+    dispositivos = []
+    for i in range(cantidad):
+        if i % 3 == 0:
+            dispositivos.append(SensorTemperatura(f"T{i}", "t", "z", -10 - i, 50 + i))
+        elif i % 3 == 1:
+            dispositivos.append(SensorMovimiento(f"M{i}", "m", "z", ("baja", "media", "alta")[i % 3]))
+        else:
+            dispositivos.append(CamaraSeguridad(f"C{i}", "c", "z"))
+    return dispositivos
+
+
+def test_muestrear_bloque_igual_que_muestrear_por_tick():
+    por_tick, por_bloque = _flota(), _flota()
+    marcas = [1_700_000_000 * SEGUNDO + t * SEGUNDO for t in range(300)]
+
+    motor = MotorMuestreo(por_tick, semilla=7)
+    esperadas = [motor.muestrear() for _ in marcas]
+    lecturas = MotorMuestreo(por_bloque, semilla=7).muestrear_bloque(marcas)
+
+    assert lecturas.tolist() == np.array(esperadas, dtype=float).tolist()
+    for a, b in zip(por_tick, por_bloque):
+        assert list(a._datos_historicos.valores()) == list(b._datos_historicos.valores())
+        assert list(b._datos_historicos.marcas()) == marcas
+        esperado, obtenido = a.obtener_estadisticas(), b.obtener_estadisticas()
+        for clave, valor in esperado.items():
+            assert obtenido[clave] == pytest.approx(valor, rel=1e-9, abs=1e-9), clave
+
+
+def test_motor_con_la_distribucion_de_leer_datos():
+    random.seed(3)
+    escalares = _flota(3)
+    for _ in range(20_000):
+        for dispositivo in escalares:
+            dispositivo.leer_datos()
+    lecturas = MotorMuestreo(_flota(3), semilla=3).muestrear_bloque(np.arange(20_000))
+
+    temperatura = np.array(list(escalares[0]._datos_historicos.valores()))
+    assert np.allclose(lecturas[:, 0] * 10, np.round(lecturas[:, 0] * 10))  # un decimal
+    assert lecturas[:, 0].min() >= -10 and lecturas[:, 0].max() <= 50
+    assert lecturas[:, 0].mean() == pytest.approx(temperatura.mean(), abs=0.5)
+    detecciones = np.array(list(escalares[1]._datos_historicos.valores()))
+    assert lecturas[:, 1].mean() == pytest.approx(detecciones.mean(), abs=0.02)
+    calidad = list(escalares[2]._datos_historicos.valores())
+    assert set(lecturas[:, 2].astype(int).tolist()) == set(calidad) == set(range(60, 101))
+
+
+def test_agregar_columnas_igual_que_agregar_lote():
+    valores = np.random.default_rng(1).normal(20, 4, (500, 6))
+    por_columna = [EstadisticasStreaming() for _ in range(6)]
+    juntas = [EstadisticasStreaming() for _ in range(6)]
+    for inicio in range(0, 500, 70):
+        bloque = valores[inicio:inicio + 70]
+        for e, columna in zip(por_columna, bloque.T):
+            e.agregar_lote(columna)
+        EstadisticasStreaming.agregar_columnas(juntas, bloque)
+    for a, b in zip(por_columna, juntas):
+        assert b.resumen() == pytest.approx(a.resumen())
+
+    contadores = [ContadorDetecciones() for _ in range(6)]
+    ContadorDetecciones.agregar_columnas(contadores, valores > 20)
+    assert [c.detecciones for c in contadores] == np.count_nonzero(valores > 20, axis=0).tolist()
+    assert {c.cantidad for c in contadores} == {500}